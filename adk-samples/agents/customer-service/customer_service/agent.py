@@ -20,10 +20,12 @@ from google.adk import Agent
 from .config import Config
 from .prompts import GLOBAL_INSTRUCTION, INSTRUCTION
 from .shared_libraries.callbacks import (
+    RATE_LIMIT_SECS,
     rate_limit_callback,
     before_agent,
-    before_tool,
+    make_before_tool,
 )
+from .shared_libraries.rate_limiter import RateLimitedGemini
 from .tools.tools import (
     send_call_companion_link,
     approve_discount,
@@ -33,6 +35,7 @@ from .tools.tools import (
     modify_cart,
     get_product_recommendations,
     check_product_availability,
+    check_cart_availability,
     schedule_planting_service,
     get_available_planting_times,
     send_care_instructions,
@@ -47,26 +50,35 @@ configs = Config()
 logger = logging.getLogger(__name__)
 
 
+TOOLS = [
+    send_call_companion_link,
+    approve_discount,
+    sync_ask_for_approval,
+    update_salesforce_crm,
+    access_cart_information,
+    modify_cart,
+    get_product_recommendations,
+    check_product_availability,
+    check_cart_availability,
+    schedule_planting_service,
+    get_available_planting_times,
+    send_care_instructions,
+    generate_qr_code,
+]
+
 root_agent = Agent(
-    model=configs.agent_settings.model,
+    model=RateLimitedGemini(
+        model=configs.agent_settings.model,
+        scope=configs.CLOUD_PROJECT,
+        quota=configs.RPM_QUOTA,
+        window_secs=RATE_LIMIT_SECS,
+        lock_file=configs.RATE_LIMIT_FILE or None,
+    ),
     global_instruction=GLOBAL_INSTRUCTION,
     instruction=INSTRUCTION,
     name=configs.agent_settings.name,
-    tools=[
-        send_call_companion_link,
-        approve_discount,
-        sync_ask_for_approval,
-        update_salesforce_crm,
-        access_cart_information,
-        modify_cart,
-        get_product_recommendations,
-        check_product_availability,
-        schedule_planting_service,
-        get_available_planting_times,
-        send_care_instructions,
-        generate_qr_code,
-    ],
-    before_tool_callback=before_tool,
+    tools=TOOLS,
+    before_tool_callback=make_before_tool(TOOLS),
     before_agent_callback=before_agent,
     before_model_callback=rate_limit_callback,
 )
@@ -46,3 +46,11 @@ class Config(BaseSettings):
     CLOUD_LOCATION: str = Field(default="us-central1")
     GENAI_USE_VERTEXAI: str = Field(default="1")
     API_KEY: str | None = Field(default="")
+    # Model requests per minute shared by all sessions, e.g. the API quota.
+    RPM_QUOTA: int = Field(default=60)
+    # Lock file to share the model rate limit between worker processes.
+    RATE_LIMIT_FILE: str = Field(default="")
+    # Directory of the local customer store.
+    DATA_DIR: str = Field(default="~/.cache/customer_service")
+    # Base URL of the CRM that cart and CRM writes are flushed to.
+    CRM_URL: str = Field(default="")
@@ -75,6 +75,24 @@ class GardenProfile(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Customer fields the agent needs in its prompt.
+PROFILE_FIELDS = {
+    "customer_id",
+    "customer_first_name",
+    "customer_last_name",
+    "email",
+    "phone_number",
+    "years_as_customer",
+    "billing_address",
+    "purchase_history",
+    "loyalty_points",
+    "preferred_store",
+    "communication_preferences",
+    "garden_profile",
+    "scheduled_appointments",
+}
+
+
 class Customer(BaseModel):
     """
     Represents a customer.
@@ -106,6 +124,17 @@ class Customer(BaseModel):
         """
         return self.model_dump_json(indent=4)
 
+    def to_profile_json(self) -> str:
+        """
+        Converts the Customer object to a compact JSON string for prompts.
+
+        Only the fields in PROFILE_FIELDS are included, without indentation.
+
+        Returns:
+            A compact JSON string representing the customer profile.
+        """
+        return self.model_dump_json(include=PROFILE_FIELDS)
+
     @staticmethod
     def get_customer(current_customer_id: str) -> Optional["Customer"]:
         """
@@ -14,10 +14,8 @@
 
 """Global instruction and instruction for the customer service agent."""
 
-from .entities.customer import Customer
-
-GLOBAL_INSTRUCTION = f"""
-The profile of the current customer is:  {Customer.get_customer("123").to_json()}
+GLOBAL_INSTRUCTION = """
+The profile of the current customer is:  {customer_profile}
 """
 
 INSTRUCTION = """
@@ -69,10 +67,11 @@ You have access to the following tools to assist you:
 *   `modify_cart(customer_id: str, items_to_add: list, items_to_remove: list) -> dict`: Updates the customer's cart. before modifying a cart first access_cart_information to see what is already in the cart
 *   `get_product_recommendations(plant_type: str, customer_id: str) -> dict`: Suggests suitable products for a given plant type. i.e petunias. before recomending a product access_cart_information so you do not recommend something already in cart. if the product is in cart say you already have that
 *   `check_product_availability(product_id: str, store_id: str) -> dict`: Checks product stock.
-*   `schedule_planting_service(customer_id: str, date: str, time_range: str, details: str) -> dict`: Books a planting service appointment.
-*   `get_available_planting_times(date: str) -> list`: Retrieves available time slots.
-*   `send_care_instructions(customer_id: str, plant_type: str, delivery_method: str) -> dict`: Sends plant care information.
-*   `generate_qr_code(customer_id: str, discount_value: float, discount_type: str, expiration_days: int) -> dict`: Creates a discount QR code 
+*   `check_cart_availability(customer_id: str, store_ids: list) -> dict`: Checks the stock of every item in the customer's cart at one or more stores in a single call. Prefer it over calling check_product_availability for each item.
+*   `schedule_planting_service(customer_id: str, date: str, time_range: str, details: str) -> dict`: Books a planting service appointment. If the status is "unavailable", the slot was just taken: check `get_available_planting_times` again and offer the remaining slots. If it is "retry", call it again with the same arguments.
+*   `get_available_planting_times(date: str) -> list`: Retrieves available time slots. Dates are in YYYY-MM-DD format.
+*   `send_care_instructions(customer_id: str, plant_type: str, delivery_method: str) -> dict`: Sends plant care information by 'email' or 'sms'.
+*   `generate_qr_code(customer_id: str, discount_value: float, discount_type: str, expiration_days: int) -> dict`: Creates a discount QR code and returns the name of its image artifact (`qr_code_artifact`).
 
 **Constraints:**
 
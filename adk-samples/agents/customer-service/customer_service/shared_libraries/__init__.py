@@ -14,7 +14,13 @@
 """ includes all shared libraries for the agent."""
 from .callbacks import rate_limit_callback
 from .callbacks import before_tool
+from .callbacks import make_before_tool
 from .callbacks import before_agent
 
 
-__all__ = ["rate_limit_callback", "before_tool", "before_agent"]
+__all__ = [
+    "rate_limit_callback",
+    "before_tool",
+    "make_before_tool",
+    "before_agent",
+]
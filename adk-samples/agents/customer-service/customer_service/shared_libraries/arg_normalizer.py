@@ -0,0 +1,164 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Lowercasing of the tool arguments that are marked for it.
+
+A tool marks the string fields to lowercase with the `lowercase` decorator:
+
+    @lowercase("store_id", "store_ids[]", "items_to_add[].product_id")
+    def my_tool(store_id: str, store_ids: list[str], items_to_add: list[dict])
+
+"name[]" is each string in a list and "name[].key" is a key of each
+dictionary in a list. `ArgNormalizer` checks the marked fields against the
+tool's parameters and compiles them into small functions once, when the agent
+is built. A tool call then lowercases the marked fields of its arguments in
+place; other arguments are not visited or copied, and a tool without marked
+fields costs one dictionary lookup.
+"""
+
+import inspect
+from collections.abc import Callable, Sequence
+from typing import Any
+
+LOWERCASE_ATTR = "lowercase_fields"
+
+_Apply = Callable[[Any], None]
+
+
+def lowercase(*fields: str):
+    """Marks tool argument fields to lowercase before the tool is called."""
+
+    def decorator(func):
+        setattr(func, LOWERCASE_ATTR, fields)
+        return func
+
+    return decorator
+
+
+def _parse(field: str) -> list[str]:
+    """Splits "items[].product_id" into ["items", "[]", "product_id"]."""
+    steps = []
+    for part in field.split("."):
+        name = part.removesuffix("[]")
+        if not name:
+            raise ValueError(f"Invalid field: {field}")
+        steps.append(name)
+        if part.endswith("[]"):
+            steps.append("[]")
+    return steps
+
+
+def _compile(steps: Sequence[str]) -> _Apply:
+    """Returns a function that lowercases the field at `steps` in place."""
+    step, rest = steps[0], steps[1:]
+    if step == "[]":
+        if not rest:
+
+            def lower_items(value):
+                if isinstance(value, list):
+                    for i, item in enumerate(value):
+                        if isinstance(item, str):
+                            value[i] = item.lower()
+
+            return lower_items
+        child = _compile(rest)
+
+        def each_item(value):
+            if isinstance(value, list):
+                for item in value:
+                    child(item)
+
+        return each_item
+    if not rest:
+
+        def lower_key(value):
+            if isinstance(value, dict):
+                text = value.get(step)
+                if isinstance(text, str):
+                    value[step] = text.lower()
+
+        return lower_key
+    child = _compile(rest)
+
+    def into_key(value):
+        if isinstance(value, dict) and step in value:
+            child(value[step])
+
+    return into_key
+
+
+def compile_tool(func: Callable) -> _Apply | None:
+    """Compiles the marked fields of a tool function.
+
+    Returns:
+      A function that lowercases the marked fields of an arguments dict in
+      place, or None if the tool has no marked fields.
+
+    Raises:
+      ValueError: If a marked field is not a parameter of the tool, or a
+        top-level field is not annotated as `str`.
+    """
+    fields = getattr(func, LOWERCASE_ATTR, ())
+    if not fields:
+        return None
+    parameters = inspect.signature(func).parameters
+    appliers = []
+    for field in fields:
+        steps = _parse(field)
+        parameter = parameters.get(steps[0])
+        if parameter is None:
+            raise ValueError(
+                f"{func.__name__} has no parameter {steps[0]!r} to lowercase"
+            )
+        if len(steps) == 1 and parameter.annotation not in (
+            str,
+            inspect.Parameter.empty,
+        ):
+            raise ValueError(
+                f"{func.__name__}.{field} is not a string and cannot be"
+                " lowercased"
+            )
+        appliers.append(_compile(steps))
+    if len(appliers) == 1:
+        return appliers[0]
+
+    def apply_all(args):
+        for apply in appliers:
+            apply(args)
+
+    return apply_all
+
+
+class ArgNormalizer:
+    """Normalizers of the arguments of a set of tools, by tool name.
+
+    Args:
+      tools: Tool functions or ADK tools wrapping a function.
+    """
+
+    def __init__(self, tools: Sequence[Any]):
+        self._normalizers: dict[str, _Apply] = {}
+        for tool in tools:
+            func = getattr(tool, "func", tool)
+            if not callable(func):
+                continue
+            normalizer = compile_tool(func)
+            if normalizer is not None:
+                name = getattr(tool, "name", None) or func.__name__
+                self._normalizers[name] = normalizer
+
+    def __call__(self, tool_name: str, args: dict[str, Any]) -> None:
+        """Lowercases the marked fields of `args` in place."""
+        normalizer = self._normalizers.get(tool_name)
+        if normalizer is not None:
+            normalizer(args)
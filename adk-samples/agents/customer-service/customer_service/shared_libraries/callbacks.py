@@ -14,20 +14,30 @@
 
 """Callback functions for FOMC Research Agent."""
 
+import json
 import logging
-import time
+from collections.abc import Sequence
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmRequest
 from typing import Any, Dict
 from google.adk.tools import BaseTool
 from google.adk.agents.invocation_context import InvocationContext
-from customer_service.entities.customer import Customer
+from customer_service.config import Config
+from customer_service.shared_libraries import (
+    arg_normalizer,
+    customer_repository,
+    rate_limiter,
+)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+configs = Config()
+
 RATE_LIMIT_SECS = 60
+# Requests per window allowed to one session; the quota shared by all
+# sessions is `configs.RPM_QUOTA`, enforced by the model (see `agent.py`).
 RPM_QUOTA = 10
 
 
@@ -36,6 +46,9 @@ def rate_limit_callback(
 ) -> None:
     """Callback function that implements a query rate limit.
 
+    Takes a token from the session's bucket; the model waits for it, and for
+    the shared quota, without blocking the event loop.
+
     Args:
       callback_context: A CallbackContext obj representing the active callback
         context.
@@ -43,68 +56,18 @@ def rate_limit_callback(
     """
     for content in llm_request.contents:
         for part in content.parts:
-            if part.text=="":
-                part.text=" "
-
-    
-    
-
-    now = time.time()
-    if "timer_start" not in callback_context.state:
-
-        callback_context.state["timer_start"] = now
-        callback_context.state["request_count"] = 1
-        logger.debug(
-            "rate_limit_callback [timestamp: %i, "
-            "req_count: 1, elapsed_secs: 0]",
-            now,
-        )
-        return
-
-    request_count = callback_context.state["request_count"] + 1
-    elapsed_secs = now - callback_context.state["timer_start"]
-    logger.debug(
-        "rate_limit_callback [timestamp: %i, request_count: %i,"
-        " elapsed_secs: %i]",
-        now,
-        request_count,
-        elapsed_secs,
+            if part.text == "":
+                part.text = " "
+    rate_limiter.reserve_session_token(
+        callback_context.state, RPM_QUOTA, RATE_LIMIT_SECS
     )
 
-    if request_count > RPM_QUOTA:
-        delay = RATE_LIMIT_SECS - elapsed_secs + 1
-        if delay > 0:
-            logger.debug("Sleeping for %i seconds", delay)
-            time.sleep(delay)
-        callback_context.state["timer_start"] = now
-        callback_context.state["request_count"] = 1
-    else:
-        callback_context.state["request_count"] = request_count
-
-    return
-
-
-def lowercase_value(value):
-    """Make dictionary lowercase"""
-    if isinstance(value, dict):
-        return (dict(k, lowercase_value(v)) for k, v in value.items())
-    elif isinstance(value, str):
-        return value.lower()
-    elif isinstance(value, (list, set, tuple)):
-        tp = type(value)
-        return tp(lowercase_value(i) for i in value)
-    else:
-        return value
-
 
 # Callback Methods
 def before_tool(
     tool: BaseTool, args: Dict[str, Any], tool_context: CallbackContext
 ):
 
-    # i make sure all values that the agent is sending to tools are lowercase
-    lowercase_value(args)
-
     # Check for the next tool call and then act accordingly.
     # Example logic based on the tool being called.
     if tool.name == "sync_ask_for_approval":
@@ -124,11 +87,34 @@ def before_tool(
     return None
 
 
+def make_before_tool(tools: Sequence[Any]):
+    """Returns `before_tool`, preceded by lowercasing the tool arguments.
+
+    The fields the tools mark with `arg_normalizer.lowercase` are compiled
+    here, once, and lowercased in place on every tool call.
+    """
+    normalize = arg_normalizer.ArgNormalizer(tools)
+
+    def normalizing_before_tool(
+        tool: BaseTool, args: Dict[str, Any], tool_context: CallbackContext
+    ):
+        normalize(tool.name, args)
+        return before_tool(tool, args, tool_context)
+
+    return normalizing_before_tool
+
+
 # checking that the customer profile is loaded as state.
 def before_agent(callback_context: InvocationContext):
     if "customer_profile" not in callback_context.state:
-        callback_context.state["customer_profile"] = Customer.get_customer(
-            "123"
-        ).to_json()
+        customer_id = callback_context.state.get(
+            "customer_id", customer_repository.DEFAULT_CUSTOMER_ID
+        )
+        repository = customer_repository.get_customer_repository()
+        profile = repository.get_profile_json(customer_id)
+        if profile is None:
+            logger.warning("Unknown customer id: %s", customer_id)
+            profile = json.dumps({"customer_id": customer_id})
+        callback_context.state["customer_profile"] = profile
 
     # logger.info(callback_context.state["customer_profile"])
@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Customer repository backed by a local SQLite file.
+
+Profiles are stored as compact JSON keyed by customer id. The compact
+profile JSON that is placed in session state is cached in process, so a new
+session for a known customer costs one dictionary lookup.
+"""
+
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from customer_service.config import Config
+from customer_service.entities.customer import Customer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CUSTOMER_ID = "123"
+PROFILE_CACHE_SIZE = 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+  customer_id TEXT PRIMARY KEY,
+  profile TEXT NOT NULL
+);
+"""
+
+
+class CustomerRepository:
+    """Customers stored in a SQLite file, with an LRU of profile JSON.
+
+    Attributes:
+      path: Path of the SQLite file.
+    """
+
+    def __init__(self, path: str, cache_size: int = PROFILE_CACHE_SIZE):
+        self.path = path
+        self._cache_size = cache_size
+        self._profiles: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            seeded = conn.execute("SELECT 1 FROM customers LIMIT 1").fetchone()
+        if seeded is None:
+            # Seed the demo customer used throughout this sample.
+            self.put(Customer.get_customer(DEFAULT_CUSTOMER_ID))
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, customer_id: str) -> Optional[Customer]:
+        """Returns the customer with the given id, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT profile FROM customers WHERE customer_id = ?",
+                (customer_id,),
+            ).fetchone()
+        return Customer.model_validate_json(row[0]) if row else None
+
+    def put(self, customer: Customer) -> None:
+        """Adds or replaces a customer."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO customers VALUES (?, ?)",
+                (customer.customer_id, customer.model_dump_json()),
+            )
+        with self._lock:
+            self._profiles.pop(customer.customer_id, None)
+
+    def get_profile_json(self, customer_id: str) -> Optional[str]:
+        """Returns the compact profile JSON of a customer, or None.
+
+        See `Customer.to_profile_json`.
+        """
+        with self._lock:
+            profile = self._profiles.get(customer_id)
+            if profile is not None:
+                self._profiles.move_to_end(customer_id)
+                return profile
+        customer = self.get(customer_id)
+        if customer is None:
+            return None
+        profile = customer.to_profile_json()
+        with self._lock:
+            self._profiles[customer_id] = profile
+            if len(self._profiles) > self._cache_size:
+                self._profiles.popitem(last=False)
+        return profile
+
+
+_customer_repository = None
+_customer_repository_lock = threading.Lock()
+
+
+def get_customer_repository() -> CustomerRepository:
+    """Returns the shared repository, stored in the configured DATA_DIR."""
+    global _customer_repository
+    with _customer_repository_lock:
+        if _customer_repository is None:
+            data_dir = os.path.expanduser(Config().DATA_DIR)
+            _customer_repository = CustomerRepository(
+                os.path.join(data_dir, "customers.sqlite3")
+            )
+        return _customer_repository
@@ -0,0 +1,311 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Product catalog and per-store inventory with array indexes.
+
+Product and store ids are kept in sorted NumPy arrays and looked up with
+`np.searchsorted`. Stock is stored sparsely, one entry per stocked
+(product, store) pair, under the integer key
+`product_index * num_stores + store_index`, so a batch of lookups is one
+vectorized binary search however many products and stores there are.
+
+The catalog and inventory are loaded from `catalog.csv` and `inventory.csv`
+(or `.parquet`) in the configured DATA_DIR, or from a small demo data set if
+those files do not exist:
+
+- catalog: product_id, name, description, price, plant_types (a
+  ";"-separated list; "*" marks the products recommended for any plant)
+- inventory: store_id, product_id, quantity
+"""
+
+import csv
+import logging
+import os
+import threading
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+
+from customer_service.config import Config
+
+logger = logging.getLogger(__name__)
+
+ANY_PLANT = "*"
+
+_DEMO_PRODUCTS = [
+    {
+        "product_id": "soil-123",
+        "name": "Standard Potting Soil",
+        "description": "A good all-purpose potting soil.",
+        "price": 12.99,
+        "plant_types": [ANY_PLANT],
+    },
+    {
+        "product_id": "fert-456",
+        "name": "General Purpose Fertilizer",
+        "description": "Suitable for a wide variety of plants.",
+        "price": 12.99,
+        "plant_types": [ANY_PLANT],
+    },
+    {
+        "product_id": "soil-456",
+        "name": "Bloom Booster Potting Mix",
+        "description": "Provides extra nutrients that Petunias love.",
+        "price": 15.99,
+        "plant_types": ["petunias"],
+    },
+    {
+        "product_id": "fert-789",
+        "name": "Flower Power Fertilizer",
+        "description": "Specifically formulated for flowering annuals.",
+        "price": 14.99,
+        "plant_types": ["petunias"],
+    },
+    # Products from the demo customer's purchase history.
+    {
+        "product_id": "fert-111",
+        "name": "All-Purpose Fertilizer",
+        "price": 19.99,
+    },
+    {"product_id": "trowel-222", "name": "Gardening Trowel", "price": 15.99},
+    {
+        "product_id": "seeds-333",
+        "name": "Tomato Seeds (Variety Pack)",
+        "price": 9.99,
+    },
+    {
+        "product_id": "pots-444",
+        "name": "Terracotta Pots (6-inch)",
+        "price": 5.63,
+    },
+    {
+        "product_id": "gloves-555",
+        "name": "Gardening Gloves (Leather)",
+        "price": 24.99,
+    },
+    {"product_id": "pruner-666", "name": "Pruning Shears", "price": 30.26},
+]
+_DEMO_STORES = ["main store", "pickup", "anytown garden store", "las vegas"]
+_DEMO_QUANTITY = 10
+
+
+def _normalize(ids: Sequence[str]) -> np.ndarray:
+    """Returns the ids as a string array, stripped and lowercased."""
+    return np.char.lower(np.char.strip(np.asarray(ids, dtype=str)))
+
+
+def _read_table(path: str) -> dict[str, list]:
+    """Reads a CSV or Parquet file into a dictionary of columns."""
+    if path.endswith(".parquet"):
+        try:
+            # pylint: disable-next=import-outside-toplevel
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet files requires pyarrow") from e
+        return pq.read_table(path).to_pydict()
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    # A header-only file gives empty columns; an empty one gives none.
+    return {
+        name: [row[name] for row in rows] for name in reader.fieldnames or ()
+    }
+
+
+def _find_table(data_dir: str, name: str) -> Optional[str]:
+    for extension in (".parquet", ".csv"):
+        path = os.path.join(data_dir, name + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _index(sorted_ids: np.ndarray, ids: Sequence[str]):
+    """Returns the positions of `ids` in `sorted_ids` and a found mask."""
+    ids = _normalize(ids)
+    positions = np.searchsorted(sorted_ids, ids)
+    clipped = np.minimum(positions, max(len(sorted_ids) - 1, 0))
+    found = (positions < len(sorted_ids)) & (
+        sorted_ids[clipped] == ids if len(sorted_ids) else False
+    )
+    return clipped, found
+
+
+class Inventory:
+    """Product catalog and stock per store.
+
+    Args:
+      product_ids: Product ids, in catalog order.
+      names: Product names.
+      descriptions: Product descriptions.
+      prices: Product prices.
+      plant_types: Per product, the plant types it is recommended for.
+      stock_store_ids: Store id of each stock entry.
+      stock_product_ids: Product id of each stock entry.
+      stock_quantities: Quantity of each stock entry.
+    """
+
+    def __init__(
+        self,
+        product_ids: Sequence[str],
+        names: Sequence[str],
+        descriptions: Sequence[str],
+        prices: Sequence[float],
+        plant_types: Sequence[Sequence[str]],
+        stock_store_ids: Sequence[str],
+        stock_product_ids: Sequence[str],
+        stock_quantities: Sequence[int],
+    ):
+        ids = _normalize(product_ids)
+        order = np.argsort(ids, kind="stable")
+        self._product_ids = ids[order]
+        self._original_ids = np.asarray(product_ids, dtype=object)[order]
+        self._names = np.asarray(names, dtype=object)[order]
+        self._descriptions = np.asarray(descriptions, dtype=object)[order]
+        self._prices = np.asarray(prices, dtype=float)[order]
+
+        # Plant type -> sorted positions, in catalog order.
+        position = np.empty(len(order), dtype=np.int64)
+        position[order] = np.arange(len(order))
+        by_plant: dict[str, list[int]] = {}
+        for i, types in enumerate(plant_types):
+            for plant_type in types:
+                by_plant.setdefault(plant_type.strip().lower(), []).append(
+                    int(position[i])
+                )
+        self._by_plant = {
+            plant: np.asarray(p, dtype=np.int64)
+            for plant, p in by_plant.items()
+        }
+
+        self._store_ids = np.unique(_normalize(stock_store_ids))
+        product_idx, product_found = _index(
+            self._product_ids, stock_product_ids
+        )
+        store_idx, _ = _index(self._store_ids, stock_store_ids)
+        keys = product_idx * len(self._store_ids) + store_idx
+        quantities = np.asarray(stock_quantities, dtype=np.int64)
+        keys, quantities = keys[product_found], quantities[product_found]
+        order = np.argsort(keys, kind="stable")
+        self._stock_keys = keys[order]
+        self._stock_quantities = quantities[order]
+
+    @classmethod
+    def from_files(cls, catalog_path: str, inventory_path: str) -> "Inventory":
+        """Loads the catalog and inventory from CSV or Parquet files."""
+        catalog = _read_table(catalog_path)
+        stock = _read_table(inventory_path)
+        plant_types = [
+            [t for t in str(value or "").split(";") if t.strip()]
+            for value in catalog.get(
+                "plant_types", [""] * len(catalog["product_id"])
+            )
+        ]
+        return cls(
+            product_ids=catalog["product_id"],
+            names=catalog["name"],
+            descriptions=catalog.get(
+                "description", [""] * len(catalog["product_id"])
+            ),
+            prices=[float(p) for p in catalog["price"]],
+            plant_types=plant_types,
+            stock_store_ids=stock["store_id"],
+            stock_product_ids=stock["product_id"],
+            stock_quantities=[int(q) for q in stock["quantity"]],
+        )
+
+    @classmethod
+    def demo(cls) -> "Inventory":
+        """Returns the demo catalog, stocked in every demo store."""
+        product_ids = [p["product_id"] for p in _DEMO_PRODUCTS]
+        return cls(
+            product_ids=product_ids,
+            names=[p["name"] for p in _DEMO_PRODUCTS],
+            descriptions=[p.get("description", "") for p in _DEMO_PRODUCTS],
+            prices=[p["price"] for p in _DEMO_PRODUCTS],
+            plant_types=[p.get("plant_types", []) for p in _DEMO_PRODUCTS],
+            stock_store_ids=[s for s in _DEMO_STORES for _ in product_ids],
+            stock_product_ids=product_ids * len(_DEMO_STORES),
+            stock_quantities=[_DEMO_QUANTITY]
+            * (len(product_ids) * len(_DEMO_STORES)),
+        )
+
+    def _product(self, i: int) -> dict:
+        return {
+            "product_id": self._original_ids[i],
+            "name": self._names[i],
+            "description": self._descriptions[i],
+            "price": float(self._prices[i]),
+        }
+
+    def get_products(self, product_ids: Sequence[str]) -> list[Optional[dict]]:
+        """Returns the catalog entry of each product id, or None if unknown."""
+        positions, found = _index(self._product_ids, product_ids)
+        return [
+            self._product(int(i)) if ok else None
+            for i, ok in zip(positions, found)
+        ]
+
+    def recommendations(self, plant_type: str) -> list[dict]:
+        """Returns the products for a plant type, or the general ones."""
+        positions = self._by_plant.get(plant_type.strip().lower())
+        if positions is None:
+            positions = self._by_plant.get(ANY_PLANT, np.empty(0, np.int64))
+        return [self._product(int(i)) for i in positions]
+
+    def quantities(
+        self, product_ids: Sequence[str], store_ids: Sequence[str]
+    ) -> np.ndarray:
+        """Looks up the stock of every product in every store.
+
+        Returns:
+          An array of shape (len(product_ids), len(store_ids)) with the
+          quantity in stock, or -1 where the product or store is unknown.
+        """
+        product_idx, product_found = _index(self._product_ids, product_ids)
+        store_idx, store_found = _index(self._store_ids, store_ids)
+        known = product_found[:, None] & store_found[None, :]
+        if len(self._stock_keys) == 0:
+            return np.where(known, 0, -1)
+        keys = (
+            product_idx[:, None] * len(self._store_ids) + store_idx[None, :]
+        ).ravel()
+        positions = np.searchsorted(self._stock_keys, keys)
+        clipped = np.minimum(positions, len(self._stock_keys) - 1)
+        stocked = (positions < len(self._stock_keys)) & (
+            self._stock_keys[clipped] == keys
+        )
+        result = np.where(stocked, self._stock_quantities[clipped], 0)
+        result = result.reshape(len(product_idx), len(store_idx))
+        return np.where(known, result, -1)
+
+
+_inventory = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory() -> Inventory:
+    """Returns the shared inventory, loaded from DATA_DIR or demo data."""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            data_dir = os.path.expanduser(Config().DATA_DIR)
+            catalog_path = _find_table(data_dir, "catalog")
+            inventory_path = _find_table(data_dir, "inventory")
+            if catalog_path and inventory_path:
+                logger.info("Loading inventory from %s", data_dir)
+                _inventory = Inventory.from_files(catalog_path, inventory_path)
+            else:
+                _inventory = Inventory.demo()
+        return _inventory
@@ -0,0 +1,183 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Rendering of care instruction messages and discount QR codes.
+
+Care instructions are rendered from a template per plant type and delivery
+channel. Each template is compiled once and kept in an LRU cache. QR codes
+are encoded as SVG by a pool of worker threads, so rendering does not block
+the event loop of the other sessions, and concurrent renders of the same
+payload share one job.
+
+Rendered content is saved through the ADK artifact service of the tool
+context, named after the SHA-256 of the message or QR payload. A name that
+is already among the session's artifacts is not rendered or saved again.
+"""
+
+import atexit
+import concurrent.futures
+import functools
+import hashlib
+import io
+import logging
+import string
+import threading
+from collections.abc import Sequence
+
+import qrcode
+import qrcode.image.svg
+from google.adk.tools import ToolContext
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+QR_MAX_WORKERS = 4
+TEMPLATE_CACHE_SIZE = 256
+
+CHANNEL_TEMPLATES = {
+    "email": (
+        "Subject: How to care for your $plant_name\n\n"
+        "Hello,\n\n"
+        "Thank you for shopping at Cymbal Home & Garden. Here is how to keep"
+        " your $plant_name healthy:\n\n"
+        "$tips\n\n"
+        "Happy gardening!\n"
+        "Cymbal Home & Garden (customer $customer_id)"
+    ),
+    "sms": "Cymbal Home & Garden: $plant_name care: $tips",
+}
+
+CARE_TIPS = {
+    "petunias": (
+        "Give them at least 6 hours of sun a day. Water when the top inch of"
+        " soil is dry. Feed every two weeks with a flowering fertilizer and"
+        " pinch off faded blooms."
+    ),
+}
+DEFAULT_CARE_TIPS = (
+    "Water when the top inch of soil is dry, give the plant the light shown"
+    " on its label and feed it monthly with a general purpose fertilizer."
+)
+
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compiled_template(plant_type: str, channel: str) -> string.Template:
+    """Returns the message template of a plant type and channel.
+
+    The plant fields are filled in; `$customer_id` is left to substitute.
+
+    Raises:
+      ValueError: If the channel is not supported.
+    """
+    template = CHANNEL_TEMPLATES.get(channel)
+    if template is None:
+        raise ValueError(
+            f"Unsupported delivery method: {channel}."
+            f" Use one of: {', '.join(CHANNEL_TEMPLATES)}"
+        )
+    filled = string.Template(template).safe_substitute(
+        plant_name=plant_type.capitalize(),
+        tips=CARE_TIPS.get(plant_type.lower(), DEFAULT_CARE_TIPS),
+    )
+    return string.Template(filled)
+
+
+def render_care_instructions(
+    customer_id: str, plant_type: str, channel: str
+) -> str:
+    """Renders the care instruction message for a customer."""
+    return compiled_template(plant_type, channel).safe_substitute(
+        customer_id=customer_id
+    )
+
+
+def artifact_name(kind: str, content: str, extension: str) -> str:
+    """Returns the name of an artifact, e.g. "qr-<sha256 prefix>.svg"."""
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+    return f"{kind}-{digest}.{extension}"
+
+
+def has_artifact(tool_context: ToolContext, name: str) -> bool:
+    """Whether the session already has an artifact with this name."""
+    return name in tool_context.list_artifacts()
+
+
+def render_qr(payload: str) -> bytes:
+    """Encodes a payload as an SVG QR code."""
+    image = qrcode.make(payload, image_factory=qrcode.image.svg.SvgPathImage)
+    buffer = io.BytesIO()
+    image.save(buffer)
+    return buffer.getvalue()
+
+
+def qr_part(svg: bytes) -> types.Part:
+    """Returns an SVG image as an artifact part."""
+    return types.Part.from_bytes(data=svg, mime_type="image/svg+xml")
+
+
+class RenderingService:
+    """Renders QR codes in worker threads, once per concurrent payload."""
+
+    def __init__(self, max_workers: int = QR_MAX_WORKERS):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="qr-render"
+        )
+        self._pending: dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    def submit_qr(self, payload: str) -> concurrent.futures.Future:
+        """Queues a QR code for rendering.
+
+        Returns:
+          A future of the SVG bytes, shared with the pending render of the
+          same payload if there is one.
+        """
+        with self._lock:
+            future = self._pending.get(payload)
+            if future is not None:
+                return future
+            future = self._executor.submit(render_qr, payload)
+            self._pending[payload] = future
+        future.add_done_callback(functools.partial(self._done, payload))
+        return future
+
+    def submit_qr_batch(
+        self, payloads: Sequence[str]
+    ) -> list[concurrent.futures.Future]:
+        """Queues several QR codes; returns their futures in order."""
+        return [self.submit_qr(payload) for payload in payloads]
+
+    def _done(self, payload: str, future: concurrent.futures.Future) -> None:
+        with self._lock:
+            if self._pending.get(payload) is future:
+                del self._pending[payload]
+        if future.exception() is not None:
+            logger.error("Rendering a QR code failed: %s", future.exception())
+
+    def close(self) -> None:
+        """Waits for the queued renders and stops the workers."""
+        self._executor.shutdown(wait=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_rendering_service() -> RenderingService:
+    """Returns the shared service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = RenderingService()
+            atexit.register(_service.close)
+        return _service
@@ -0,0 +1,322 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Planting crew availability and reservations.
+
+The booked hours of a crew on a day are a 24-bit bitmap, stored in SQLite
+with a version number. Open slots for a date range are computed for all
+crews at once by AND-ing a (crews x days) bitmap matrix with the bitmask of
+each slot. A reservation picks a free crew and sets the slot's bits with a
+compare-and-set on the version (optimistic concurrency): if another booking
+changed that crew's day in the meantime, the reservation re-reads and tries
+again. So concurrent bookings never double-book a crew and never hold locks
+while choosing a crew.
+"""
+
+import contextlib
+import dataclasses
+import datetime
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+
+from customer_service.config import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLOT_RANGES = ("9-12", "13-16")
+DEFAULT_STORE_ID = "anytown garden store"
+DEMO_CREW_COUNT = 3
+MAX_RESERVE_ATTEMPTS = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crews (
+  crew_id TEXT PRIMARY KEY,
+  store_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS crew_days (
+  crew_id TEXT NOT NULL,
+  date TEXT NOT NULL,
+  busy INTEGER NOT NULL,
+  version INTEGER NOT NULL,
+  PRIMARY KEY (date, crew_id)
+);
+CREATE TABLE IF NOT EXISTS appointments (
+  appointment_id TEXT PRIMARY KEY,
+  crew_id TEXT NOT NULL,
+  customer_id TEXT NOT NULL,
+  date TEXT NOT NULL,
+  time_range TEXT NOT NULL,
+  details TEXT,
+  created_at REAL NOT NULL
+);
+"""
+
+
+def slot_mask(time_range: str) -> int:
+    """Returns the bitmask of the hours in a range such as "9-12".
+
+    Raises:
+      ValueError: If the range is not "<start>-<end>" with whole hours and
+        0 <= start < end <= 24.
+    """
+    try:
+        start, end = (int(x) for x in time_range.split("-"))
+    except ValueError as e:
+        raise ValueError(f"Invalid time range: {time_range}") from e
+    if not 0 <= start < end <= 24:
+        raise ValueError(f"Invalid time range: {time_range}")
+    return ((1 << (end - start)) - 1) << start
+
+
+@dataclasses.dataclass
+class Appointment:
+    appointment_id: str
+    crew_id: str
+    customer_id: str
+    date: str
+    time_range: str
+    details: str
+
+
+class SlotEngine:
+    """Crews, their booked hours per day and appointments in SQLite.
+
+    Attributes:
+      path: Path of the SQLite file.
+      slot_ranges: Time ranges offered to customers, e.g. "9-12".
+    """
+
+    def __init__(
+        self, path: str, slot_ranges: Sequence[str] = DEFAULT_SLOT_RANGES
+    ):
+        self.path = path
+        self.slot_ranges = list(slot_ranges)
+        self._slot_masks = np.array(
+            [slot_mask(r) for r in self.slot_ranges], dtype=np.uint32
+        )
+        self._crews_lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self._load_crews()
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _load_crews(self) -> None:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT crew_id, store_id FROM crews ORDER BY crew_id"
+            ).fetchall()
+        with self._crews_lock:
+            self._crew_ids = [crew_id for crew_id, _ in rows]
+            self._crew_stores = np.array(
+                [store_id for _, store_id in rows], dtype=object
+            )
+
+    def add_crews(self, crew_ids: Sequence[str], store_id: str) -> None:
+        """Adds crews working for a store."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO crews VALUES (?, ?)",
+                [(crew_id, store_id) for crew_id in crew_ids],
+            )
+        self._load_crews()
+
+    def crews(self, store_id: Optional[str] = None) -> list[str]:
+        """Returns the crew ids, of one store or of all stores."""
+        with self._crews_lock:
+            if store_id is None:
+                return list(self._crew_ids)
+            selected = np.flatnonzero(self._crew_stores == store_id)
+            return [self._crew_ids[i] for i in selected]
+
+    def availability(
+        self,
+        start_date: str,
+        end_date: Optional[str] = None,
+        store_id: Optional[str] = None,
+    ) -> dict[str, dict[str, int]]:
+        """Counts the free crews of every slot in a date range.
+
+        Args:
+          start_date: First date (YYYY-MM-DD).
+          end_date: Last date, inclusive; defaults to `start_date`.
+          store_id: Only count the crews of this store.
+
+        Returns:
+          For each date, the number of free crews per slot range.
+        """
+        start = datetime.date.fromisoformat(start_date)
+        end = datetime.date.fromisoformat(end_date or start_date)
+        dates = [
+            (start + datetime.timedelta(days=i)).isoformat()
+            for i in range((end - start).days + 1)
+        ]
+        crews = self.crews(store_id)
+        crew_index = {crew_id: i for i, crew_id in enumerate(crews)}
+        date_index = {date: i for i, date in enumerate(dates)}
+        busy = np.zeros((len(crews), len(dates)), dtype=np.uint32)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT crew_id, date, busy FROM crew_days"
+                " WHERE date BETWEEN ? AND ? AND busy != 0",
+                (dates[0], dates[-1]),
+            ).fetchall()
+        for crew_id, date, bits in rows:
+            if crew_id in crew_index:
+                busy[crew_index[crew_id], date_index[date]] = bits
+        # (crews, days, slots) -> free crews per (day, slot).
+        free = (busy[:, :, None] & self._slot_masks[None, None, :]) == 0
+        counts = free.sum(axis=0)
+        return {
+            date: {
+                slot: int(counts[i, j])
+                for j, slot in enumerate(self.slot_ranges)
+            }
+            for i, date in enumerate(dates)
+        }
+
+    def available_ranges(
+        self, date: str, store_id: Optional[str] = None
+    ) -> list[str]:
+        """Returns the slot ranges with a free crew on a date."""
+        counts = self.availability(date, store_id=store_id)[date]
+        return [slot for slot in self.slot_ranges if counts[slot] > 0]
+
+    def reserve(
+        self,
+        customer_id: str,
+        date: str,
+        time_range: str,
+        details: str = "",
+        store_id: Optional[str] = None,
+    ) -> Optional[Appointment]:
+        """Books a free crew for a time range.
+
+        Returns:
+          The appointment, or None if no crew is free for the time range.
+
+        Raises:
+          ValueError: If the date or time range is invalid.
+        """
+        datetime.date.fromisoformat(date)
+        mask = slot_mask(time_range)
+        crews = self.crews(store_id)
+        for attempt in range(MAX_RESERVE_ATTEMPTS):
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT crew_id, busy, version FROM crew_days"
+                    " WHERE date = ?",
+                    (date,),
+                ).fetchall()
+            known = {
+                crew_id: (busy, version) for crew_id, busy, version in rows
+            }
+            free = [c for c in crews if not known.get(c, (0, 0))[0] & mask]
+            if not free:
+                return None
+            # Random choice spreads concurrent bookings over the free crews.
+            crew_id = random.choice(free)
+            busy, version = known.get(crew_id, (0, 0))
+            appointment = Appointment(
+                appointment_id=str(uuid.uuid4()),
+                crew_id=crew_id,
+                customer_id=customer_id,
+                date=date,
+                time_range=time_range,
+                details=details,
+            )
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO crew_days VALUES (?, ?, 0, 0)",
+                    (crew_id, date),
+                )
+                updated = conn.execute(
+                    "UPDATE crew_days SET busy = ?, version = version + 1"
+                    " WHERE crew_id = ? AND date = ? AND version = ?",
+                    (busy | mask, crew_id, date, version),
+                ).rowcount
+                if updated:
+                    conn.execute(
+                        "INSERT INTO appointments VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            appointment.appointment_id,
+                            crew_id,
+                            customer_id,
+                            date,
+                            time_range,
+                            details,
+                            time.time(),
+                        ),
+                    )
+                    return appointment
+            logger.debug(
+                "Booking conflict for crew %s on %s (attempt %d)",
+                crew_id,
+                date,
+                attempt + 1,
+            )
+        raise RuntimeError(
+            f"Could not book {date} {time_range}: too many conflicts"
+        )
+
+    def appointments(self, date: str) -> list[Appointment]:
+        """Returns the appointments on a date."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT appointment_id, crew_id, customer_id, date,"
+                " time_range, details FROM appointments WHERE date = ?",
+                (date,),
+            ).fetchall()
+        return [Appointment(*row) for row in rows]
+
+
+_slot_engine = None
+_slot_engine_lock = threading.Lock()
+
+
+def get_slot_engine() -> SlotEngine:
+    """Returns the shared slot engine, stored in the configured DATA_DIR.
+
+    A new store is seeded with the demo crews.
+    """
+    global _slot_engine
+    with _slot_engine_lock:
+        if _slot_engine is None:
+            data_dir = os.path.expanduser(Config().DATA_DIR)
+            engine = SlotEngine(os.path.join(data_dir, "schedule.sqlite3"))
+            if not engine.crews():
+                engine.add_crews(
+                    [f"crew-{i + 1}" for i in range(DEMO_CREW_COUNT)],
+                    DEFAULT_STORE_ID,
+                )
+            _slot_engine = engine
+        return _slot_engine
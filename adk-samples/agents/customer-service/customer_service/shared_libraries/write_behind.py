@@ -0,0 +1,441 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Write-behind queue for cart and CRM updates.
+
+Tools only write to a local SQLite journal and return. Carts are kept in the
+same file, so reads see every change right away. The journal holds at most
+one open write per customer and kind: a cart change replaces the open cart
+snapshot, and CRM updates are merged into one open update. A background
+thread sends the pending writes to the CRM in batches. Each write carries an
+idempotency key, so a batch that is retried after a timeout is applied only
+once. A write is frozen when its batch is sent: changes made while it is in
+flight, or before a failed batch is retried, go into a new open write, so a
+retried write keeps both its key and its content. Writes that fail stay in
+the journal and are retried with backoff, also after a restart.
+
+Without a configured CRM_URL, flushed writes are only logged.
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+import uuid
+from collections.abc import Callable
+from typing import Any, Optional
+
+from customer_service.config import Config
+from customer_service.shared_libraries import inventory
+
+logger = logging.getLogger(__name__)
+
+CART = "cart"
+CRM = "crm"
+
+FLUSH_INTERVAL_SECS = 2.0
+MAX_BACKOFF_SECS = 60.0
+MAX_BATCH_SIZE = 100
+CRM_TIMEOUT_SECS = 10
+
+# Every customer starts with the demo cart of this sample.
+DEMO_CART_ITEMS = [
+    {"product_id": "soil-123", "name": "Standard Potting Soil", "quantity": 1},
+    {
+        "product_id": "fert-456",
+        "name": "General Purpose Fertilizer",
+        "quantity": 1,
+    },
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS carts (
+  customer_id TEXT PRIMARY KEY,
+  items TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS outbox (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  customer_id TEXT NOT NULL,
+  kind TEXT NOT NULL,
+  payload TEXT NOT NULL,
+  idempotency_key TEXT NOT NULL,
+  sent INTEGER NOT NULL DEFAULT 0,
+  updated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS outbox_open
+  ON outbox (customer_id, kind) WHERE sent = 0;
+"""
+
+# Journal of earlier versions, with one row per customer and kind. Its rows
+# may have been sent already, so they are moved over as frozen writes.
+_MIGRATE_PENDING_WRITES = """
+INSERT INTO outbox (customer_id, kind, payload, idempotency_key, sent,
+                    updated_at)
+  SELECT customer_id, kind, payload, idempotency_key, 1, updated_at
+  FROM pending_writes ORDER BY updated_at;
+DROP TABLE pending_writes;
+"""
+
+Batch = list[dict[str, Any]]
+
+
+def log_sink(batch: Batch) -> None:
+    """Sink used without a CRM: logs the writes."""
+    for write in batch:
+        logger.info("CRM write (not sent, no CRM_URL): %s", write)
+
+
+class HttpCrmSink:
+    """Posts batches to `<base_url>/batch` as JSON."""
+
+    def __init__(self, base_url: str, timeout_secs: float = CRM_TIMEOUT_SECS):
+        self.url = base_url.rstrip("/") + "/batch"
+        self.timeout_secs = timeout_secs
+
+    def __call__(self, batch: Batch) -> None:
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"writes": batch}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        # Raises urllib.error.HTTPError on 4xx and 5xx responses.
+        with urllib.request.urlopen(request, timeout=self.timeout_secs):
+            pass
+
+
+def _merge_crm_update(pending: dict, details: Any) -> dict:
+    """Merges CRM details into a pending update."""
+    if isinstance(details, dict):
+        pending.setdefault("fields", {}).update(details)
+    elif details:
+        pending.setdefault("notes", []).append(str(details))
+    return pending
+
+
+def _quantity(value: Any) -> Optional[int]:
+    """Returns a quantity as a positive int, or None if it is not one."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.isdigit():
+            return None
+    if isinstance(value, float) and not value.is_integer():
+        return None
+    try:
+        quantity = int(value)
+    except (TypeError, ValueError):
+        return None
+    return quantity if quantity > 0 else None
+
+
+def _apply_cart_change(
+    items: list[dict],
+    items_to_add: list[dict],
+    items_to_remove: list[dict],
+    product_names: Callable[[list[str]], list[Optional[str]]],
+) -> tuple[list[dict], list[dict]]:
+    """Adds and removes cart items.
+
+    Returns:
+      The cart items after the change, and an error for each item that was
+      skipped because its quantity is not a positive whole number.
+    """
+    errors = []
+
+    def invalid(item: dict) -> bool:
+        if _quantity(item["quantity"]) is not None:
+            return False
+        errors.append(
+            {
+                "product_id": item.get("product_id"),
+                "message": (
+                    f"Invalid quantity {item['quantity']!r}; use a positive"
+                    " whole number."
+                ),
+            }
+        )
+        return True
+
+    items = [dict(item) for item in items]
+    by_id = {item["product_id"]: item for item in items}
+    new_ids = [
+        item["product_id"]
+        for item in items_to_add or []
+        if item.get("product_id") not in by_id
+    ]
+    names = dict(zip(new_ids, product_names(new_ids))) if new_ids else {}
+    for item in items_to_add or []:
+        product_id = item.get("product_id")
+        if not product_id or ("quantity" in item and invalid(item)):
+            continue
+        quantity = _quantity(item.get("quantity", 1))
+        if product_id in by_id:
+            by_id[product_id]["quantity"] += quantity
+        else:
+            by_id[product_id] = {
+                "product_id": product_id,
+                "name": names.get(product_id) or product_id,
+                "quantity": quantity,
+            }
+            items.append(by_id[product_id])
+    for item in items_to_remove or []:
+        if isinstance(item, str):
+            item = {"product_id": item}
+        current = by_id.get(item.get("product_id"))
+        if current is None or ("quantity" in item and invalid(item)):
+            continue
+        if "quantity" in item:
+            current["quantity"] -= _quantity(item["quantity"])
+        if "quantity" not in item or current["quantity"] <= 0:
+            del by_id[current["product_id"]]
+    return [item for item in items if item["product_id"] in by_id], errors
+
+
+class WriteBehindQueue:
+    """Local carts and journal of pending CRM writes, flushed in background.
+
+    Attributes:
+      path: Path of the SQLite file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sink: Callable[[Batch], None] = log_sink,
+        flush_interval_secs: float = FLUSH_INTERVAL_SECS,
+        product_names: Optional[Callable[[list[str]], list]] = None,
+    ):
+        self.path = path
+        self._sink = sink
+        self._flush_interval_secs = flush_interval_secs
+        self._product_names = product_names or (lambda ids: [None] * len(ids))
+        self._write_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'pending_writes'"
+            ).fetchone():
+                conn.executescript(_MIGRATE_PENDING_WRITES)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _enqueue(
+        self,
+        conn: sqlite3.Connection,
+        customer_id: str,
+        kind: str,
+        payload: dict,
+    ) -> None:
+        """Replaces the open write of a customer and kind, or adds one."""
+        updated = conn.execute(
+            "UPDATE outbox SET payload = ?, updated_at = ?"
+            " WHERE customer_id = ? AND kind = ? AND sent = 0",
+            (json.dumps(payload), time.time(), customer_id, kind),
+        ).rowcount
+        if not updated:
+            conn.execute(
+                "INSERT INTO outbox (customer_id, kind, payload,"
+                " idempotency_key, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    customer_id,
+                    kind,
+                    json.dumps(payload),
+                    uuid.uuid4().hex,
+                    time.time(),
+                ),
+            )
+
+    def get_cart(self, customer_id: str) -> list[dict]:
+        """Returns the items in a customer's cart."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT items FROM carts WHERE customer_id = ?", (customer_id,)
+            ).fetchone()
+        if row is None:
+            return [dict(item) for item in DEMO_CART_ITEMS]
+        return json.loads(row[0])
+
+    def modify_cart(
+        self,
+        customer_id: str,
+        items_to_add: list[dict],
+        items_to_remove: list[dict],
+    ) -> tuple[list[dict], list[dict]]:
+        """Changes a cart locally and queues the new cart for the CRM.
+
+        Returns:
+          The items in the cart after the change, and an error for each item
+          that was skipped.
+        """
+        with self._write_lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT items FROM carts WHERE customer_id = ?", (customer_id,)
+            ).fetchone()
+            items = json.loads(row[0]) if row else DEMO_CART_ITEMS
+            items, errors = _apply_cart_change(
+                items, items_to_add, items_to_remove, self._product_names
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO carts VALUES (?, ?)",
+                (customer_id, json.dumps(items)),
+            )
+            self._enqueue(conn, customer_id, CART, {"items": items})
+        self.start()
+        return items, errors
+
+    def update_crm(self, customer_id: str, details: Any) -> None:
+        """Queues a CRM update, merged with the customer's open one."""
+        with self._write_lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT payload FROM outbox"
+                " WHERE customer_id = ? AND kind = ? AND sent = 0",
+                (customer_id, CRM),
+            ).fetchone()
+            pending = json.loads(row[0]) if row else {}
+            self._enqueue(
+                conn, customer_id, CRM, _merge_crm_update(pending, details)
+            )
+        self.start()
+
+    def pending_count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM outbox"
+            ).fetchone()[0]
+
+    def flush(self) -> int:
+        """Sends the pending writes to the CRM.
+
+        Returns:
+          The number of writes sent.
+
+        Raises:
+          Exception: Whatever the sink raised; the writes stay pending.
+        """
+        sent = 0
+        with self._flush_lock:
+            while True:
+                # The writes are frozen before they are sent; later changes
+                # go into new open writes.
+                with self._write_lock, self._connect() as conn:
+                    rows = conn.execute(
+                        "SELECT id, customer_id, kind, payload,"
+                        " idempotency_key FROM outbox ORDER BY id LIMIT ?",
+                        (MAX_BATCH_SIZE,),
+                    ).fetchall()
+                    conn.executemany(
+                        "UPDATE outbox SET sent = 1 WHERE id = ?",
+                        [(row[0],) for row in rows],
+                    )
+                if not rows:
+                    return sent
+                batch = [
+                    {
+                        "customer_id": customer_id,
+                        "kind": kind,
+                        "payload": json.loads(payload),
+                        "idempotency_key": key,
+                    }
+                    for _, customer_id, kind, payload, key in rows
+                ]
+                self._sink(batch)
+                with self._write_lock, self._connect() as conn:
+                    conn.executemany(
+                        "DELETE FROM outbox WHERE id = ?",
+                        [(row[0],) for row in rows],
+                    )
+                sent += len(batch)
+
+    def _run(self) -> None:
+        delay_secs = self._flush_interval_secs
+        # Writes are not sent right away, so the ones made within an
+        # interval are coalesced into one batch.
+        while not self._stopped.wait(delay_secs):
+            try:
+                self.flush()
+                delay_secs = self._flush_interval_secs
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                delay_secs = min(delay_secs * 2, MAX_BACKOFF_SECS)
+                logger.warning(
+                    "CRM flush failed, retrying in %.0f s: %s", delay_secs, e
+                )
+
+    def start(self) -> None:
+        """Starts the background flush thread if it is not running."""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="crm-write-behind", daemon=True
+                )
+                self._thread.start()
+
+    def close(self, flush: bool = True) -> None:
+        """Stops the flush thread, then flushes once more if asked."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            try:
+                self.flush()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("Final CRM flush failed, writes kept: %s", e)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_write_behind_queue() -> WriteBehindQueue:
+    """Returns the shared queue, stored in the configured DATA_DIR."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            configs = Config()
+            data_dir = os.path.expanduser(configs.DATA_DIR)
+
+            def product_names(product_ids):
+                products = inventory.get_inventory().get_products(product_ids)
+                return [p["name"] if p else None for p in products]
+
+            sink = HttpCrmSink(configs.CRM_URL) if configs.CRM_URL else log_sink
+            _queue = WriteBehindQueue(
+                os.path.join(data_dir, "write_behind.sqlite3"),
+                sink=sink,
+                product_names=product_names,
+            )
+            atexit.register(_queue.close)
+        return _queue
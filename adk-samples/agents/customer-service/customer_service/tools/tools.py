@@ -14,10 +14,21 @@
 # add docstring to this module
 """Tools module for the customer service agent."""
 
+import asyncio
 import logging
-import uuid
 from datetime import datetime, timedelta
 
+from google.adk.tools import ToolContext
+from google.genai import types
+
+from ..shared_libraries import (
+    inventory,
+    rendering,
+    scheduling,
+    write_behind,
+)
+from ..shared_libraries.arg_normalizer import lowercase
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,6 +52,7 @@ def send_call_companion_link(phone_number: str) -> str:
     return {"status": "success", "message": f"Link sent to {phone_number}"}
 
 
+@lowercase("discount_type")
 def approve_discount(discount_type: str, value: float, reason: str) -> str:
     """
     Approve the flat rate or percentage discount requested by the user.
@@ -65,6 +77,7 @@ def approve_discount(discount_type: str, value: float, reason: str) -> str:
     return '{"status": "ok"}'
 
 
+@lowercase("discount_type")
 def sync_ask_for_approval(discount_type: str, value: float, reason: str) -> str:
     """
     Asks the manager for approval for a discount.
@@ -115,6 +128,8 @@ def update_salesforce_crm(customer_id: str, details: dict) -> dict:
         customer_id,
         details,
     )
+    # The update is journaled locally and sent to the CRM in the background.
+    write_behind.get_write_behind_queue().update_crm(customer_id, details)
     return {"status": "success", "message": "Salesforce record updated."}
 
 
@@ -132,25 +147,23 @@ def access_cart_information(customer_id: str) -> dict:
     """
     logger.info("Accessing cart information for customer ID: %s", customer_id)
 
-    # MOCK API RESPONSE - Replace with actual API call
-    mock_cart = {
-        "items": [
-            {
-                "product_id": "soil-123",
-                "name": "Standard Potting Soil",
-                "quantity": 1,
-            },
-            {
-                "product_id": "fert-456",
-                "name": "General Purpose Fertilizer",
-                "quantity": 1,
-            },
-        ],
-        "subtotal": 25.98,
-    }
-    return mock_cart
+    items = write_behind.get_write_behind_queue().get_cart(customer_id)
+    products = inventory.get_inventory().get_products(
+        [item["product_id"] for item in items]
+    )
+    subtotal = sum(
+        product["price"] * item["quantity"]
+        for item, product in zip(items, products)
+        if product is not None
+    )
+    return {"items": items, "subtotal": round(subtotal, 2)}
 
 
+@lowercase(
+    "items_to_add[].product_id",
+    "items_to_remove[]",
+    "items_to_remove[].product_id",
+)
 def modify_cart(
     customer_id: str, items_to_add: list[dict], items_to_remove: list[dict]
 ) -> dict:
@@ -171,15 +184,28 @@ def modify_cart(
     logger.info("Modifying cart for customer ID: %s", customer_id)
     logger.info("Adding items: %s", items_to_add)
     logger.info("Removing items: %s", items_to_remove)
-    # MOCK API RESPONSE - Replace with actual API call
+    # The cart is updated locally and sent to the CRM in the background.
+    _, item_errors = write_behind.get_write_behind_queue().modify_cart(
+        customer_id, items_to_add, items_to_remove
+    )
+    if item_errors:
+        return {
+            "status": "error",
+            "message": (
+                "Cart updated, except for the items in item_errors; fix"
+                " their quantities and try those items again."
+            ),
+            "item_errors": item_errors,
+        }
     return {
         "status": "success",
         "message": "Cart updated successfully.",
-        "items_added": True,
-        "items_removed": True,
+        "items_added": bool(items_to_add),
+        "items_removed": bool(items_to_remove),
     }
 
 
+@lowercase("plant_type")
 def get_product_recommendations(plant_type: str, customer_id: str) -> dict:
     """Provides product recommendations based on the type of plant.
 
@@ -200,40 +226,20 @@ def get_product_recommendations(plant_type: str, customer_id: str) -> dict:
         plant_type,
         customer_id,
     )
-    # MOCK API RESPONSE - Replace with actual API call or recommendation engine
-    if plant_type.lower() == "petunias":
-        recommendations = {
-            "recommendations": [
-                {
-                    "product_id": "soil-456",
-                    "name": "Bloom Booster Potting Mix",
-                    "description": "Provides extra nutrients that Petunias love.",
-                },
-                {
-                    "product_id": "fert-789",
-                    "name": "Flower Power Fertilizer",
-                    "description": "Specifically formulated for flowering annuals.",
-                },
-            ]
-        }
-    else:
-        recommendations = {
-            "recommendations": [
-                {
-                    "product_id": "soil-123",
-                    "name": "Standard Potting Soil",
-                    "description": "A good all-purpose potting soil.",
-                },
-                {
-                    "product_id": "fert-456",
-                    "name": "General Purpose Fertilizer",
-                    "description": "Suitable for a wide variety of plants.",
-                },
-            ]
-        }
-    return recommendations
+    products = inventory.get_inventory().recommendations(plant_type)
+    return {
+        "recommendations": [
+            {
+                "product_id": product["product_id"],
+                "name": product["name"],
+                "description": product["description"],
+            }
+            for product in products
+        ]
+    }
 
 
+@lowercase("product_id", "store_id")
 def check_product_availability(product_id: str, store_id: str) -> dict:
     """Checks the availability of a product at a specified store (or for pickup).
 
@@ -254,8 +260,64 @@ def check_product_availability(product_id: str, store_id: str) -> dict:
         product_id,
         store_id,
     )
-    # MOCK API RESPONSE - Replace with actual API call
-    return {"available": True, "quantity": 10, "store": store_id}
+    quantity = int(
+        inventory.get_inventory().quantities([product_id], [store_id])[0, 0]
+    )
+    if quantity < 0:
+        return {
+            "available": False,
+            "quantity": 0,
+            "store": store_id,
+            "message": "Unknown product or store.",
+        }
+    return {"available": quantity > 0, "quantity": quantity, "store": store_id}
+
+
+@lowercase("store_ids[]")
+def check_cart_availability(customer_id: str, store_ids: list[str]) -> dict:
+    """Checks the availability of every item in the cart at several stores.
+
+    Args:
+        customer_id: The ID of the customer.
+        store_ids: The IDs of the stores (or 'pickup' for pickup availability).
+
+    Returns:
+        A dictionary with, for each store, whether the whole cart is available
+        and the quantity available of each item. Example:
+        {'stores': {'pickup': {'all_available': True, 'items': [
+            {'product_id': 'soil-123', 'requested': 1, 'available': 10}
+        ]}}}
+
+    Example:
+        >>> check_cart_availability(customer_id='123', store_ids=['pickup'])
+        {'stores': {'pickup': {'all_available': True, 'items': [...]}}}
+    """
+    logger.info(
+        "Checking cart availability for customer ID: %s at stores: %s",
+        customer_id,
+        store_ids,
+    )
+    items = access_cart_information(customer_id)["items"]
+    quantities = inventory.get_inventory().quantities(
+        [item["product_id"] for item in items], store_ids
+    )
+    stores = {}
+    for j, store_id in enumerate(store_ids):
+        store_items = [
+            {
+                "product_id": item["product_id"],
+                "requested": item["quantity"],
+                "available": max(int(quantities[i, j]), 0),
+            }
+            for i, item in enumerate(items)
+        ]
+        stores[store_id] = {
+            "all_available": all(
+                x["available"] >= x["requested"] for x in store_items
+            ),
+            "items": store_items,
+        }
+    return {"stores": stores}
 
 
 def schedule_planting_service(
@@ -270,7 +332,9 @@ def schedule_planting_service(
         details: Any additional details (e.g., "Planting Petunias").
 
     Returns:
-        A dictionary indicating the status of the scheduling. Example:
+        A dictionary indicating the status of the scheduling: 'success',
+        'unavailable', 'error' for an invalid date or time range, or 'retry'
+        if the booking can be tried again. Example:
         {'status': 'success', 'appointment_id': '12345', 'date': '2024-07-29', 'time': '9:00 AM - 12:00 PM'}
 
     Example:
@@ -284,8 +348,20 @@ def schedule_planting_service(
         time_range,
     )
     logger.info("Details: %s", details)
-    # MOCK API RESPONSE - Replace with actual API call to your scheduling system
-    # Calculate confirmation time based on date and time_range
+    try:
+        appointment = scheduling.get_slot_engine().reserve(
+            customer_id, date, time_range, details
+        )
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    except RuntimeError as e:
+        # Many concurrent bookings for the same day; a new attempt can pass.
+        return {"status": "retry", "message": f"{e}. Please try again."}
+    if appointment is None:
+        return {
+            "status": "unavailable",
+            "message": f"No planting crew is free on {date} ({time_range}).",
+        }
     start_time_str = time_range.split("-")[0]  # Get the start time (e.g., "9")
     confirmation_time_str = (
         f"{date} {start_time_str}:00"  # e.g., "2024-07-29 9:00"
@@ -293,34 +369,43 @@ def schedule_planting_service(
 
     return {
         "status": "success",
-        "appointment_id": str(uuid.uuid4()),
+        "appointment_id": appointment.appointment_id,
         "date": date,
         "time": time_range,
         "confirmation_time": confirmation_time_str,  # formatted time for calendar
     }
 
 
-def get_available_planting_times(date: str) -> list:
+def get_available_planting_times(date: str) -> list | dict:
     """Retrieves available planting service time slots for a given date.
 
     Args:
         date: The date to check (YYYY-MM-DD).
 
     Returns:
-        A list of available time ranges.
+        A list of available time ranges, or a dictionary with an error
+        message if the date is not in the YYYY-MM-DD format.
 
     Example:
         >>> get_available_planting_times(date='2024-07-29')
         ['9-12', '13-16']
     """
     logger.info("Retrieving available planting times for %s", date)
-    # MOCK API RESPONSE - Replace with actual API call
-    # Generate some mock time slots, ensuring they're in the correct format:
-    return ["9-12", "13-16"]
+    try:
+        return scheduling.get_slot_engine().available_ranges(date)
+    except ValueError:
+        return {
+            "status": "error",
+            "message": f"Invalid date: {date}. Use the YYYY-MM-DD format.",
+        }
 
 
+@lowercase("plant_type", "delivery_method")
 def send_care_instructions(
-    customer_id: str, plant_type: str, delivery_method: str
+    customer_id: str,
+    plant_type: str,
+    delivery_method: str,
+    tool_context: ToolContext,
 ) -> dict:
     """Sends an email or SMS with instructions on how to take care of a specific plant type.
 
@@ -328,13 +413,15 @@ def send_care_instructions(
         customer_id:  The ID of the customer.
         plant_type: The type of plant.
         delivery_method: 'email' (default) or 'sms'.
+        tool_context: The tool context, whose artifacts keep the message.
 
     Returns:
-        A dictionary indicating the status.
+        A dictionary indicating the status, with the name of the artifact of
+        the message that was sent.
 
     Example:
         >>> send_care_instructions(customer_id='123', plant_type='Petunias', delivery_method='email')
-        {'status': 'success', 'message': 'Care instructions for Petunias sent via email.'}
+        {'status': 'success', 'message': 'Care instructions for Petunias sent via email.', 'content_artifact': 'care-email-....txt'}
     """
     logger.info(
         "Sending care instructions for %s to customer: %s via %s",
@@ -342,18 +429,31 @@ def send_care_instructions(
         customer_id,
         delivery_method,
     )
-    # MOCK API RESPONSE - Replace with actual API call or email/SMS sending logic
+    try:
+        body = rendering.render_care_instructions(
+            customer_id, plant_type, delivery_method
+        )
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    content_artifact = rendering.artifact_name(
+        f"care-{delivery_method}", body, "txt"
+    )
+    if not rendering.has_artifact(tool_context, content_artifact):
+        tool_context.save_artifact(content_artifact, types.Part(text=body))
+    # MOCK API RESPONSE - Replace with actual email/SMS sending logic
     return {
         "status": "success",
         "message": f"Care instructions for {plant_type} sent via {delivery_method}.",
+        "content_artifact": content_artifact,
     }
 
 
-def generate_qr_code(
+async def generate_qr_code(
     customer_id: str,
     discount_value: float,
     discount_type: str,
     expiration_days: int,
+    tool_context: ToolContext,
 ) -> dict:
     """Generates a QR code for a discount.
 
@@ -362,14 +462,16 @@ def generate_qr_code(
         discount_value: The value of the discount (e.g., 10 for 10%).
         discount_type: "percentage" (default) or "fixed".
         expiration_days: Number of days until the QR code expires.
+        tool_context: The tool context, whose artifacts keep the image.
 
     Returns:
-        A dictionary containing the QR code data (or a link to it). Example:
-        {'status': 'success', 'qr_code_data': '...', 'expiration_date': '2024-08-28'}
+        A dictionary with the name of the artifact of the QR code image.
+        Example:
+        {'status': 'success', 'qr_code_artifact': 'qr-....svg', 'expiration_date': '2024-08-28'}
 
     Example:
         >>> generate_qr_code(customer_id='123', discount_value=10.0, discount_type='percentage', expiration_days=30)
-        {'status': 'success', 'qr_code_data': 'MOCK_QR_CODE_DATA', 'expiration_date': '2024-08-24'}
+        {'status': 'success', 'qr_code_artifact': 'qr-....svg', 'expiration_date': '2024-08-24'}
     """
     logger.info(
         "Generating QR code for customer: %s with %s - %s discount.",
@@ -377,12 +479,22 @@ def generate_qr_code(
         discount_value,
         discount_type,
     )
-    # MOCK API RESPONSE - Replace with actual QR code generation library
     expiration_date = (
         datetime.now() + timedelta(days=expiration_days)
     ).strftime("%Y-%m-%d")
+    payload = (
+        f"CYMBAL-DISCOUNT:{customer_id}:{discount_type}:{discount_value}"
+        f":{expiration_date}"
+    )
+    qr_code_artifact = rendering.artifact_name("qr", payload, "svg")
+    if not rendering.has_artifact(tool_context, qr_code_artifact):
+        # Rendered in a worker thread, so other sessions keep running.
+        svg = await asyncio.wrap_future(
+            rendering.get_rendering_service().submit_qr(payload)
+        )
+        tool_context.save_artifact(qr_code_artifact, rendering.qr_part(svg))
     return {
         "status": "success",
-        "qr_code_data": "MOCK_QR_CODE_DATA",  # Replace with actual QR code
+        "qr_code_artifact": qr_code_artifact,
         "expiration_date": expiration_date,
     }
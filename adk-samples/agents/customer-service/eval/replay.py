@@ -0,0 +1,380 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Replays the eval conversations with a recorded model to time the agent.
+
+The model is replaced by `ReplayLlm`, which answers each turn with the tool
+calls and reply recorded in the eval data, so the timings do not depend on a
+live model. Everything else runs as in production: the ADK runner, the
+callbacks, the tools and the session and artifact services. For each turn
+this measures the time spent in callbacks and tools, the rest of the
+framework overhead, the time to serialize the session state and the size of
+the state and of the customer profile in it.
+
+Run from the customer-service directory:
+
+  python -m eval.replay [--eval-set PATH] [--budget-ms MS]
+
+Tools write to a temporary DATA_DIR unless GOOGLE_DATA_DIR is set.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import functools
+import inspect
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Sequence
+from typing import Any, AsyncGenerator, Optional
+
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import FunctionTool
+from google.genai import types
+from tabulate import tabulate
+
+from customer_service import agent
+
+EVAL_DIR = os.path.dirname(os.path.abspath(__file__))
+EVAL_SETS = [
+    os.path.join(EVAL_DIR, "eval_data", "simple.test.json"),
+    os.path.join(EVAL_DIR, "eval_data", "full_conversation.test.json"),
+]
+SESSION_FILE = os.path.join(EVAL_DIR, "sessions", "123.session.json")
+REPLAY_MODEL = "replay"
+
+
+@dataclasses.dataclass
+class TurnMetrics:
+    """Timings in milliseconds and sizes in bytes of one replayed turn."""
+
+    query: str
+    tool_calls: list[str]
+    total_ms: float = 0.0
+    model_ms: float = 0.0
+    callbacks_ms: float = 0.0
+    tools_ms: float = 0.0
+    state_serialization_ms: float = 0.0
+    state_bytes: int = 0
+    profile_bytes: int = 0
+
+    @property
+    def agent_ms(self) -> float:
+        """Time spent outside the model."""
+        return self.total_ms - self.model_ms
+
+    @property
+    def framework_ms(self) -> float:
+        """Time spent outside the model, the callbacks and the tools."""
+        return self.agent_ms - self.callbacks_ms - self.tools_ms
+
+
+class _Timer:
+    """Accumulates the time spent in one category during a turn."""
+
+    def __init__(self):
+        self.ms = 0.0
+
+    def add_since(self, start: float) -> None:
+        self.ms += (time.perf_counter() - start) * 1e3
+
+
+class ReplayLlm(BaseLlm):
+    """Model that answers with the responses queued for the current turn."""
+
+    responses: list[LlmResponse] = []
+    timer: Any = None
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        start = time.perf_counter()
+        if self.responses:
+            response = self.responses.pop(0)
+        else:
+            response = LlmResponse(
+                content=types.Content(
+                    role="model", parts=[types.Part(text="")]
+                )
+            )
+        if self.timer is not None:
+            self.timer.add_since(start)
+        yield response
+
+
+def recorded_responses(turn: dict) -> list[LlmResponse]:
+    """Returns the model responses of an eval turn: tool calls, then reply."""
+    responses = []
+    if turn["expected_tool_use"]:
+        responses.append(
+            LlmResponse(
+                content=types.Content(
+                    role="model",
+                    parts=[
+                        types.Part(
+                            function_call=types.FunctionCall(
+                                name=call["tool_name"],
+                                args=call["tool_input"],
+                            )
+                        )
+                        for call in turn["expected_tool_use"]
+                    ],
+                )
+            )
+        )
+    responses.append(
+        LlmResponse(
+            content=types.Content(
+                role="model", parts=[types.Part(text=turn.get("reference", ""))]
+            )
+        )
+    )
+    return responses
+
+
+def _timed_callback(callback, timer: _Timer):
+    if callback is None:
+        return None
+    if inspect.iscoroutinefunction(callback):
+
+        @functools.wraps(callback)
+        async def timed_async(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await callback(*args, **kwargs)
+            finally:
+                timer.add_since(start)
+
+        return timed_async
+
+    @functools.wraps(callback)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return callback(*args, **kwargs)
+        finally:
+            timer.add_since(start)
+
+    return timed
+
+
+class _TimedTool(FunctionTool):
+    """Function tool that adds its run time to a timer."""
+
+    def __init__(self, func, timer: _Timer):
+        super().__init__(func)
+        self._timer = timer
+
+    async def run_async(self, *, args, tool_context):
+        start = time.perf_counter()
+        try:
+            return await super().run_async(args=args, tool_context=tool_context)
+        finally:
+            self._timer.add_since(start)
+
+
+def _profile_bytes(state: dict) -> int:
+    profile = state.get("customer_profile", "")
+    if not isinstance(profile, str):
+        profile = json.dumps(profile)
+    return len(profile.encode("utf-8"))
+
+
+async def replay_eval_set(
+    eval_set: Sequence[dict], initial_state: Optional[dict] = None
+) -> list[TurnMetrics]:
+    """Replays one eval conversation in a new session.
+
+    Args:
+      eval_set: Turns with "query", "expected_tool_use" and "reference".
+      initial_state: Session state to start from; without it the customer
+        profile is loaded by the agent's callback.
+
+    Returns:
+      The metrics of every turn.
+    """
+    model_timer, callbacks_timer, tools_timer = _Timer(), _Timer(), _Timer()
+    llm = ReplayLlm(model=REPLAY_MODEL, timer=model_timer)
+    root_agent = agent.root_agent
+    replay_agent = root_agent.model_copy(
+        update={
+            "model": llm,
+            "tools": [_TimedTool(tool, tools_timer) for tool in agent.TOOLS],
+            "before_agent_callback": _timed_callback(
+                root_agent.before_agent_callback, callbacks_timer
+            ),
+            "before_model_callback": _timed_callback(
+                root_agent.before_model_callback, callbacks_timer
+            ),
+            "before_tool_callback": _timed_callback(
+                root_agent.before_tool_callback, callbacks_timer
+            ),
+        }
+    )
+
+    session_service = InMemorySessionService()
+    app_name, user_id, session_id = "replay", "replay_user", str(uuid.uuid4())
+    session_service.create_session(
+        app_name=app_name,
+        user_id=user_id,
+        state=dict(initial_state or {}),
+        session_id=session_id,
+    )
+    runner = Runner(
+        app_name=app_name,
+        agent=replay_agent,
+        artifact_service=InMemoryArtifactService(),
+        session_service=session_service,
+    )
+
+    metrics = []
+    for turn in eval_set:
+        llm.responses = recorded_responses(turn)
+        for timer in (model_timer, callbacks_timer, tools_timer):
+            timer.ms = 0.0
+        message = types.Content(
+            role="user", parts=[types.Part(text=turn["query"])]
+        )
+        start = time.perf_counter()
+        async for _ in runner.run_async(
+            user_id=user_id, session_id=session_id, new_message=message
+        ):
+            pass
+        total_ms = (time.perf_counter() - start) * 1e3
+
+        session = session_service.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        start = time.perf_counter()
+        state_json = json.dumps(session.state)
+        state_serialization_ms = (time.perf_counter() - start) * 1e3
+        metrics.append(
+            TurnMetrics(
+                query=turn["query"],
+                tool_calls=[c["tool_name"] for c in turn["expected_tool_use"]],
+                total_ms=total_ms,
+                model_ms=model_timer.ms,
+                callbacks_ms=callbacks_timer.ms,
+                tools_ms=tools_timer.ms,
+                state_serialization_ms=state_serialization_ms,
+                state_bytes=len(state_json.encode("utf-8")),
+                profile_bytes=_profile_bytes(session.state),
+            )
+        )
+    return metrics
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Returns the q-th percentile (0-100) of values."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[
+        min(max(int(q) - 1, 0), 98)
+    ]
+
+
+def format_report(name: str, metrics: Sequence[TurnMetrics]) -> str:
+    """Returns a table of the turn metrics followed by a summary line."""
+    rows = [
+        [
+            m.query[:40],
+            ",".join(m.tool_calls),
+            f"{m.agent_ms:.2f}",
+            f"{m.callbacks_ms:.2f}",
+            f"{m.tools_ms:.2f}",
+            f"{m.framework_ms:.2f}",
+            f"{m.state_serialization_ms:.3f}",
+            m.state_bytes,
+            m.profile_bytes,
+        ]
+        for m in metrics
+    ]
+    table = tabulate(
+        rows,
+        headers=[
+            "query",
+            "tools",
+            "agent ms",
+            "callbacks ms",
+            "tools ms",
+            "framework ms",
+            "state ms",
+            "state B",
+            "profile B",
+        ],
+    )
+    agent_ms = [m.agent_ms for m in metrics]
+    return (
+        f"{name}\n{table}\n"
+        f"agent overhead per turn: p50 {percentile(agent_ms, 50):.2f} ms,"
+        f" p95 {percentile(agent_ms, 95):.2f} ms, max {max(agent_ms):.2f} ms\n"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--eval-set",
+        action="append",
+        help="Eval data file; defaults to the sample eval sets.",
+    )
+    parser.add_argument(
+        "--session",
+        default=SESSION_FILE,
+        help="Session file whose state to start from.",
+    )
+    parser.add_argument(
+        "--fresh-state",
+        action="store_true",
+        help="Start from an empty state; the agent loads the profile.",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        help="Fail if the p95 agent overhead of a turn exceeds this.",
+    )
+    args = parser.parse_args(argv)
+
+    if "GOOGLE_DATA_DIR" not in os.environ:
+        os.environ["GOOGLE_DATA_DIR"] = tempfile.mkdtemp(prefix="replay-")
+    initial_state = None
+    if not args.fresh_state:
+        with open(args.session, encoding="utf-8") as f:
+            initial_state = json.load(f)["state"]
+
+    failed = False
+    for path in args.eval_set or EVAL_SETS:
+        with open(path, encoding="utf-8") as f:
+            eval_set = json.load(f)
+        # The first run warms up imports and caches; report the last one.
+        for _ in range(args.repeats):
+            metrics = asyncio.run(replay_eval_set(eval_set, initial_state))
+        print(format_report(os.path.basename(path), metrics))
+        p95 = percentile([m.agent_ms for m in metrics], 95)
+        if args.budget_ms is not None and p95 > args.budget_ms:
+            print(f"Over budget: p95 {p95:.2f} ms > {args.budget_ms} ms")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import os
+
+import pytest
+from eval import replay
+
+# Budget for the p95 time spent outside the model per turn; generous so the
+# test only catches large regressions on slow machines.
+BUDGET_MS = float(os.environ.get("REPLAY_BUDGET_MS", "250"))
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.mark.parametrize("initial_state", ["session", None])
+def test_replay_full_conversation(initial_state):
+    eval_set = _load(replay.EVAL_SETS[1])
+    if initial_state == "session":
+        initial_state = _load(replay.SESSION_FILE)["state"]
+
+    metrics = asyncio.run(replay.replay_eval_set(eval_set, initial_state))
+
+    assert [m.query for m in metrics] == [turn["query"] for turn in eval_set]
+    for m in metrics:
+        assert (m.tools_ms > 0) == bool(m.tool_calls)
+        assert m.callbacks_ms > 0
+        assert 0 < m.profile_bytes < m.state_bytes
+    p95 = replay.percentile([m.agent_ms for m in metrics], 95)
+    assert p95 < BUDGET_MS
+    assert "agent overhead per turn" in replay.format_report("full", metrics)
@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmark of inventory lookups on a large synthetic catalog.
+
+Run from the customer-service directory:
+
+  python -m tests.benchmarks.bench_inventory [--skus N] [--stores N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from customer_service.shared_libraries.inventory import Inventory
+
+
+def build_inventory(
+    num_skus: int, num_stores: int, stores_per_sku: int, seed: int = 0
+) -> Inventory:
+    rng = np.random.default_rng(seed)
+    product_ids = np.char.add("sku-", np.arange(num_skus).astype(str))
+    store_ids = np.char.add("store-", np.arange(num_stores).astype(str))
+    stock_products = np.repeat(product_ids, stores_per_sku)
+    stock_stores = store_ids[
+        rng.integers(0, num_stores, num_skus * stores_per_sku)
+    ]
+    return Inventory(
+        product_ids=product_ids,
+        names=product_ids,
+        descriptions=np.full(num_skus, ""),
+        prices=rng.uniform(1, 100, num_skus),
+        plant_types=[[] for _ in range(num_skus)],
+        stock_store_ids=stock_stores,
+        stock_product_ids=stock_products,
+        stock_quantities=rng.integers(0, 50, num_skus * stores_per_sku),
+    )
+
+
+def timed(func, repeats: int) -> float:
+    """Returns the mean time of `func` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skus", type=int, default=1_000_000)
+    parser.add_argument("--stores", type=int, default=1_000)
+    parser.add_argument("--stores-per-sku", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=1_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    inventory = build_inventory(args.skus, args.stores, args.stores_per_sku)
+    print(
+        f"Built {args.skus:,} SKUs x {args.stores:,} stores"
+        f" in {time.perf_counter() - start:.1f} s"
+    )
+
+    rng = np.random.default_rng(1)
+    cart = [f"sku-{i}" for i in rng.integers(0, args.skus, 10)]
+    stores = [f"store-{i}" for i in rng.integers(0, args.stores, 5)]
+    results = {
+        "1 product x 1 store": timed(
+            lambda: inventory.quantities(cart[:1], stores[:1]), args.repeats
+        ),
+        "10-item cart x 5 stores": timed(
+            lambda: inventory.quantities(cart, stores), args.repeats
+        ),
+        "10 catalog entries": timed(
+            lambda: inventory.get_products(cart), args.repeats
+        ),
+    }
+    for name, micros in results.items():
+        print(f"{name:>24}: {micros:8.1f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Load test of planting crew availability and concurrent bookings.
+
+Run from the customer-service directory:
+
+  python -m tests.benchmarks.bench_scheduling [--crews N] [--bookings N]
+"""
+
+import argparse
+import datetime
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from customer_service.shared_libraries.scheduling import SlotEngine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--crews", type=int, default=2_000)
+    parser.add_argument("--stores", type=int, default=200)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--bookings", type=int, default=5_000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = SlotEngine(os.path.join(tmp, "schedule.sqlite3"))
+        crews_per_store = args.crews // args.stores
+        for store in range(args.stores):
+            engine.add_crews(
+                [f"crew-{store}-{i}" for i in range(crews_per_store)],
+                f"store-{store}",
+            )
+        start_date = datetime.date(2024, 7, 1)
+        dates = [
+            (start_date + datetime.timedelta(days=i)).isoformat()
+            for i in range(args.days)
+        ]
+        rng = random.Random(0)
+        requests = [
+            (
+                str(i),
+                rng.choice(dates),
+                rng.choice(engine.slot_ranges),
+                f"store-{rng.randrange(args.stores)}",
+            )
+            for i in range(args.bookings)
+        ]
+
+        def book(request):
+            customer_id, date, time_range, store_id = request
+            return engine.reserve(
+                customer_id, date, time_range, store_id=store_id
+            )
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(book, requests))
+        elapsed = time.perf_counter() - start
+        booked = sum(result is not None for result in results)
+        print(
+            f"{args.bookings:,} bookings on {args.threads} threads:"
+            f" {args.bookings / elapsed:,.0f} per second,"
+            f" {booked:,} booked, {args.bookings - booked:,} full"
+        )
+
+        appointments = [a for d in dates for a in engine.appointments(d)]
+        slots = {(a.crew_id, a.date, a.time_range) for a in appointments}
+        assert len(slots) == len(appointments), "double booking"
+
+        repeats = 20
+        start = time.perf_counter()
+        for _ in range(repeats):
+            engine.availability(dates[0], dates[-1])
+        millis = (time.perf_counter() - start) / repeats * 1e3
+        print(
+            f"Availability of {args.crews:,} crews over {args.days} days:"
+            f" {millis:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from tests.isolation import isolated_data_dir
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Gives every test its own, empty DATA_DIR."""
+    yield from isolated_data_dir(tmp_path, monkeypatch)
+
+
+class FakeToolContext:
+    """Tool context with an in-memory artifact store."""
+
+    def __init__(self):
+        self.artifacts = {}
+        self.saves = 0
+
+    def list_artifacts(self):
+        return list(self.artifacts)
+
+    def save_artifact(self, filename, artifact):
+        self.saves += 1
+        self.artifacts[filename] = artifact
+        return 0
+
+    def load_artifact(self, filename, version=None):
+        return self.artifacts.get(filename)
+
+
+@pytest.fixture
+def tool_context():
+    """A tool context whose artifacts the test can inspect."""
+    return FakeToolContext()
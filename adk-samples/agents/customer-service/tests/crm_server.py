@@ -0,0 +1,102 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Local stand-in for the CRM that the write-behind queue flushes to.
+
+It accepts `POST /batch` requests and applies each write once per
+idempotency key. To use it while running the agent locally:
+
+  python -m tests.crm_server 8765
+  export GOOGLE_CRM_URL=http://127.0.0.1:8765
+"""
+
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeCrm:
+    """CRM records in memory, served over HTTP on a local port.
+
+    Attributes:
+      records: Applied writes, by (customer_id, kind).
+      writes: Applied writes, in order.
+      batches: Number of batch requests received.
+      applied: Number of writes applied; replayed writes are not counted.
+      fail_next: Number of upcoming batch requests to answer with HTTP 503.
+    """
+
+    def __init__(self, port: int = 0):
+        self.records: dict[tuple[str, str], dict] = {}
+        self.writes: list[dict] = []
+        self.batches = 0
+        self.applied = 0
+        self.fail_next = 0
+        self._seen_keys: set[str] = set()
+        self._lock = threading.Lock()
+        crm = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                status = crm.handle(self.path, json.loads(body))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):  # pylint: disable=arguments-differ
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def handle(self, path: str, body: dict) -> int:
+        if path != "/batch":
+            return 404
+        with self._lock:
+            self.batches += 1
+            if self.fail_next:
+                self.fail_next -= 1
+                return 503
+            for write in body["writes"]:
+                if write["idempotency_key"] in self._seen_keys:
+                    continue
+                self._seen_keys.add(write["idempotency_key"])
+                key = (write["customer_id"], write["kind"])
+                self.records[key] = write["payload"]
+                self.writes.append(write)
+                self.applied += 1
+        return 200
+
+    def __enter__(self) -> "FakeCrm":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    with FakeCrm(int(sys.argv[1]) if len(sys.argv) > 1 else 8765) as server:
+        print(f"Fake CRM listening on {server.url}")
+        threading.Event().wait()
@@ -0,0 +1,46 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Isolation of the shared stores and services between tests."""
+
+import atexit
+
+from customer_service.shared_libraries import (
+    customer_repository,
+    inventory,
+    rendering,
+    scheduling,
+    write_behind,
+)
+
+
+def isolated_data_dir(tmp_path, monkeypatch):
+    """Points DATA_DIR at an empty directory and resets the singletons.
+
+    A generator for an autouse fixture: it yields the DATA_DIR, then closes
+    the write-behind queue and rendering service the test created and
+    unregisters their exit hooks.
+    """
+    monkeypatch.setenv("GOOGLE_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(customer_repository, "_customer_repository", None)
+    monkeypatch.setattr(inventory, "_inventory", None)
+    monkeypatch.setattr(scheduling, "_slot_engine", None)
+    monkeypatch.setattr(rendering, "_service", None)
+    monkeypatch.setattr(write_behind, "_queue", None)
+    yield tmp_path / "data"
+    if write_behind._queue is not None:
+        atexit.unregister(write_behind._queue.close)
+        write_behind._queue.close(flush=False)
+    if rendering._service is not None:
+        atexit.unregister(rendering._service.close)
+        rendering._service.close()
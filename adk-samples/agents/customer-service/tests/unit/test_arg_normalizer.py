@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from customer_service.agent import TOOLS
+from customer_service.shared_libraries.arg_normalizer import (
+    ArgNormalizer,
+    lowercase,
+)
+from customer_service.shared_libraries.callbacks import make_before_tool
+
+
+class FakeTool:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_lowercases_only_marked_fields_in_place():
+    normalize = ArgNormalizer(TOOLS)
+    add = [{"product_id": "SOIL-123", "quantity": 1}]
+    args = {
+        "customer_id": "ABC",
+        "items_to_add": add,
+        "items_to_remove": ["FERT-456", {"product_id": "Pots-444"}, 3],
+    }
+
+    normalize("modify_cart", args)
+
+    assert args == {
+        "customer_id": "ABC",
+        "items_to_add": [{"product_id": "soil-123", "quantity": 1}],
+        "items_to_remove": ["fert-456", {"product_id": "pots-444"}, 3],
+    }
+    assert args["items_to_add"] is add
+
+
+def test_unmarked_tools_and_missing_fields_are_left_alone():
+    normalize = ArgNormalizer(TOOLS)
+    args = {"customer_id": "123", "details": {"Note": "Call BACK"}}
+    normalize("update_salesforce_crm", args)
+    assert args == {"customer_id": "123", "details": {"Note": "Call BACK"}}
+
+    args = {"store_ids": None}
+    normalize("check_cart_availability", args)
+    assert args == {"store_ids": None}
+
+
+def test_invalid_marks_fail_at_construction():
+    @lowercase("store")
+    def unknown_field(store_id: str):
+        pass
+
+    @lowercase("quantity")
+    def not_a_string(quantity: int):
+        pass
+
+    for tool in (unknown_field, not_a_string):
+        with pytest.raises(ValueError):
+            ArgNormalizer([tool])
+
+
+def test_before_tool_lowercases_arguments():
+    before_tool = make_before_tool(TOOLS)
+    args = {"product_id": "SOIL-123", "store_id": "Main Store"}
+    tool = FakeTool("check_product_availability")
+    assert before_tool(tool, args, None) is None
+    assert args == {"product_id": "soil-123", "store_id": "main store"}
+
+    result = before_tool(
+        FakeTool("sync_ask_for_approval"),
+        {"discount_type": "PERCENTAGE", "value": 5, "reason": "Loyal"},
+        None,
+    )
+    assert result == {
+        "result": "You can approve this discount; no manager needed."
+    }
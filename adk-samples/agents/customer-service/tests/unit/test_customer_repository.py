@@ -0,0 +1,65 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from customer_service.entities.customer import Customer, PROFILE_FIELDS
+from customer_service.shared_libraries.customer_repository import (
+    CustomerRepository,
+)
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return CustomerRepository(str(tmp_path / "customers.sqlite3"))
+
+
+def test_demo_customer_is_seeded(repository):
+    customer = repository.get("123")
+    assert customer == Customer.get_customer("123")
+
+
+def test_profile_json_is_compact_and_projected(repository):
+    profile = repository.get_profile_json("123")
+    assert "\n" not in profile
+    assert set(json.loads(profile)) == PROFILE_FIELDS
+    assert len(profile) < len(Customer.get_customer("123").to_json())
+
+
+def test_profile_json_is_cached_until_the_customer_changes(repository):
+    profile = repository.get_profile_json("123")
+    assert repository.get_profile_json("123") is profile
+
+    customer = repository.get("123")
+    customer.loyalty_points = 500
+    repository.put(customer)
+    profile = json.loads(repository.get_profile_json("123"))
+    assert profile["loyalty_points"] == 500
+
+
+def test_unknown_customer(repository):
+    assert repository.get("999") is None
+    assert repository.get_profile_json("999") is None
+
+
+def test_lru_evicts_the_least_recently_used_profile(tmp_path):
+    repository = CustomerRepository(
+        str(tmp_path / "customers.sqlite3"), cache_size=1
+    )
+    other = Customer.get_customer("456")
+    repository.put(other)
+    first = repository.get_profile_json("123")
+    repository.get_profile_json("456")
+    assert repository.get_profile_json("123") is not first
@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from customer_service.shared_libraries.inventory import Inventory
+from customer_service.tools.tools import check_cart_availability
+
+
+@pytest.fixture
+def catalog_files(tmp_path):
+    catalog = tmp_path / "catalog.csv"
+    catalog.write_text(
+        "product_id,name,description,price,plant_types\n"
+        "rose-1,Rose Food,For roses.,9.99,roses\n"
+        "soil-9,Garden Soil,All purpose.,4.50,*\n"
+        "mulch-2,Bark Mulch,,7.25,roses;shrubs\n"
+    )
+    stock = tmp_path / "inventory.csv"
+    stock.write_text(
+        "store_id,product_id,quantity\n"
+        "North,rose-1,3\n"
+        "North,soil-9,0\n"
+        "South,soil-9,12\n"
+        "South,mulch-2,5\n"
+    )
+    return str(catalog), str(stock)
+
+
+def test_quantities_batch_lookup(catalog_files):
+    inventory = Inventory.from_files(*catalog_files)
+    quantities = inventory.quantities(
+        ["rose-1", "SOIL-9", "mulch-2", "unknown"], ["north", "South", "West"]
+    )
+    assert quantities.tolist() == [
+        [3, 0, -1],
+        [0, 12, -1],
+        [0, 5, -1],
+        [-1, -1, -1],
+    ]
+
+
+def test_header_only_files_load_as_empty_tables(catalog_files, tmp_path):
+    catalog, _ = catalog_files
+    stock = tmp_path / "empty_inventory.csv"
+    stock.write_text("store_id,product_id,quantity\n")
+    inventory = Inventory.from_files(catalog, str(stock))
+    assert inventory.quantities(["rose-1"], ["North"]).tolist() == [[-1]]
+
+    empty_catalog = tmp_path / "empty_catalog.csv"
+    empty_catalog.write_text("product_id,name,price\n")
+    inventory = Inventory.from_files(str(empty_catalog), str(stock))
+    assert inventory.quantities(["rose-1", "soil-9"], []).shape == (2, 0)
+    assert inventory.recommendations("roses") == []
+
+
+def test_recommendations_keep_catalog_order(catalog_files):
+    inventory = Inventory.from_files(*catalog_files)
+    names = [p["name"] for p in inventory.recommendations("Roses")]
+    assert names == ["Rose Food", "Bark Mulch"]
+    names = [p["name"] for p in inventory.recommendations("cacti")]
+    assert names == ["Garden Soil"]
+
+
+def test_get_products(catalog_files):
+    inventory = Inventory.from_files(*catalog_files)
+    product, missing = inventory.get_products(["mulch-2", "nope"])
+    assert product["price"] == 7.25
+    assert missing is None
+
+
+def test_check_cart_availability():
+    result = check_cart_availability("123", ["pickup", "nowhere"])
+    assert result["stores"]["pickup"]["all_available"] is True
+    assert result["stores"]["nowhere"]["all_available"] is False
+    items = result["stores"]["pickup"]["items"]
+    assert [item["product_id"] for item in items] == ["soil-123", "fert-456"]
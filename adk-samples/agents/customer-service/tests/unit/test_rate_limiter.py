@@ -0,0 +1,149 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import fcntl
+import time
+
+from google.adk.models import Gemini, LlmRequest, LlmResponse
+
+from customer_service.shared_libraries.rate_limiter import (
+    FileBackend,
+    RateLimitedGemini,
+    RateLimiter,
+    get_rate_limiter,
+    reserve_session_token,
+)
+
+
+def test_burst_within_quota_is_not_throttled():
+    limiter = RateLimiter("project/model", quota=5, window_secs=60)
+
+    async def burst():
+        return [await limiter.acquire() for _ in range(5)]
+
+    waits = asyncio.run(burst())
+    assert waits == [0.0] * 5
+    assert limiter.metrics.throttled == 0
+
+
+def test_requests_over_quota_wait_in_order():
+    limiter = RateLimiter("project/model", quota=2, window_secs=1)
+    waits = [limiter._reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.4 < waits[2] < waits[3] <= 1.0
+    metrics = limiter.metrics.to_dict()
+    assert metrics["requests"] == 4
+    assert metrics["throttled"] == 2
+    assert metrics["max_wait_secs"] == waits[3]
+
+
+def test_concurrent_sessions_do_not_block_the_event_loop():
+    limiter = RateLimiter("project/model", quota=2, window_secs=0.2)
+    ticks = []
+
+    async def session():
+        for _ in range(2):
+            await limiter.acquire()
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        await asyncio.gather(session(), session(), session(), ticker())
+
+    asyncio.run(main())
+    assert len(ticks) == 5
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+    assert limiter.metrics.throttled == 4
+
+
+def test_limiters_are_shared_per_key():
+    first = get_rate_limiter("project/model-a", 10, 60)
+    assert get_rate_limiter("project/model-a", 10, 60) is first
+    assert get_rate_limiter("project/model-b", 10, 60) is not first
+
+
+def test_file_backend_shares_the_bucket(tmp_path):
+    path = str(tmp_path / "rate_limit.json")
+    first = RateLimiter("project/model", 2, 60, FileBackend(path))
+    second = RateLimiter("project/model", 2, 60, FileBackend(path))
+    assert first._reserve() == 0.0
+    assert second._reserve() == 0.0
+    assert first._reserve() > 0
+
+
+def test_file_lock_contention_does_not_block_the_event_loop(tmp_path):
+    path = str(tmp_path / "rate_limit.json")
+    limiter = RateLimiter("project/model", 100, 60, FileBackend(path))
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        with open(path, "a+b") as f:
+            # Another process holds the lock for a while.
+            fcntl.flock(f, fcntl.LOCK_EX)
+            acquired = asyncio.ensure_future(limiter.acquire())
+            await ticker()
+            fcntl.flock(f, fcntl.LOCK_UN)
+        return await acquired
+
+    assert asyncio.run(main()) == 0.0
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+
+
+def test_session_bucket_limits_only_its_session():
+    busy, idle = {}, {}
+    waits = [reserve_session_token(busy, 2, 60) for _ in range(3)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] > 0
+    assert reserve_session_token(idle, 2, 60) == 0.0
+
+
+def test_model_waits_for_both_buckets_without_blocking(monkeypatch):
+    async def fake_generate(self, llm_request, stream=False):
+        yield LlmResponse()
+
+    monkeypatch.setattr(Gemini, "generate_content_async", fake_generate)
+    model = RateLimitedGemini(
+        model="gemini-test", scope="test-wait", quota=100, window_secs=60
+    )
+    ticks = []
+
+    async def session():
+        state = {}
+        for _ in range(3):
+            reserve_session_token(state, 2, 0.2)
+            async for _ in model.generate_content_async(LlmRequest()):
+                pass
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        await asyncio.gather(session(), ticker())
+
+    start = time.monotonic()
+    asyncio.run(main())
+    assert time.monotonic() - start >= 0.09
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+    assert model.rate_limiter.metrics.requests == 3
@@ -0,0 +1,81 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+from customer_service.shared_libraries import rendering
+from customer_service.shared_libraries.rendering import RenderingService
+from customer_service.tools.tools import (
+    generate_qr_code,
+    send_care_instructions,
+)
+
+
+@pytest.fixture
+def service():
+    service = RenderingService()
+    yield service
+    service.close()
+
+
+def test_templates_are_compiled_once_per_plant_and_channel():
+    rendering.compiled_template.cache_clear()
+    first = rendering.render_care_instructions("1", "petunias", "sms")
+    second = rendering.render_care_instructions("2", "petunias", "sms")
+    rendering.render_care_instructions("1", "petunias", "email")
+
+    info = rendering.compiled_template.cache_info()
+    assert (info.misses, info.hits) == (2, 1)
+    assert first == second
+    assert "Petunias care: Give them at least 6 hours of sun" in first
+    with pytest.raises(ValueError):
+        rendering.render_care_instructions("1", "petunias", "fax")
+
+
+def test_qr_codes_render_in_workers(service):
+    futures = service.submit_qr_batch(["A", "B"])
+
+    svg = futures[0].result(timeout=30)
+    assert svg.startswith(b"<?xml") and b"<svg" in svg
+    assert futures[1].result(timeout=30) != svg
+
+
+def test_artifact_names_are_content_hashes():
+    name = rendering.artifact_name("care-sms", "Water daily", "txt")
+    assert name.startswith("care-sms-") and name.endswith(".txt")
+    assert rendering.artifact_name("care-sms", "Water daily", "txt") == name
+    assert rendering.artifact_name("care-sms", "Water weekly", "txt") != name
+
+
+def test_tools_save_artifacts_once(tool_context):
+    qr_code = generate_qr_code("123", 10.0, "percentage", 30, tool_context)
+    result = asyncio.run(qr_code)
+    part = tool_context.load_artifact(result["qr_code_artifact"])
+    assert part.inline_data.mime_type == "image/svg+xml"
+    assert part.inline_data.data.startswith(b"<?xml")
+    qr_code = generate_qr_code("123", 10.0, "percentage", 30, tool_context)
+    assert asyncio.run(qr_code) == result
+    assert tool_context.saves == 1
+
+    result = send_care_instructions("123", "petunias", "email", tool_context)
+    body = tool_context.load_artifact(result["content_artifact"]).text
+    assert body.startswith("Subject: How to care for your Petunias")
+    assert "customer 123" in body
+    send_care_instructions("123", "petunias", "email", tool_context)
+    assert tool_context.saves == 2
+    assert (
+        send_care_instructions("123", "petunias", "fax", tool_context)["status"]
+        == "error"
+    )
@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from customer_service.shared_libraries.scheduling import SlotEngine, slot_mask
+from customer_service.tools.tools import (
+    get_available_planting_times,
+    schedule_planting_service,
+)
+
+DATE = "2024-07-29"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = SlotEngine(str(tmp_path / "schedule.sqlite3"))
+    engine.add_crews(["a1", "a2"], "store-a")
+    engine.add_crews(["b1"], "store-b")
+    return engine
+
+
+def test_slot_mask():
+    assert slot_mask("9-12") == 0b111 << 9
+    for invalid in ("9am-12pm", "12-9", "0-25", "9"):
+        with pytest.raises(ValueError):
+            slot_mask(invalid)
+
+
+def test_availability_over_date_range(engine):
+    engine.reserve("1", DATE, "9-12", store_id="store-b")
+    engine.reserve("2", "2024-07-30", "13-16", store_id="store-a")
+
+    availability = engine.availability(DATE, "2024-07-31")
+
+    assert availability == {
+        "2024-07-29": {"9-12": 2, "13-16": 3},
+        "2024-07-30": {"9-12": 3, "13-16": 2},
+        "2024-07-31": {"9-12": 3, "13-16": 3},
+    }
+    assert engine.availability(DATE, store_id="store-b") == {
+        DATE: {"9-12": 0, "13-16": 1}
+    }
+    assert engine.available_ranges(DATE, store_id="store-b") == ["13-16"]
+
+
+def test_overlapping_ranges_conflict(engine):
+    engine.reserve("1", DATE, "10-14", store_id="store-b")
+    assert engine.available_ranges(DATE, store_id="store-b") == []
+    assert engine.reserve("2", DATE, "9-12", store_id="store-b") is None
+    assert engine.reserve("2", DATE, "14-16", store_id="store-b") is not None
+
+
+def test_concurrent_bookings_never_double_book(engine):
+    num_requests = 40
+
+    def book(i):
+        return engine.reserve(str(i), DATE, "9-12")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(book, range(num_requests)))
+
+    booked = [a for a in results if a is not None]
+    # Three crews, so exactly three bookings succeed, one per crew.
+    assert len(booked) == 3
+    assert sorted(a.crew_id for a in booked) == ["a1", "a2", "b1"]
+    assert len(engine.appointments(DATE)) == 3
+    assert engine.available_ranges(DATE) == ["13-16"]
+
+
+def test_planting_tools_use_slot_engine():
+    for i in range(3):
+        result = schedule_planting_service(str(i), DATE, "9-12", "Petunias")
+        assert result["status"] == "success"
+    assert get_available_planting_times(DATE) == ["13-16"]
+
+    result = schedule_planting_service("4", DATE, "9-12", "Petunias")
+    assert result["status"] == "unavailable"
+    assert schedule_planting_service("4", DATE, "9am", "")["status"] == "error"
+    assert get_available_planting_times("July 29")["status"] == "error"
+
+
+def test_booking_conflicts_ask_to_retry(monkeypatch):
+    def conflicting_reserve(self, *args, **kwargs):
+        raise RuntimeError("Could not book: too many conflicts")
+
+    monkeypatch.setattr(SlotEngine, "reserve", conflicting_reserve)
+    result = schedule_planting_service("1", DATE, "9-12", "Petunias")
+    assert result["status"] == "retry"
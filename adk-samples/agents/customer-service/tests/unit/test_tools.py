@@ -26,6 +26,7 @@ from customer_service.tools.tools import (
     generate_qr_code,
 )
 from datetime import datetime, timedelta
+import asyncio
 import logging
 
 # Configure logging for the test file
@@ -158,27 +159,37 @@ def test_get_available_planting_times():
     assert result == ["9-12", "13-16"]
 
 
-def test_send_care_instructions():
+def test_send_care_instructions(tool_context):
     customer_id = "123"
     plant_type = "Petunias"
     delivery_method = "email"
-    result = send_care_instructions(customer_id, plant_type, delivery_method)
-    assert result == {
-        "status": "success",
-        "message": f"Care instructions for {plant_type} sent via {delivery_method}.",
-    }
+    result = send_care_instructions(
+        customer_id, plant_type, delivery_method, tool_context
+    )
+    assert result["status"] == "success"
+    assert (
+        result["message"]
+        == f"Care instructions for {plant_type} sent via {delivery_method}."
+    )
+    assert result["content_artifact"].startswith("care-email-")
 
 
-def test_generate_qr_code():
+def test_generate_qr_code(tool_context):
     customer_id = "123"
     discount_value = 10.0
     discount_type = "percentage"
     expiration_days = 30
-    result = generate_qr_code(
-        customer_id, discount_value, discount_type, expiration_days
+    result = asyncio.run(
+        generate_qr_code(
+            customer_id,
+            discount_value,
+            discount_type,
+            expiration_days,
+            tool_context,
+        )
     )
     assert result["status"] == "success"
-    assert result["qr_code_data"] == "MOCK_QR_CODE_DATA"
+    assert result["qr_code_artifact"].endswith(".svg")
     assert "expiration_date" in result
     expiration_date = datetime.now() + timedelta(days=expiration_days)
     assert result["expiration_date"] == expiration_date.strftime("%Y-%m-%d")
@@ -0,0 +1,221 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlite3
+import threading
+import time
+import urllib.error
+
+import pytest
+from customer_service.shared_libraries.write_behind import (
+    CART,
+    CRM,
+    HttpCrmSink,
+    WriteBehindQueue,
+)
+from customer_service.tools.tools import access_cart_information, modify_cart
+from tests.crm_server import FakeCrm
+
+
+@pytest.fixture
+def crm():
+    with FakeCrm() as server:
+        yield server
+
+
+@pytest.fixture
+def queue(tmp_path, crm):
+    queue = WriteBehindQueue(
+        str(tmp_path / "queue.sqlite3"),
+        sink=HttpCrmSink(crm.url),
+        flush_interval_secs=3600,
+    )
+    yield queue
+    queue.close(flush=False)
+
+
+def test_writes_are_coalesced_per_customer(queue, crm):
+    queue.modify_cart("1", [{"product_id": "seeds-333", "quantity": 1}], [])
+    queue.modify_cart("1", [{"product_id": "seeds-333", "quantity": 2}], [])
+    queue.modify_cart("1", [], [{"product_id": "soil-123"}])
+    queue.update_crm("1", {"appointment_date": "2024-07-25"})
+    queue.update_crm("1", {"services": "Planting"})
+    queue.update_crm("2", "Called about petunias")
+    assert queue.pending_count() == 3
+
+    assert queue.flush() == 3
+    assert crm.batches == 1
+    assert queue.pending_count() == 0
+    cart = crm.records[("1", CART)]["items"]
+    assert [(i["product_id"], i["quantity"]) for i in cart] == [
+        ("fert-456", 1),
+        ("seeds-333", 3),
+    ]
+    assert crm.records[("1", CRM)] == {
+        "fields": {"appointment_date": "2024-07-25", "services": "Planting"}
+    }
+    assert crm.records[("2", CRM)] == {"notes": ["Called about petunias"]}
+
+
+def test_failed_flush_keeps_writes_and_retries_idempotently(queue, crm):
+    queue.update_crm("1", {"loyalty_points": 10})
+    crm.fail_next = 1
+    with pytest.raises(urllib.error.HTTPError):
+        queue.flush()
+    assert queue.pending_count() == 1
+
+    assert queue.flush() == 1
+    assert crm.applied == 1
+    assert crm.records[("1", CRM)] == {"fields": {"loyalty_points": 10}}
+
+
+def test_notes_queued_while_a_batch_is_in_flight_are_sent_once(
+    tmp_path, crm
+):
+    http_sink = HttpCrmSink(crm.url)
+    in_sink, release = threading.Event(), threading.Event()
+
+    def blocking_sink(batch):
+        in_sink.set()
+        release.wait(5)
+        http_sink(batch)
+
+    queue = WriteBehindQueue(
+        str(tmp_path / "queue.sqlite3"),
+        sink=blocking_sink,
+        flush_interval_secs=3600,
+    )
+    queue.update_crm("c1", "note A")
+    flusher = threading.Thread(target=queue.flush)
+    flusher.start()
+    assert in_sink.wait(5)
+    queue.update_crm("c1", "note B")
+    release.set()
+    flusher.join()
+    queue.flush()
+    queue.close(flush=False)
+
+    assert [w["payload"]["notes"] for w in crm.writes] == [
+        ["note A"],
+        ["note B"],
+    ]
+    assert queue.pending_count() == 0
+
+
+def test_retried_write_keeps_its_content(queue, crm):
+    queue.update_crm("1", "note A")
+    crm.fail_next = 1
+    with pytest.raises(urllib.error.HTTPError):
+        queue.flush()
+    queue.update_crm("1", "note B")
+
+    assert queue.flush() == 2
+    assert [w["payload"]["notes"] for w in crm.writes] == [
+        ["note A"],
+        ["note B"],
+    ]
+
+
+def test_journal_of_earlier_versions_is_migrated(tmp_path, crm):
+    path = str(tmp_path / "queue.sqlite3")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(
+            "CREATE TABLE pending_writes (customer_id TEXT NOT NULL,"
+            " kind TEXT NOT NULL, payload TEXT NOT NULL,"
+            " idempotency_key TEXT NOT NULL, updated_at REAL NOT NULL,"
+            " PRIMARY KEY (customer_id, kind))"
+        )
+        conn.execute(
+            "INSERT INTO pending_writes VALUES"
+            " ('1', 'crm', '{\"notes\": [\"old\"]}', 'k1', 0)"
+        )
+    conn.close()
+
+    queue = WriteBehindQueue(path, sink=HttpCrmSink(crm.url))
+    queue.update_crm("1", "new")
+    assert queue.flush() == 2
+    assert [w["idempotency_key"] for w in crm.writes][0] == "k1"
+    assert crm.records[("1", CRM)] == {"notes": ["new"]}
+
+
+def test_journal_survives_a_restart(tmp_path, crm):
+    path = str(tmp_path / "queue.sqlite3")
+    first = WriteBehindQueue(path, sink=HttpCrmSink(crm.url))
+    first.update_crm("1", {"status": "gold"})
+    first.close(flush=False)
+
+    second = WriteBehindQueue(path, sink=HttpCrmSink(crm.url))
+    assert second.flush() == 1
+    assert crm.records[("1", CRM)] == {"fields": {"status": "gold"}}
+
+
+def test_background_thread_flushes(tmp_path, crm):
+    queue = WriteBehindQueue(
+        str(tmp_path / "queue.sqlite3"),
+        sink=HttpCrmSink(crm.url),
+        flush_interval_secs=0.05,
+    )
+    queue.update_crm("1", {"status": "gold"})
+    deadline = time.monotonic() + 5
+    while queue.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    queue.close()
+    assert crm.records[("1", CRM)] == {"fields": {"status": "gold"}}
+
+
+def test_modify_cart_tool_is_visible_to_access_cart():
+    modify_cart(
+        "123",
+        [{"product_id": "fert-789", "quantity": 2}],
+        [{"product_id": "soil-123"}],
+    )
+    cart = access_cart_information("123")
+    assert cart == {
+        "items": [
+            {
+                "product_id": "fert-456",
+                "name": "General Purpose Fertilizer",
+                "quantity": 1,
+            },
+            {
+                "product_id": "fert-789",
+                "name": "Flower Power Fertilizer",
+                "quantity": 2,
+            },
+        ],
+        "subtotal": 42.97,
+    }
+
+
+def test_invalid_quantities_are_reported_per_item():
+    result = modify_cart(
+        "123",
+        [
+            {"product_id": "fert-789", "quantity": "two"},
+            {"product_id": "seeds-333", "quantity": "2"},
+        ],
+        [{"product_id": "soil-123", "quantity": None}],
+    )
+    assert result["status"] == "error"
+    assert [e["product_id"] for e in result["item_errors"]] == [
+        "fert-789",
+        "soil-123",
+    ]
+    cart = access_cart_information("123")["items"]
+    assert [(i["product_id"], i["quantity"]) for i in cart] == [
+        ("soil-123", 1),
+        ("fert-456", 1),
+        ("seeds-333", 2),
+    ]
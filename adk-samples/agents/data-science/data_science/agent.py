@@ -32,6 +32,7 @@ from .sub_agents.bigquery.tools import (
 )
 from .prompts import return_instructions_root
 from .tools import call_db_agent, call_ds_agent
+from .utils import cassette
 
 date_today = date.today()
 
@@ -78,5 +79,7 @@ root_agent = Agent(
         load_artifacts,
     ],
     before_agent_callback=setup_before_agent_call,
+    before_model_callback=cassette.before_model_callback,
+    after_model_callback=cassette.after_model_callback,
     generate_content_config=types.GenerateContentConfig(temperature=0.01),
 )
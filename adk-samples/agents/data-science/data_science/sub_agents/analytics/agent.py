@@ -16,6 +16,7 @@
 import os
 from google.adk.code_executors import VertexAiCodeExecutor
 from google.adk.agents import Agent
+from data_science.utils import cassette
 from .prompts import return_instructions_ds
 
 
@@ -23,8 +24,15 @@ root_agent = Agent(
     model=os.getenv("ANALYTICS_AGENT_MODEL"),
     name="data_science_agent",
     instruction=return_instructions_ds(),
-    code_executor=VertexAiCodeExecutor(
+    # The code interpreter is created on first use, and never when replaying.
+    code_executor=cassette.CassetteCodeExecutor(
+        executor_factory=lambda: VertexAiCodeExecutor(
+            optimize_data_file=True,
+            stateful=True,
+        ),
         optimize_data_file=True,
         stateful=True,
     ),
+    before_model_callback=cassette.before_model_callback,
+    after_model_callback=cassette.after_model_callback,
 )
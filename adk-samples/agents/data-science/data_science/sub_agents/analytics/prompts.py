@@ -75,6 +75,8 @@ def return_instructions_ds() -> str:
 
   **Available files:** Only use the files that are available as specified in the list of available files.
 
+  **Data in files:** Query results are provided as an available CSV file that is already loaded into a pandas DataFrame of the same name. The prompt only shows the columns and the first few rows; ALWAYS use the full DataFrame for your analysis, never the sample rows. NEVER edit the data that are given to you.
+
   **Data in prompt:** Some queries contain the input data directly in the prompt. You have to parse that data into a pandas DataFrame. ALWAYS parse all the data. NEVER edit the data that are given to you.
 
   **Answerability:** Some queries may not be answerable with the available data. In those cases, inform the user why you cannot process their query and suggest what type of data would be needed to fulfill their request.
@@ -20,6 +20,7 @@ from google.genai import types
 from google.adk.agents import Agent
 from google.adk.agents.callback_context import CallbackContext
 
+from data_science.utils import cassette
 from .prompts import return_instructions_bigquery
 from . import tools
 from .chase_sql import chase_db_tools
@@ -47,5 +48,7 @@ database_agent = Agent(
         tools.run_bigquery_validation,
     ],
     before_agent_callback=setup_before_agent_call,
+    before_model_callback=cassette.before_model_callback,
+    after_model_callback=cassette.after_model_callback,
     generate_content_config=types.GenerateContentConfig(temperature=0.01),
 )
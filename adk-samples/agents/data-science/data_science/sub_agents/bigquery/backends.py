@@ -0,0 +1,252 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""SQL backends the database agent runs its queries on.
+
+`SQL_BACKEND=bigquery` (the default) runs against BigQuery. `SQL_BACKEND=duckdb`
+loads local CSV and Parquet files into an in-process DuckDB database for
+offline development and evaluation. The DuckDB backend describes its tables
+with the same BigQuery DDL, under the configured `BQ_PROJECT_ID` and
+`BQ_DATASET_ID`, so the NL2SQL prompts are unchanged. The generated BigQuery SQL
+is transpiled to DuckDB with `DuckDbSqlTranslator` before it is run.
+"""
+
+import abc
+import datetime
+import os
+import pathlib
+import threading
+from typing import Any, Optional
+
+from data_science.utils.utils import get_env_var
+
+from .chase_sql.sql_postprocessor.sql_translator import DuckDbSqlTranslator
+
+SQL_BACKEND = os.getenv("SQL_BACKEND", "bigquery").lower()
+DEFAULT_DUCKDB_DATA_FILES = str(
+    pathlib.Path(__file__).parents[2] / "utils" / "data" / "test.csv"
+)
+# Comma-separated CSV or Parquet files; each becomes a table named after the
+# file without its extension.
+DUCKDB_DATA_FILES = os.getenv("DUCKDB_DATA_FILES", DEFAULT_DUCKDB_DATA_FILES)
+
+# DuckDB column types mapped to the BigQuery type names used in the DDL.
+_DUCKDB_TO_BQ_TYPES = {
+    "BOOLEAN": "BOOLEAN",
+    "TINYINT": "INTEGER",
+    "SMALLINT": "INTEGER",
+    "INTEGER": "INTEGER",
+    "BIGINT": "INTEGER",
+    "HUGEINT": "INTEGER",
+    "UTINYINT": "INTEGER",
+    "USMALLINT": "INTEGER",
+    "UINTEGER": "INTEGER",
+    "UBIGINT": "INTEGER",
+    "FLOAT": "FLOAT",
+    "DOUBLE": "FLOAT",
+    "DATE": "DATE",
+    "TIME": "TIME",
+    "TIMESTAMP": "DATETIME",
+    "TIMESTAMP WITH TIME ZONE": "TIMESTAMP",
+    "VARCHAR": "STRING",
+    "BLOB": "BYTES",
+}
+
+
+def _to_result_value(value: Any) -> Any:
+    """Formats dates the way the query results have always been reported."""
+    if isinstance(value, datetime.date):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def _example_value(value: Any) -> str:
+    if isinstance(value, (str, datetime.date, datetime.time)):
+        return f"'{value}'"
+    if value is None:
+        return "NULL"
+    return f"{value}"
+
+
+class SqlBackend(abc.ABC):
+    """A database that NL2SQL queries are validated and executed against.
+
+    Attributes:
+      name: Short name of the backend, as set in `SQL_BACKEND`.
+      supports_result_cache: True if the local query result cache applies.
+    """
+
+    name = ""
+    supports_result_cache = False
+
+    @abc.abstractmethod
+    def get_schema_ddl(self) -> str:
+        """Returns BigQuery DDL with example rows for every table."""
+
+    @abc.abstractmethod
+    def execute(self, sql_string: str, max_rows: int) -> Optional[list[dict]]:
+        """Runs a BigQuery SQL query.
+
+        Args:
+          sql_string: The query, in the BigQuery dialect.
+          max_rows: Maximum number of rows to return.
+
+        Returns:
+          list[dict]: The result rows, or None if the query has no result set.
+        """
+
+
+class BigQueryBackend(SqlBackend):
+    """Runs queries on BigQuery."""
+
+    name = "bigquery"
+    supports_result_cache = True
+
+    def __init__(self, get_client, get_schema):
+        self._get_client = get_client
+        self._get_schema = get_schema
+
+    def get_schema_ddl(self) -> str:
+        return self._get_schema(
+            get_env_var("BQ_DATASET_ID"),
+            client=self._get_client(),
+            project_id=get_env_var("BQ_PROJECT_ID"),
+        )
+
+    def execute(self, sql_string: str, max_rows: int) -> Optional[list[dict]]:
+        results = self._get_client().query(sql_string).result()
+        if not results.schema:
+            return None
+        # Convert BigQuery RowIterator to list of dicts
+        return [
+            {key: _to_result_value(value) for key, value in row.items()}
+            for row in results
+        ][:max_rows]
+
+
+class DuckDbBackend(SqlBackend):
+    """Runs queries on local files loaded into an in-process DuckDB database.
+
+    Attributes:
+      project_id: Project the tables are presented under in the DDL.
+      dataset_id: Dataset the tables are presented under in the DDL.
+    """
+
+    name = "duckdb"
+
+    def __init__(
+        self,
+        data_files: list[str],
+        project_id: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+    ):
+        try:
+            import duckdb  # pylint: disable=import-outside-toplevel
+        except ImportError as e:
+            raise ImportError(
+                "SQL_BACKEND=duckdb requires the duckdb package. Install it"
+                " with `poetry install --extras duckdb`."
+            ) from e
+        self.project_id = project_id
+        self.dataset_id = dataset_id
+        self._connection = duckdb.connect(":memory:")
+        # A DuckDB connection must not be used by several threads at once.
+        self._lock = threading.Lock()
+        self.tables = []
+        for data_file in data_files:
+            self.tables.append(self._load_file(data_file))
+
+    def _load_file(self, data_file: str) -> str:
+        table_name = pathlib.Path(data_file).stem
+        reader = (
+            "read_parquet" if data_file.endswith(".parquet") else "read_csv_auto"
+        )
+        self._connection.execute(
+            f'CREATE OR REPLACE TABLE "{table_name}" AS'
+            f" SELECT * FROM {reader}(?)",
+            [data_file],
+        )
+        return table_name
+
+    def _qualified_name(self, table_name: str) -> str:
+        return ".".join(
+            part for part in (self.project_id, self.dataset_id, table_name) if part
+        )
+
+    def get_schema_ddl(self) -> str:
+        ddl_statements = ""
+        with self._lock:
+            for table_name in self.tables:
+                table_ref = self._qualified_name(table_name)
+                columns = self._connection.execute(
+                    f'DESCRIBE "{table_name}"'
+                ).fetchall()
+                ddl_statement = f"CREATE OR REPLACE TABLE `{table_ref}` (\n"
+                for column in columns:
+                    column_type = _DUCKDB_TO_BQ_TYPES.get(column[1], "STRING")
+                    ddl_statement += f"  `{column[0]}` {column_type},\n"
+                ddl_statement = ddl_statement[:-2] + "\n);\n\n"
+
+                rows = self._connection.execute(
+                    f'SELECT * FROM "{table_name}" LIMIT 5'
+                ).fetchall()
+                if rows:
+                    ddl_statement += f"-- Example values for table `{table_ref}`:\n"
+                    for row in rows:
+                        ddl_statement += f"INSERT INTO `{table_ref}` VALUES\n"
+                        values = ",".join(_example_value(value) for value in row)
+                        ddl_statement += f"({values});\n\n"
+                ddl_statements += ddl_statement
+        return ddl_statements
+
+    def execute(self, sql_string: str, max_rows: int) -> Optional[list[dict]]:
+        duckdb_sql = DuckDbSqlTranslator.transpile(sql_string)
+        with self._lock:
+            cursor = self._connection.execute(duckdb_sql)
+            if cursor.description is None:
+                return None
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchmany(max_rows)
+        return [
+            {key: _to_result_value(value) for key, value in zip(columns, row)}
+            for row in rows
+        ]
+
+
+_sql_backend = None
+_sql_backend_lock = threading.Lock()
+
+
+def get_sql_backend(get_client=None, get_schema=None) -> SqlBackend:
+    """Returns the process-wide SQL backend selected by `SQL_BACKEND`.
+
+    Args:
+      get_client: Returns the BigQuery client; used by the BigQuery backend.
+      get_schema: Builds the DDL of a BigQuery dataset; used by the BigQuery
+        backend.
+    """
+    global _sql_backend
+    with _sql_backend_lock:
+        if _sql_backend is None:
+            if SQL_BACKEND == "duckdb":
+                _sql_backend = DuckDbBackend(
+                    [f.strip() for f in DUCKDB_DATA_FILES.split(",") if f.strip()],
+                    project_id=os.getenv("BQ_PROJECT_ID"),
+                    dataset_id=os.getenv("BQ_DATASET_ID"),
+                )
+            elif SQL_BACKEND == "bigquery":
+                _sql_backend = BigQueryBackend(get_client, get_schema)
+            else:
+                raise ValueError(f"Unsupported SQL_BACKEND: {SQL_BACKEND}")
+        return _sql_backend
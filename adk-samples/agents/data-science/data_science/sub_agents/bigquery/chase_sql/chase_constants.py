@@ -36,6 +36,11 @@ chase_sql_constants_dict: immutabledict.immutabledict[str, Any] = (
             "temperature": 0.5,
             # Type of SQL generation method.
             "generate_sql_type": "dc",
+            # Whether to spread candidate generation across Gemini regions.
+            "distribute_requests": os.getenv(
+                "CHASE_DISTRIBUTE_REQUESTS", "false"
+            ).lower()
+            in ("1", "true", "yes"),
         }
     )
 )
@@ -17,9 +17,12 @@
 import enum
 import os
 
+from data_science.utils import cassette
 from google.adk.tools import ToolContext
 
 # pylint: disable=g-importing-member
+from ..nl2sql_cache import get_nl2sql_cache
+from . import context_cache
 from .dc_prompt_template import DC_PROMPT_TEMPLATE
 from .llm_utils import GeminiModel
 from .qp_prompt_template import QP_PROMPT_TEMPLATE
@@ -79,6 +82,7 @@ def parse_response(response: str) -> str:
     return query.strip()
 
 
+@cassette.timed_stage("nl2sql")
 def initial_bq_nl2sql(
     question: str,
     tool_context: ToolContext,
@@ -111,27 +115,66 @@ def initial_bq_nl2sql(
     model = tool_context.state["database_settings"]["model"]
     temperature = tool_context.state["database_settings"]["temperature"]
     generate_sql_type = tool_context.state["database_settings"]["generate_sql_type"]
+    distribute_requests = tool_context.state["database_settings"].get(
+        "distribute_requests", False
+    )
+
+    nl2sql_cache = get_nl2sql_cache()
+    cache_namespace = f"chase-{generate_sql_type}"
+    if nl2sql_cache is not None:
+        cached_sql = nl2sql_cache.lookup(
+            question, ddl_schema, namespace=cache_namespace
+        )
+        if cached_sql:
+            print("****** Reusing cached SQL for question.")
+            return cached_sql
 
     if generate_sql_type == GenerateSQLType.DC.value:
-        prompt = DC_PROMPT_TEMPLATE.format(
-            SCHEMA=ddl_schema, QUESTION=question, BQ_PROJECT_ID=BQ_PROJECT_ID
-        )
+        template = DC_PROMPT_TEMPLATE
     elif generate_sql_type == GenerateSQLType.QP.value:
-        prompt = QP_PROMPT_TEMPLATE.format(
-            SCHEMA=ddl_schema, QUESTION=question, BQ_PROJECT_ID=BQ_PROJECT_ID
-        )
+        template = QP_PROMPT_TEMPLATE
     else:
         raise ValueError(f"Unsupported generate_sql_type: {generate_sql_type}")
 
-    model = GeminiModel(model_name=model, temperature=temperature)
+    # The template and schema are sent once as cached content; each call
+    # then only carries the question.
+    prefix, question_template = context_cache.split_prompt(
+        template, ddl_schema, BQ_PROJECT_ID
+    )
+    question_prompt = question_template.format(
+        QUESTION=question, BQ_PROJECT_ID=BQ_PROJECT_ID
+    )
+    # Context caches are regional, so distributed requests send full prompts.
+    cache_manager = (
+        None if distribute_requests else context_cache.get_context_cache_manager()
+    )
+    cached_content = (
+        cache_manager.get(model, generate_sql_type, prefix)
+        if cache_manager is not None
+        else None
+    )
+    if cached_content is not None:
+        generation_model = GeminiModel(
+            model_name=model, temperature=temperature, cached_content=cached_content
+        )
+        prompt = question_prompt
+    else:
+        generation_model = GeminiModel(
+            model_name=model,
+            temperature=temperature,
+            distribute_requests=distribute_requests,
+        )
+        prompt = prefix + question_prompt
+
     requests = [prompt for _ in range(number_of_candidates)]
-    responses = model.call_parallel(requests, parser_func=parse_response)
+    responses = generation_model.call_parallel(requests, parser_func=parse_response)
     # Take just the first response.
     responses = responses[0]
 
     # If postprocessing of the SQL to transpile it to BigQuery is required,
     # then do it here.
     if transpile_to_bigquery:
+        # The translator has its own prompt, so it must not use the cache.
         translator = sql_translator.SqlTranslator(
             model=model,
             temperature=temperature,
@@ -140,8 +183,12 @@ def initial_bq_nl2sql(
         )
         # pylint: disable=g-bad-todo
         # pylint: enable=g-bad-todo
-        responses: str = translator.translate(
-            responses, ddl_schema=ddl_schema, db=db, catalog=project
-        )
+        with cassette.stage_timer.time("translate"):
+            responses: str = translator.translate(
+                responses, ddl_schema=ddl_schema, db=db, catalog=project
+            )
+
+    if nl2sql_cache is not None and isinstance(responses, str):
+        nl2sql_cache.store(question, ddl_schema, responses, namespace=cache_namespace)
 
     return responses
@@ -0,0 +1,205 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Vertex AI context caches for the ChaseSQL prompt templates.
+
+The DC and QP prompts are a long few-shot template followed by the DDL schema,
+and only the question at the very end changes between calls. That prefix is
+stored once as cached content per (model, template, prefix hash), so each
+NL2SQL call only sends the question. A cache is extended before its
+`CHASE_CONTEXT_CACHE_TTL_SECS` run out. Caches for several schemas (e.g. two
+datasets used in turn) live side by side, up to
+`CHASE_CONTEXT_CACHE_MAX_ENTRIES`; the least recently used one is then
+forgotten and expires with its TTL. Caches are never deleted, since another
+session may be in the middle of a call that uses them. If a cache cannot be
+created (e.g. the prefix is below the model's minimum cacheable size), the
+caller falls back to sending the full prompt.
+"""
+
+import dataclasses
+import datetime
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from vertexai.generative_models import Content, Part
+from vertexai.preview import caching
+
+from data_science.utils import cassette
+
+logger = logging.getLogger(__name__)
+
+CHASE_CONTEXT_CACHE_ENABLED = os.getenv(
+    "CHASE_CONTEXT_CACHE_ENABLED", "true"
+).lower() in ("1", "true", "yes")
+CHASE_CONTEXT_CACHE_TTL_SECS = float(os.getenv("CHASE_CONTEXT_CACHE_TTL_SECS", 3600))
+# A cache is extended once less than this much of its TTL is left.
+CHASE_CONTEXT_CACHE_REFRESH_SECS = float(
+    os.getenv("CHASE_CONTEXT_CACHE_REFRESH_SECS", 300)
+)
+CHASE_CONTEXT_CACHE_MAX_ENTRIES = int(
+    os.getenv("CHASE_CONTEXT_CACHE_MAX_ENTRIES", 16)
+)
+
+_QUESTION_PLACEHOLDER = "{QUESTION}"
+
+
+def split_prompt(
+    template: str, ddl_schema: str, project_id: Optional[str]
+) -> tuple[str, str]:
+    """Splits a ChaseSQL template into its cacheable prefix and question part.
+
+    Args:
+      template: A template with `{SCHEMA}`, `{BQ_PROJECT_ID}` and a final
+        `{QUESTION}` placeholder.
+      ddl_schema: The DDL schema of the dataset.
+      project_id: The BigQuery project of the examples.
+
+    Returns:
+      tuple: The prefix, which holds everything before the question, and a
+        template for the rest that still takes `QUESTION`. Concatenating the
+        prefix with the formatted rest gives exactly `template.format(...)`.
+    """
+    head, tail = template.split(_QUESTION_PLACEHOLDER, 1)
+    prefix = head.format(SCHEMA=ddl_schema, BQ_PROJECT_ID=project_id)
+    return prefix, _QUESTION_PLACEHOLDER + tail
+
+
+@dataclasses.dataclass
+class _CacheEntry:
+    cached_content: caching.CachedContent
+    expires_at: float
+
+
+class ContextCacheManager:
+    """Creates, extends and replaces cached prompt prefixes.
+
+    Attributes:
+      ttl_secs: Lifetime of a cache after it is created or extended.
+      refresh_secs: Remaining lifetime below which a cache is extended.
+      max_entries: Number of caches kept; the least recently used one is
+        forgotten beyond that.
+    """
+
+    def __init__(
+        self,
+        ttl_secs: float = CHASE_CONTEXT_CACHE_TTL_SECS,
+        refresh_secs: float = CHASE_CONTEXT_CACHE_REFRESH_SECS,
+        max_entries: int = CHASE_CONTEXT_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_secs = ttl_secs
+        self.refresh_secs = min(refresh_secs, ttl_secs / 2)
+        self.max_entries = max(max_entries, 1)
+        self._entries: OrderedDict[tuple[str, str, str], _CacheEntry] = (
+            OrderedDict()
+        )
+        # Prefixes that could not be cached, with the time to try again.
+        self._failures: dict[tuple[str, str, str], float] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple[str, str, str], threading.Lock] = {}
+
+    def _create(self, model_name: str, prefix: str) -> caching.CachedContent:
+        return caching.CachedContent.create(
+            model_name=model_name,
+            contents=[Content(role="user", parts=[Part.from_text(prefix)])],
+            ttl=datetime.timedelta(seconds=self.ttl_secs),
+            display_name="chase-sql-prompt",
+        )
+
+    def _extend(self, cached_content: caching.CachedContent) -> None:
+        cached_content.update(ttl=datetime.timedelta(seconds=self.ttl_secs))
+
+    def get(
+        self, model_name: str, template_name: str, prefix: str
+    ) -> Optional[caching.CachedContent]:
+        """Returns a live cache holding `prefix`, creating it if needed.
+
+        Args:
+          model_name: The model the cache is used with.
+          template_name: Identifies the template, e.g. "dc" or "qp".
+          prefix: The formatted template prefix, including the schema.
+
+        Returns:
+          The cached content, or None if the prefix could not be cached.
+        """
+        prefix_hash = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        key = (model_name, template_name, prefix_hash)
+        with self._lock:
+            if self._failures.get(key, 0.0) > time.monotonic():
+                return None
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Parallel candidates for the same prefix wait for one creation.
+        with key_lock:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+            if entry is not None:
+                if entry.expires_at - now > self.refresh_secs:
+                    return entry.cached_content
+                try:
+                    self._extend(entry.cached_content)
+                    entry.expires_at = now + self.ttl_secs
+                    return entry.cached_content
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.warning("Could not extend context cache: %s", e)
+
+            try:
+                cached_content = self._create(model_name, prefix)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Could not create context cache for %s; sending full prompts: %s",
+                    template_name,
+                    e,
+                )
+                with self._lock:
+                    self._failures[key] = now + self.ttl_secs
+                return None
+            with self._lock:
+                self._entries[key] = _CacheEntry(
+                    cached_content=cached_content,
+                    expires_at=now + self.ttl_secs,
+                )
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    # The evicted cache is not deleted, as a call in flight may
+                    # still use it; it expires with its TTL.
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+            return cached_content
+
+
+_context_cache_manager = None
+_context_cache_manager_lock = threading.Lock()
+
+
+def get_context_cache_manager() -> Optional[ContextCacheManager]:
+    """Returns the process-wide context cache manager, or None if disabled.
+
+    Caching is also off while an LLM cassette is recording or replaying, so
+    cassette fingerprints always cover the full prompt.
+    """
+    global _context_cache_manager
+    if not CHASE_CONTEXT_CACHE_ENABLED or cassette.get_mode() != cassette.MODE_OFF:
+        return None
+    with _context_cache_manager_lock:
+        if _context_cache_manager is None:
+            _context_cache_manager = ContextCacheManager()
+        return _context_cache_manager
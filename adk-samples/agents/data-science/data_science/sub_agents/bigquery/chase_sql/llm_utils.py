@@ -31,6 +31,10 @@ from vertexai.generative_models import HarmCategory
 from vertexai.preview import caching
 from vertexai.preview.generative_models import GenerativeModel
 
+from data_science.utils import cassette
+
+from . import region_scheduler
+
 
 dotenv.load_dotenv(override=True)
 
@@ -103,6 +107,9 @@ def retry(max_attempts=8, base_delay=1, backoff_factor=2):
             while attempts < max_attempts:
                 try:
                     return func(*args, **kwargs)
+                except (cassette.CassetteMiss, cassette.RecordedError):
+                    # Replayed outcomes are final; retrying cannot change them.
+                    raise
                 except Exception as e:  # pylint: disable=broad-exception-caught
                     print(f"Attempt {attempts + 1} failed with error: {e}")
                     attempts += 1
@@ -127,6 +134,7 @@ class GeminiModel:
         distribute_requests: bool = False,
         cache_name: str | None = None,
         temperature: float = 0.01,
+        cached_content: caching.CachedContent | None = None,
         **kwargs,
     ):
         self.model_name = model_name
@@ -134,21 +142,72 @@ class GeminiModel:
         self.arguments = kwargs
         self.distribute_requests = distribute_requests
         self.temperature = temperature
-        model_name = self.model_name
-        if not self.finetuned_model and self.distribute_requests:
-            random_region = random.choice(GEMINI_AVAILABLE_REGIONS)
-            model_name = GEMINI_URL.format(
-                GCP_PROJECT=GCP_PROJECT,
-                region=random_region,
-                model_name=self.model_name,
-            )
-        if cache_name is not None:
+        if cached_content is None and cache_name is not None:
             cached_content = caching.CachedContent(cached_content_name=cache_name)
+        self.cached_content = cached_content
+        # Cached content only exists in its own region, so those requests are
+        # never distributed.
+        self._scheduler = None
+        self._regional_models = {}
+        if cached_content is not None:
             self.model = GenerativeModel.from_cached_content(
                 cached_content=cached_content
             )
         else:
-            self.model = GenerativeModel(model_name=model_name)
+            self.model = GenerativeModel(model_name=self.model_name)
+            if not self.finetuned_model and self.distribute_requests:
+                self._scheduler = region_scheduler.get_region_scheduler(
+                    GEMINI_AVAILABLE_REGIONS
+                )
+
+    def _regional_model(self, region: str) -> GenerativeModel:
+        model = self._regional_models.get(region)
+        if model is None:
+            model = GenerativeModel(
+                model_name=GEMINI_URL.format(
+                    GCP_PROJECT=GCP_PROJECT,
+                    region=region,
+                    model_name=self.model_name,
+                )
+            )
+            self._regional_models[region] = model
+        return model
+
+    def _generate_content(self, prompt: str) -> str:
+        """Sends the prompt, choosing the region per call if distributed.
+
+        A quota error fails over to the next best region right away; other
+        errors are left to the `retry` backoff.
+        """
+        kwargs = {
+            "generation_config": GenerationConfig(
+                temperature=self.temperature,
+                **self.arguments,
+            ),
+            "safety_settings": SAFETY_FILTER_CONFIG,
+        }
+        if self._scheduler is None:
+            return self.model.generate_content(prompt, **kwargs).text
+        tried_regions = []
+        while True:
+            region = self._scheduler.acquire(exclude=tried_regions)
+            start = time.perf_counter()
+            try:
+                response = self._regional_model(region).generate_content(
+                    prompt, **kwargs
+                )
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                self._scheduler.release(region, time.perf_counter() - start, e)
+                tried_regions.append(region)
+                if (
+                    not region_scheduler.is_quota_error(e)
+                    or len(tried_regions) > region_scheduler.GEMINI_REGION_MAX_FAILOVERS
+                ):
+                    raise
+                print(f"Quota error in {region}, failing over: {e}")
+                continue
+            self._scheduler.release(region, time.perf_counter() - start)
+            return response.text
 
     @retry(max_attempts=12, base_delay=2, backoff_factor=2)
     def call(self, prompt: str, parser_func=None) -> str:
@@ -163,14 +222,16 @@ class GeminiModel:
         Returns:
             str: The processed response from the model.
         """
-        response = self.model.generate_content(
-            prompt,
-            generation_config=GenerationConfig(
-                temperature=self.temperature,
-                **self.arguments,
-            ),
-            safety_settings=SAFETY_FILTER_CONFIG,
-        ).text
+        response = cassette.call(
+            "gemini_model",
+            {
+                "model": self.model_name,
+                "prompt": prompt,
+                "temperature": self.temperature,
+                "arguments": self.arguments,
+            },
+            lambda: self._generate_content(prompt),
+        )
         if parser_func:
             return parser_func(response)
         return response
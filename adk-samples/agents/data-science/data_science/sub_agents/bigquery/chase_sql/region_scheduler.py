@@ -0,0 +1,166 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Health-aware choice of the Gemini region for each distributed request.
+
+Each region keeps an exponentially weighted moving average (EWMA) of its call
+latency and error rate. Every call goes to the region with the best score
+among those not cooling down, and calls that are still running count against
+their region. That spreads parallel candidates across the healthiest regions
+instead of sending them all to one. A region that answers with a quota error
+cools down for `GEMINI_REGION_COOLDOWN_SECS`, and the call fails over to the
+next best region immediately.
+"""
+
+import dataclasses
+import os
+import random
+import threading
+import time
+from typing import Iterable, Optional
+
+from google.api_core import exceptions as api_exceptions
+
+GEMINI_REGION_EWMA_ALPHA = float(os.getenv("GEMINI_REGION_EWMA_ALPHA", 0.2))
+GEMINI_REGION_COOLDOWN_SECS = float(os.getenv("GEMINI_REGION_COOLDOWN_SECS", 60))
+# Number of other regions a call tries after a quota error.
+GEMINI_REGION_MAX_FAILOVERS = int(os.getenv("GEMINI_REGION_MAX_FAILOVERS", 3))
+
+# Errors that say the region is out of capacity, not that the request is bad.
+QUOTA_ERRORS = (
+    api_exceptions.ResourceExhausted,
+    api_exceptions.TooManyRequests,
+    api_exceptions.ServiceUnavailable,
+)
+
+
+def is_quota_error(error: Exception) -> bool:
+    return isinstance(error, QUOTA_ERRORS)
+
+
+@dataclasses.dataclass
+class RegionStats:
+    """Health of one region."""
+
+    latency_ewma: Optional[float] = None
+    error_ewma: float = 0.0
+    in_flight: int = 0
+    cooldown_until: float = 0.0
+    calls: int = 0
+    errors: int = 0
+
+
+class RegionScheduler:
+    """Picks a region per call from latency, error rate and load.
+
+    Attributes:
+      regions: The regions to choose from.
+      alpha: EWMA weight of the newest observation.
+      cooldown_secs: How long a region is skipped after a quota error.
+    """
+
+    def __init__(
+        self,
+        regions: Iterable[str],
+        alpha: float = GEMINI_REGION_EWMA_ALPHA,
+        cooldown_secs: float = GEMINI_REGION_COOLDOWN_SECS,
+    ):
+        self.regions = list(regions)
+        self.alpha = alpha
+        self.cooldown_secs = cooldown_secs
+        self._stats = {region: RegionStats() for region in self.regions}
+        self._lock = threading.Lock()
+
+    def _score(self, stats: RegionStats, default_latency: float) -> float:
+        """Expected cost of one more call; lower is better."""
+        latency = (
+            stats.latency_ewma if stats.latency_ewma is not None else default_latency
+        )
+        # Regions with errors look slower by the expected number of attempts.
+        return latency * (1 + stats.in_flight) / max(1.0 - stats.error_ewma, 0.05)
+
+    def acquire(self, exclude: Iterable[str] = ()) -> str:
+        """Returns the region for the next call and counts it as in flight.
+
+        Args:
+          exclude: Regions this call has already tried.
+
+        Returns:
+          str: The chosen region; always pair it with `release`.
+        """
+        exclude = set(exclude)
+        now = time.monotonic()
+        with self._lock:
+            candidates = [r for r in self.regions if r not in exclude] or self.regions
+            available = [
+                r for r in candidates if self._stats[r].cooldown_until <= now
+            ] or candidates
+            known = [
+                s.latency_ewma
+                for s in self._stats.values()
+                if s.latency_ewma is not None
+            ]
+            # Untried regions are assumed as fast as the best one, so they get
+            # explored while the others are busy.
+            default_latency = min(known) if known else 1.0
+            # The random jitter breaks ties between equally good regions.
+            region = min(
+                available,
+                key=lambda r: self._score(self._stats[r], default_latency)
+                * random.uniform(1.0, 1.05),
+            )
+            self._stats[region].in_flight += 1
+            return region
+
+    def release(
+        self, region: str, latency_secs: float, error: Optional[Exception] = None
+    ) -> None:
+        """Records the outcome of a call started with `acquire`."""
+        with self._lock:
+            stats = self._stats[region]
+            stats.in_flight = max(stats.in_flight - 1, 0)
+            stats.calls += 1
+            failed = error is not None
+            stats.errors += int(failed)
+            stats.error_ewma += self.alpha * (float(failed) - stats.error_ewma)
+            if failed and is_quota_error(error):
+                stats.cooldown_until = time.monotonic() + self.cooldown_secs
+            elif not failed:
+                if stats.latency_ewma is None:
+                    stats.latency_ewma = latency_secs
+                else:
+                    stats.latency_ewma += self.alpha * (
+                        latency_secs - stats.latency_ewma
+                    )
+
+    def snapshot(self) -> dict[str, dict]:
+        """Returns the current stats of every region."""
+        with self._lock:
+            return {
+                region: dataclasses.asdict(stats)
+                for region, stats in self._stats.items()
+            }
+
+
+_region_scheduler = None
+_region_scheduler_lock = threading.Lock()
+
+
+def get_region_scheduler(regions: Iterable[str]) -> RegionScheduler:
+    """Returns the process-wide scheduler, shared by all model instances."""
+    global _region_scheduler
+    with _region_scheduler_lock:
+        if _region_scheduler is None:
+            _region_scheduler = RegionScheduler(regions)
+        return _region_scheduler
@@ -12,14 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Translator from SQLite to BigQuery."""
+"""Translators between the SQL dialects used by the NL2SQL tools."""
 
+import collections
+import hashlib
 import re
+import threading
 from typing import Any, Final
 
 import regex
 import sqlglot
 import sqlglot.optimizer
+import sqlglot.schema
 
 from ..llm_utils import GeminiModel  # pylint: disable=g-importing-member
 from .correction_prompt_template import (
@@ -118,6 +122,15 @@ class SqlTranslator:
 
     INPUT_DIALECT: Final[str] = "sqlite"
     OUTPUT_DIALECT: Final[str] = "bigquery"
+    # Parsed DDL schemas, keyed by the SHA-256 of the DDL string (and the
+    # output dialect the `MappingSchema` is prepared for). Parsing a
+    # large DDL is far more expensive than checking a query against it, and the
+    # schema rarely changes between queries.
+    _SCHEMA_CACHE_MAX_ENTRIES: Final[int] = 16
+    _schema_cache: collections.OrderedDict[
+        str, tuple[SQLGlotSchemaType, sqlglot.schema.MappingSchema]
+    ] = collections.OrderedDict()
+    _schema_cache_lock = threading.Lock()
 
     def __init__(
         self,
@@ -296,6 +309,52 @@ class SqlTranslator:
                 raise TypeError(f"Unsupported schema type: {type(schema)}")
         return schema_dict
 
+    @classmethod
+    def get_sqlglot_schema(
+        cls, schema: str | SQLGlotSchemaType | BirdSampleType | None
+    ) -> tuple[SQLGlotSchemaType | None, sqlglot.schema.MappingSchema | None]:
+        """Returns the SQLGlot schema and a prepared `MappingSchema` for it.
+
+        DDL strings are parsed once and memoized by their hash; other schema
+        types are cheap to convert and are rewritten on every call.
+
+        Args:
+          schema: The schema in any format accepted by
+            `rewrite_schema_for_sqlglot`.
+
+        Returns:
+          tuple of the schema in the SQLGlot format and the `MappingSchema`
+          built from it for the output dialect, or (None, None) if no schema is
+          provided.
+        """
+        if not isinstance(schema, str):
+            schema_dict = cls.rewrite_schema_for_sqlglot(schema)
+            if schema_dict is None:
+                return None, None
+            return schema_dict, sqlglot.schema.MappingSchema(
+                schema_dict, dialect=cls.OUTPUT_DIALECT
+            )
+
+        key = (
+            f"{cls.OUTPUT_DIALECT}:{hashlib.sha256(schema.encode('utf-8')).hexdigest()}"
+        )
+        with cls._schema_cache_lock:
+            cached = cls._schema_cache.get(key)
+            if cached is not None:
+                cls._schema_cache.move_to_end(key)
+                return cached
+        schema_dict = cls.rewrite_schema_for_sqlglot(schema)
+        mapping_schema = (
+            sqlglot.schema.MappingSchema(schema_dict, dialect=cls.OUTPUT_DIALECT)
+            if schema_dict is not None
+            else None
+        )
+        with cls._schema_cache_lock:
+            cls._schema_cache[key] = (schema_dict, mapping_schema)
+            while len(cls._schema_cache) > cls._SCHEMA_CACHE_MAX_ENTRIES:
+                cls._schema_cache.popitem(last=False)
+        return schema_dict, mapping_schema
+
     @classmethod
     def _check_for_errors(
         cls,
@@ -303,7 +362,9 @@ class SqlTranslator:
         sql_dialect: str,
         db: str | None = None,
         catalog: str | None = None,
-        schema_dict: SQLGlotSchemaType | None = None,
+        schema_dict: (
+            SQLGlotSchemaType | sqlglot.schema.MappingSchema | None
+        ) = None,
     ) -> tuple[str | None, str]:
         """Checks for errors in the SQL query.
 
@@ -314,7 +375,8 @@ class SqlTranslator:
           catalog: The catalog to use for the translation. `catalog` is the SQLGlot
             term for the project ID. This field is optional.
           schema_dict: The DDL schema to use for the translation. The DDL format is
-            in the SQLGlot format. This field is optional.
+            in the SQLGlot format, or a prepared `MappingSchema`. This field is
+            optional.
 
         Returns:
           tuple of the errors in the SQL query, or None if there are no errors, and
@@ -376,13 +438,13 @@ class SqlTranslator:
             sql_query = self._apply_heuristics(sql_query)
         # Reformat the schema if provided. This will remove any comments and
         # `INSERT INTO` statements.
-        schema_dict = self.rewrite_schema_for_sqlglot(ddl_schema)
+        schema_dict, mapping_schema = self.get_sqlglot_schema(ddl_schema)
         errors_and_sql: tuple[str | None, str] = self._check_for_errors(
             sql_query=sql_query,
             sql_dialect=self.OUTPUT_DIALECT,
             db=db,
             catalog=catalog,
-            schema_dict=schema_dict,
+            schema_dict=mapping_schema,
         )
         errors, sql_query = errors_and_sql
         responses = sql_query  # Default to the input SQL query after error check.
@@ -415,6 +477,28 @@ class SqlTranslator:
                     responses = responses[0]
         return responses
 
+    @classmethod
+    def transpile(cls, sql_query: str) -> str:
+        """Transpiles the SQL query from the input to the output SQL dialect.
+
+        Subclasses can override this to rewrite the query for their output
+        dialect, e.g. to adjust table references.
+
+        Args:
+          sql_query: The SQL query in the input SQL dialect.
+
+        Returns:
+          The SQL query in the output SQL dialect.
+        """
+        return sqlglot.transpile(
+            sql=sql_query,
+            read=cls.INPUT_DIALECT,
+            write=cls.OUTPUT_DIALECT,
+            error_level=sqlglot.ErrorLevel.IMMEDIATE,
+        )[
+            0
+        ]  # Transpile returns a list of strings.
+
     def translate(
         self,
         sql_query: str,
@@ -446,14 +530,7 @@ class SqlTranslator:
                 apply_heuristics=True,
             )
         print("****** sql_query after fix_errors:", sql_query)
-        sql_query = sqlglot.transpile(
-            sql=sql_query,
-            read=self.INPUT_DIALECT,
-            write=self.OUTPUT_DIALECT,
-            error_level=sqlglot.ErrorLevel.IMMEDIATE,
-        )[
-            0
-        ]  # Transpile returns a list of strings.
+        sql_query = self.transpile(sql_query)
         print("****** sql_query after transpile:", sql_query)
         if self._tool_output_errors:
             sql_query = self._fix_errors(
@@ -469,3 +546,28 @@ class SqlTranslator:
         sql_query = self._apply_heuristics(sql_query)
 
         return sql_query
+
+
+class DuckDbSqlTranslator(SqlTranslator):
+    """Translator from BigQuery to DuckDB.
+
+    Used by the local DuckDB backend to run the BigQuery SQL generated by the
+    NL2SQL tools. Local tables live in DuckDB's default schema, so the project
+    and dataset parts of every table reference are dropped.
+    """
+
+    INPUT_DIALECT: Final[str] = "bigquery"
+    OUTPUT_DIALECT: Final[str] = "duckdb"
+
+    @classmethod
+    def transpile(cls, sql_query: str) -> str:
+        """Transpiles BigQuery SQL to DuckDB SQL with unqualified table names."""
+        sql_query_ast = sqlglot.parse_one(
+            sql=sql_query,
+            read=cls.INPUT_DIALECT,
+            error_level=sqlglot.ErrorLevel.IMMEDIATE,
+        )
+        for table in sql_query_ast.find_all(sqlglot.exp.Table):
+            table.set("catalog", None)
+            table.set("db", None)
+        return sql_query_ast.sql(dialect=cls.OUTPUT_DIALECT)
@@ -0,0 +1,224 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Question to SQL cache for the NL2SQL tools.
+
+Entries are keyed by the normalized question text and a hash of the DDL schema,
+so a schema change never serves stale SQL. Optionally, a question that is not
+an exact match can reuse the SQL of a near-identical earlier question: both are
+embedded locally as hashed character trigram vectors and compared by cosine
+similarity against `NL2SQL_CACHE_SIMILARITY_THRESHOLD`. Cached SQL is always
+re-parsed with sqlglot before it is handed out.
+"""
+
+import collections
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from typing import Optional
+
+import sqlglot
+
+logger = logging.getLogger(__name__)
+
+NL2SQL_CACHE_ENABLED = os.getenv("NL2SQL_CACHE_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+NL2SQL_CACHE_MAX_ENTRIES = int(os.getenv("NL2SQL_CACHE_MAX_ENTRIES", 1024))
+NL2SQL_CACHE_TTL_SECS = float(os.getenv("NL2SQL_CACHE_TTL_SECS", 24 * 60 * 60))
+# Unset or empty disables the similarity lookup; only exact matches are served.
+_similarity_threshold = os.getenv("NL2SQL_CACHE_SIMILARITY_THRESHOLD")
+NL2SQL_CACHE_SIMILARITY_THRESHOLD = (
+    float(_similarity_threshold) if _similarity_threshold else None
+)
+
+SQL_DIALECT = "bigquery"
+_EMBEDDING_DIM = 1 << 12
+_NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercases the question and strips punctuation and extra whitespace."""
+    question = unicodedata.normalize("NFKC", question).lower()
+    question = re.sub(r"[^\w\s.]|(?<!\d)\.|\.(?!\d)", " ", question)
+    return " ".join(question.split())
+
+
+def schema_hash(ddl_schema: str) -> str:
+    """Returns a stable digest of the DDL schema."""
+    return hashlib.sha256(ddl_schema.encode("utf-8")).hexdigest()
+
+
+def embed_question(normalized_question: str) -> dict[int, float]:
+    """Embeds a normalized question as a unit-length sparse trigram vector."""
+    padded = f"  {normalized_question} "
+    counts = collections.Counter(
+        int.from_bytes(
+            hashlib.blake2b(padded[i : i + 3].encode("utf-8"), digest_size=4).digest(),
+            "little",
+        )
+        % _EMBEDDING_DIM
+        for i in range(len(padded) - 2)
+    )
+    norm = math.sqrt(sum(c * c for c in counts.values())) or 1.0
+    return {k: v / norm for k, v in counts.items()}
+
+
+def cosine_similarity(a: dict[int, float], b: dict[int, float]) -> float:
+    """Cosine similarity of two unit-length sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+
+def is_valid_sql(sql: str) -> bool:
+    """Cheap syntactic check that `sql` is a query before it is reused."""
+    try:
+        expression = sqlglot.parse_one(
+            sql, read=SQL_DIALECT, error_level=sqlglot.ErrorLevel.IMMEDIATE
+        )
+    except sqlglot.errors.SqlglotError:
+        return False
+    return isinstance(expression, sqlglot.exp.Query)
+
+
+class _CacheEntry:
+    """A cached SQL statement and the data needed to match it."""
+
+    __slots__ = ("sql", "embedding", "numbers", "created")
+
+    def __init__(self, sql: str, embedding: dict[int, float], numbers: tuple):
+        self.sql = sql
+        self.embedding = embedding
+        self.numbers = numbers
+        self.created = time.monotonic()
+
+
+class Nl2SqlCache:
+    """In-process LRU cache from (schema, question) to generated SQL.
+
+    Attributes:
+      max_entries: Maximum number of cached questions across all schemas.
+      ttl_secs: Age after which an entry is no longer served.
+      similarity_threshold: Minimum cosine similarity for a near-identical
+        question to reuse cached SQL, or None to serve exact matches only.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = NL2SQL_CACHE_MAX_ENTRIES,
+        ttl_secs: float = NL2SQL_CACHE_TTL_SECS,
+        similarity_threshold: Optional[float] = NL2SQL_CACHE_SIMILARITY_THRESHOLD,
+    ):
+        self.max_entries = max_entries
+        self.ttl_secs = ttl_secs
+        self.similarity_threshold = similarity_threshold
+        self._entries: collections.OrderedDict[
+            tuple[str, str, str], _CacheEntry
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _is_expired(self, entry: _CacheEntry) -> bool:
+        return time.monotonic() - entry.created > self.ttl_secs
+
+    def lookup(
+        self, question: str, ddl_schema: str, namespace: str = ""
+    ) -> Optional[str]:
+        """Returns cached SQL for the question, or None on a miss.
+
+        Args:
+          question: Natural language question.
+          ddl_schema: DDL schema the SQL was generated against.
+          namespace: Separates caches of different NL2SQL methods.
+
+        Returns:
+          str: The cached SQL statement, or None.
+        """
+        normalized = normalize_question(question)
+        schema_key = schema_hash(ddl_schema)
+        key = (namespace, schema_key, normalized)
+        with self._lock:
+            entry = self._entries.get(key)
+            match_key = key if entry is not None else None
+            if entry is None and self.similarity_threshold is not None:
+                match_key, entry = self._most_similar(namespace, schema_key, normalized)
+            if entry is None:
+                return None
+            if self._is_expired(entry) or not is_valid_sql(entry.sql):
+                del self._entries[match_key]
+                return None
+            self._entries.move_to_end(match_key)
+            if match_key != key:
+                logger.info(
+                    "NL2SQL cache: reusing SQL of similar question %r", match_key[2]
+                )
+            return entry.sql
+
+    def _most_similar(
+        self, namespace: str, schema_key: str, normalized: str
+    ) -> tuple[Optional[tuple[str, str, str]], Optional[_CacheEntry]]:
+        """Finds the most similar cached question above the threshold."""
+        embedding = embed_question(normalized)
+        # Questions that differ only in a number ("top 5" vs. "top 10") are
+        # very similar as text but need different SQL.
+        numbers = tuple(_NUMBER_PATTERN.findall(normalized))
+        best_key, best_entry, best_score = None, None, self.similarity_threshold
+        for key, entry in self._entries.items():
+            if key[0] != namespace or key[1] != schema_key:
+                continue
+            if entry.numbers != numbers:
+                continue
+            score = cosine_similarity(embedding, entry.embedding)
+            if score >= best_score:
+                best_key, best_entry, best_score = key, entry, score
+        return best_key, best_entry
+
+    def store(
+        self, question: str, ddl_schema: str, sql: str, namespace: str = ""
+    ) -> None:
+        """Caches the SQL generated for the question."""
+        if not sql or not is_valid_sql(sql):
+            return
+        normalized = normalize_question(question)
+        key = (namespace, schema_hash(ddl_schema), normalized)
+        entry = _CacheEntry(
+            sql,
+            embed_question(normalized),
+            tuple(_NUMBER_PATTERN.findall(normalized)),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_nl2sql_cache = None
+
+
+def get_nl2sql_cache() -> Optional[Nl2SqlCache]:
+    """Returns the process-wide NL2SQL cache, or None if caching is disabled."""
+    global _nl2sql_cache
+    if not NL2SQL_CACHE_ENABLED:
+        return None
+    if _nl2sql_cache is None:
+        _nl2sql_cache = Nl2SqlCache()
+    return _nl2sql_cache
@@ -0,0 +1,212 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local result cache for the queries run by the database agent.
+
+Entries are keyed by the sqlglot-normalized SQL together with a fingerprint of
+the `last_modified` time of every table the query reads, so new data in any of
+those tables invalidates the entry. Row sets are stored as Parquet files and the
+cache directory is trimmed least-recently-used first once it grows beyond
+`BQ_QUERY_CACHE_MAX_BYTES`.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlglot
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_ENABLED = os.getenv("BQ_QUERY_CACHE_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+QUERY_CACHE_DIR = os.getenv(
+    "BQ_QUERY_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "data_science_query_cache"),
+)
+QUERY_CACHE_MAX_BYTES = int(os.getenv("BQ_QUERY_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+# How long a table fingerprint is trusted before `last_modified` is re-read.
+FINGERPRINT_TTL_SECS = float(os.getenv("BQ_QUERY_CACHE_FINGERPRINT_TTL_SECS", 60))
+
+SQL_DIALECT = "bigquery"
+
+
+def normalize_sql(sql_string: str) -> str:
+    """Returns a canonical form of the SQL used as the cache key.
+
+    Keyword case, whitespace and comments do not change the key. If the SQL
+    cannot be parsed, the stripped input is returned unchanged.
+    """
+    try:
+        expression = sqlglot.parse_one(sql_string, read=SQL_DIALECT)
+    except sqlglot.errors.SqlglotError:
+        return sql_string.strip()
+    return expression.sql(dialect=SQL_DIALECT, comments=False)
+
+
+def referenced_tables(
+    sql_string: str,
+    default_project: Optional[str] = None,
+    default_dataset: Optional[str] = None,
+) -> list[str]:
+    """Returns the fully qualified names of the tables read by the SQL."""
+    expression = sqlglot.parse_one(sql_string, read=SQL_DIALECT)
+    cte_names = {cte.alias_or_name for cte in expression.find_all(sqlglot.exp.CTE)}
+    tables = set()
+    for table in expression.find_all(sqlglot.exp.Table):
+        if not table.db and table.name in cte_names:
+            continue
+        project = table.catalog or default_project
+        dataset = table.db or default_dataset
+        tables.add(".".join(part for part in (project, dataset, table.name) if part))
+    return sorted(tables)
+
+
+class QueryResultCache:
+    """Parquet-backed cache of capped query result row sets.
+
+    Attributes:
+      cache_dir: Directory holding one Parquet file per cached result.
+      max_bytes: Size budget for the directory; the least recently used
+        entries are evicted once it is exceeded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = QUERY_CACHE_DIR,
+        max_bytes: int = QUERY_CACHE_MAX_BYTES,
+        fingerprint_ttl_secs: float = FINGERPRINT_TTL_SECS,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._fingerprint_ttl_secs = fingerprint_ttl_secs
+        self._fingerprints: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def table_fingerprint(self, client, tables: list[str]) -> str:
+        """Fingerprints the `last_modified` times of the given tables.
+
+        Args:
+          client: BigQuery client used for the table metadata lookups.
+          tables: Fully qualified table names.
+
+        Returns:
+          str: A digest that changes whenever any of the tables is modified.
+        """
+        now = time.monotonic()
+        parts = []
+        for table_name in tables:
+            cached = self._fingerprints.get(table_name)
+            if cached and now - cached[0] < self._fingerprint_ttl_secs:
+                parts.append(cached[1])
+                continue
+            modified = client.get_table(table_name).modified
+            part = f"{table_name}@{modified.isoformat() if modified else ''}"
+            self._fingerprints[table_name] = (now, part)
+            parts.append(part)
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def cache_key(
+        self,
+        sql_string: str,
+        client,
+        default_project: Optional[str] = None,
+        default_dataset: Optional[str] = None,
+    ) -> str:
+        """Builds the cache key for a query against the current table data."""
+        tables = referenced_tables(sql_string, default_project, default_dataset)
+        fingerprint = self.table_fingerprint(client, tables)
+        key_text = f"{normalize_sql(sql_string)}\n{fingerprint}"
+        return hashlib.sha256(key_text.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def get(self, key: str) -> Optional[list[dict[str, Any]]]:
+        """Returns the cached rows for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            rows = pq.read_table(path).to_pylist()
+        except (FileNotFoundError, pa.ArrowInvalid, OSError):
+            return None
+        # Touch the entry so eviction sees it as recently used.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return rows
+
+    def put(self, key: str, rows: list[dict[str, Any]]) -> bool:
+        """Stores `rows` under `key` and evicts old entries if needed.
+
+        Returns:
+          bool: True if the rows were stored.
+        """
+        if not rows:
+            return False
+        try:
+            table = pa.Table.from_pylist(rows)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            logger.warning("Not caching query result: %s", e)
+            return False
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        self.evict()
+        return True
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the size budget is met."""
+        with self._lock:
+            entries = []
+            total_bytes = 0
+            for entry in os.scandir(self.cache_dir):
+                if not entry.name.endswith(".parquet"):
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total_bytes -= size
+                except FileNotFoundError:
+                    pass
+
+
+_query_cache = None
+
+
+def get_query_cache() -> Optional[QueryResultCache]:
+    """Returns the process-wide query cache, or None if caching is disabled."""
+    global _query_cache
+    if not QUERY_CACHE_ENABLED:
+        return None
+    if _query_cache is None:
+        _query_cache = QueryResultCache()
+    return _query_cache
@@ -14,17 +14,22 @@
 
 """This file contains the tools used by the database agent."""
 
-import datetime
 import logging
 import os
 import re
 
+from data_science.utils import cassette
+from data_science.utils import columnar
 from data_science.utils.utils import get_env_var
 from google.adk.tools import ToolContext
 from google.cloud import bigquery
 from google.genai import Client
+from google.genai import types
 
+from . import backends
 from .chase_sql import chase_constants
+from .nl2sql_cache import get_nl2sql_cache
+from .query_cache import get_query_cache
 
 # Assume that `BQ_PROJECT_ID` is set in the environment. See the
 # `data_agent` README for more details.
@@ -33,6 +38,8 @@ region = os.getenv("GOOGLE_CLOUD_REGION", "us-central1")
 llm_client = Client(vertexai=True, project=project, location=region)
 
 MAX_NUM_ROWS = 80
+# Artifact holding the latest query result for the analytics agent.
+QUERY_RESULT_ARTIFACT = "query_result.parquet"
 
 
 database_settings = None
@@ -47,6 +54,11 @@ def get_bq_client():
     return bq_client
 
 
+def get_sql_backend():
+    """Get the SQL backend selected by `SQL_BACKEND`."""
+    return backends.get_sql_backend(get_bq_client, get_bigquery_schema)
+
+
 def get_database_settings():
     """Get database settings."""
     global database_settings
@@ -58,10 +70,14 @@ def get_database_settings():
 def update_database_settings():
     """Update database settings."""
     global database_settings
-    ddl_schema = get_bigquery_schema(
-        get_env_var("BQ_DATASET_ID"),
-        client=get_bq_client(),
-        project_id=get_env_var("BQ_PROJECT_ID"),
+    ddl_schema = cassette.call(
+        "sql_schema",
+        {
+            "backend": backends.SQL_BACKEND,
+            "project": get_env_var("BQ_PROJECT_ID"),
+            "dataset": get_env_var("BQ_DATASET_ID"),
+        },
+        lambda: get_sql_backend().get_schema_ddl(),
     )
     database_settings = {
         "bq_project_id": get_env_var("BQ_PROJECT_ID"),
@@ -137,6 +153,7 @@ def get_bigquery_schema(dataset_id, client=None, project_id=None):
     return ddl_statements
 
 
+@cassette.timed_stage("nl2sql")
 def initial_bq_nl2sql(
     question: str,
     tool_context: ToolContext,
@@ -185,27 +202,85 @@ The database structure is defined by the following table schemas (possibly with
 
     ddl_schema = tool_context.state["database_settings"]["bq_ddl_schema"]
 
+    nl2sql_cache = get_nl2sql_cache()
+    if nl2sql_cache is not None:
+        sql = nl2sql_cache.lookup(question, ddl_schema, namespace="baseline")
+        if sql:
+            print("\n sql (cached):", sql)
+            tool_context.state["sql_query"] = sql
+            return sql
+
     prompt = prompt_template.format(
         MAX_NUM_ROWS=MAX_NUM_ROWS, SCHEMA=ddl_schema, QUESTION=question
     )
 
-    response = llm_client.models.generate_content(
-        model=os.getenv("BASELINE_NL2SQL_MODEL"),
-        contents=prompt,
-        config={"temperature": 0.1},
+    model = os.getenv("BASELINE_NL2SQL_MODEL")
+    sql = cassette.call(
+        "generate_content",
+        {"model": model, "prompt": prompt, "temperature": 0.1},
+        lambda: llm_client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config={"temperature": 0.1},
+        ).text,
     )
-
-    sql = response.text
     if sql:
         sql = sql.replace("```sql", "").replace("```", "").strip()
 
     print("\n sql:", sql)
 
+    if nl2sql_cache is not None and sql:
+        nl2sql_cache.store(question, ddl_schema, sql, namespace="baseline")
+
     tool_context.state["sql_query"] = sql
 
     return sql
 
 
+def save_query_result(rows: list[dict], tool_context: ToolContext) -> None:
+    """Stores a query result as a Parquet artifact for the analytics agent.
+
+    Only a compact reference (artifact name, shape and column names) is kept in
+    session state; the rows themselves live in the artifact.
+
+    Args:
+        rows (list[dict]): The query result rows.
+        tool_context (ToolContext): The tool context to store the result in.
+    """
+    table = columnar.rows_to_table(rows)
+    version = tool_context.save_artifact(
+        filename=QUERY_RESULT_ARTIFACT,
+        artifact=types.Part.from_bytes(
+            data=columnar.table_to_parquet_bytes(table),
+            mime_type=columnar.PARQUET_MIME_TYPE,
+        ),
+    )
+    tool_context.state["query_result"] = {
+        "artifact": QUERY_RESULT_ARTIFACT,
+        "version": version,
+        "num_rows": table.num_rows,
+        "columns": table.column_names,
+    }
+
+
+def _store_result(rows, tool_context, query_cache, cache_key) -> None:
+    """Saves the result artifact and caches the rows.
+
+    The query has already succeeded, so a failure to store the result is
+    logged and does not change the outcome reported to the agent.
+    """
+    try:
+        save_query_result(rows, tool_context)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logging.warning("Could not save the query result artifact: %s", e)
+    if cache_key is not None:
+        try:
+            query_cache.put(cache_key, rows)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logging.warning("Could not write the query result cache: %s", e)
+
+
+@cassette.timed_stage("validate")
 def run_bigquery_validation(
     sql_string: str,
     tool_context: ToolContext,
@@ -225,6 +300,11 @@ def run_bigquery_validation(
        results.
     4. **Result Analysis:**  Checks if the query produced any results. If so, it
        formats the first few rows of the result set for inspection.
+    5. **Backend:** The query runs on the backend selected by `SQL_BACKEND`,
+       BigQuery by default or a local DuckDB database for offline runs.
+    6. **Result Cache:** Identical SQL (after sqlglot normalization) against
+       unmodified tables is answered from the local result cache without a
+       BigQuery round-trip. The outcome is reported in `cache_status`.
 
     Args:
         sql_string (str): The SQL query string to validate.
@@ -237,6 +317,8 @@ def run_bigquery_validation(
                 is valid but returns no data.
              - "Invalid SQL: ..." if the query is invalid, along with the error
                 message from BigQuery.
+             The `cache_status` key is "hit", "miss", "bypass" (the cache could
+             not be consulted) or "disabled".
     """
 
     def cleanup_sql(sql_string):
@@ -264,7 +346,11 @@ def run_bigquery_validation(
     sql_string = cleanup_sql(sql_string)
     logging.info("Validating SQL (after cleanup): %s", sql_string)
 
-    final_result = {"query_result": None, "error_message": None}
+    final_result = {
+        "query_result": None,
+        "error_message": None,
+        "cache_status": "disabled",
+    }
 
     # More restrictive check for BigQuery - disallow DML and DDL
     if re.search(
@@ -275,39 +361,56 @@ def run_bigquery_validation(
         )
         return final_result
 
+    sql_backend = get_sql_backend()
+    # Recorded and replayed runs must see every query, so they skip the cache.
+    query_cache = (
+        get_query_cache()
+        if sql_backend.supports_result_cache and cassette.get_cassette() is None
+        else None
+    )
+    cache_key = None
+    if query_cache is not None:
+        try:
+            cache_key = query_cache.cache_key(
+                sql_string,
+                get_bq_client(),
+                default_project=os.getenv("BQ_PROJECT_ID"),
+                default_dataset=os.getenv("BQ_DATASET_ID"),
+            )
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Unparseable SQL or unknown tables: let BigQuery report the error.
+            logging.info("Query cache bypassed: %s", e)
+            final_result["cache_status"] = "bypass"
+        else:
+            rows = query_cache.get(cache_key)
+            if rows is not None:
+                final_result["cache_status"] = "hit"
+                final_result["query_result"] = rows
+                _store_result(rows, tool_context, None, None)
+                print("\n run_bigquery_validation final_result: \n", final_result)
+                return final_result
+            final_result["cache_status"] = "miss"
+
     try:
-        query_job = get_bq_client().query(sql_string)
-        results = query_job.result()  # Get the query results
-
-        if results.schema:  # Check if query returned data
-            rows = [
-                {
-                    key: (
-                        value
-                        if not isinstance(value, datetime.date)
-                        else value.strftime("%Y-%m-%d")
-                    )
-                    for (key, value) in row.items()
-                }
-                for row in results
-            ][
-                :MAX_NUM_ROWS
-            ]  # Convert BigQuery RowIterator to list of dicts
+        rows = cassette.call(
+            "sql_backend",
+            {"backend": sql_backend.name, "sql": sql_string, "max_rows": MAX_NUM_ROWS},
+            lambda: sql_backend.execute(sql_string, MAX_NUM_ROWS),
+        )
+    except (
+        Exception
+    ) as e:  # Catch generic exceptions from the backend  # pylint: disable=broad-exception-caught
+        final_result["error_message"] = f"Invalid SQL: {e}"
+    else:
+        if rows is not None:  # Check if query returned data
             # return f"Valid SQL. Results: {rows}"
             final_result["query_result"] = rows
-
-            tool_context.state["query_result"] = rows
-
+            _store_result(rows, tool_context, query_cache, cache_key)
         else:
             final_result["error_message"] = (
                 "Valid SQL. Query executed successfully (no results)."
             )
 
-    except (
-        Exception
-    ) as e:  # Catch generic exceptions from BigQuery  # pylint: disable=broad-exception-caught
-        final_result["error_message"] = f"Invalid SQL: {e}"
-
     print("\n run_bigquery_validation final_result: \n", final_result)
 
     return final_result
@@ -22,9 +22,12 @@ from google.adk.agents.callback_context import CallbackContext
 
 from data_science.sub_agents.bqml.tools import (
     check_bq_models,
+    check_bqml_job_status,
     execute_bqml_code,
+    fetch_bqml_job_results,
     rag_response,
 )
+from data_science.utils import cassette
 from .prompts import return_instructions_bqml
 
 
@@ -89,5 +92,14 @@ root_agent = Agent(
     name="bq_ml_agent",
     instruction=return_instructions_bqml(),
     before_agent_callback=setup_before_agent_call,
-    tools=[execute_bqml_code, check_bq_models, call_db_agent, rag_response],
+    before_model_callback=cassette.before_model_callback,
+    after_model_callback=cassette.after_model_callback,
+    tools=[
+        execute_bqml_code,
+        check_bqml_job_status,
+        fetch_bqml_job_results,
+        check_bq_models,
+        call_db_agent,
+        rag_response,
+    ],
 )
@@ -0,0 +1,155 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared clients and caches for the BQML tools.
+
+BigQuery clients are created once per project and reused, so their HTTP
+connection pools survive across tool calls. The model catalog of a dataset is
+cached for `BQML_MODEL_CATALOG_TTL_SECS` and dropped as soon as a BQML job
+creates, replaces or drops a model. Retrievals from the BQML reference guide
+corpus are cached per normalized query for `BQML_RAG_CACHE_TTL_SECS`.
+"""
+
+import collections
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from google.cloud import bigquery
+
+BQML_MODEL_CATALOG_TTL_SECS = float(os.getenv("BQML_MODEL_CATALOG_TTL_SECS", 300))
+BQML_RAG_CACHE_TTL_SECS = float(os.getenv("BQML_RAG_CACHE_TTL_SECS", 24 * 60 * 60))
+BQML_RAG_CACHE_MAX_ENTRIES = int(os.getenv("BQML_RAG_CACHE_MAX_ENTRIES", 256))
+
+# Statement types after which the model catalog is out of date.
+MODEL_STATEMENT_TYPES = ("CREATE_MODEL", "DROP_MODEL", "ALTER_MODEL")
+
+_clients: dict[Optional[str], bigquery.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def get_bq_client(project_id: Optional[str] = None) -> bigquery.Client:
+    """Returns the shared BigQuery client of the project."""
+    with _clients_lock:
+        client = _clients.get(project_id)
+        if client is None:
+            client = bigquery.Client(project=project_id)
+            _clients[project_id] = client
+        return client
+
+
+class ModelCatalog:
+    """TTL cache of the models in each dataset.
+
+    Attributes:
+      ttl_secs: Age after which a dataset's model list is fetched again.
+    """
+
+    def __init__(self, ttl_secs: float = BQML_MODEL_CATALOG_TTL_SECS):
+        self.ttl_secs = ttl_secs
+        self._entries: dict[str, tuple[float, list[dict]]] = {}
+        # Bumped by `invalidate`, so a list fetched across an invalidation
+        # is not stored.
+        self._generation = 0
+        self._dataset_generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _generation_of(self, dataset_id: str) -> tuple[int, int]:
+        return self._generation, self._dataset_generations.get(dataset_id, 0)
+
+    def list_models(self, client: bigquery.Client, dataset_id: str) -> list[dict]:
+        """Returns the name and type of every model in the dataset.
+
+        Args:
+          client: BigQuery client used on a cache miss.
+          dataset_id: The dataset, e.g. "project.dataset".
+
+        Returns:
+          list[dict]: One {"name", "type"} dict per model.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(dataset_id)
+            if cached and now - cached[0] < self.ttl_secs:
+                return list(cached[1])
+            generation = self._generation_of(dataset_id)
+        models = [
+            {"name": model.model_id, "type": model.model_type}
+            for model in client.list_models(dataset_id)
+        ]
+        with self._lock:
+            if self._generation_of(dataset_id) == generation:
+                self._entries[dataset_id] = (now, models)
+        return list(models)
+
+    def invalidate(self, dataset_id: Optional[str] = None) -> None:
+        """Drops the cached models of one dataset, or of all datasets."""
+        with self._lock:
+            if dataset_id is None:
+                self._generation += 1
+                self._entries.clear()
+            else:
+                self._dataset_generations[dataset_id] = (
+                    self._dataset_generations.get(dataset_id, 0) + 1
+                )
+                self._entries.pop(dataset_id, None)
+
+
+class RagResponseCache:
+    """LRU cache of reference guide retrievals keyed by corpus and query.
+
+    Attributes:
+      ttl_secs: Age after which a retrieval is run again.
+      max_entries: Maximum number of cached queries.
+    """
+
+    def __init__(
+        self,
+        ttl_secs: float = BQML_RAG_CACHE_TTL_SECS,
+        max_entries: int = BQML_RAG_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_secs = ttl_secs
+        self.max_entries = max_entries
+        self._entries: collections.OrderedDict[
+            tuple[str, str], tuple[float, str]
+        ] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    def get_or_retrieve(
+        self, corpus_name: str, query: str, retrieve: Callable[[str], str]
+    ) -> str:
+        """Returns the cached retrieval for the query or runs `retrieve`."""
+        key = (corpus_name or "", self.normalize_query(query))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and now - cached[0] < self.ttl_secs:
+                self._entries.move_to_end(key)
+                return cached[1]
+        response = retrieve(query)
+        with self._lock:
+            self._entries[key] = (now, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return response
+
+
+model_catalog = ModelCatalog()
+rag_response_cache = RagResponseCache()
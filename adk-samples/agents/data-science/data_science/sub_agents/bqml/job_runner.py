@@ -0,0 +1,152 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Non-blocking runner for BigQuery ML jobs.
+
+Jobs are submitted and then polled with `asyncio.sleep` between status checks,
+so a long model training never holds an agent worker. Every blocking BigQuery
+API call runs in a worker thread. A job that is still running after
+`BQML_JOB_TIMEOUT_SECS` is cancelled, both by BigQuery itself through the job
+timeout and by the next status check.
+"""
+
+import asyncio
+import datetime
+import os
+from typing import Any, Optional
+
+from google.cloud import bigquery
+
+BQML_JOB_TIMEOUT_SECS = float(os.getenv("BQML_JOB_TIMEOUT_SECS", 1500))
+# How long a tool call waits for a job before handing back the job handle.
+BQML_JOB_WAIT_SECS = float(os.getenv("BQML_JOB_WAIT_SECS", 20))
+BQML_JOB_POLL_SECS = float(os.getenv("BQML_JOB_POLL_SECS", 5))
+BQML_RESULT_PAGE_SIZE = int(os.getenv("BQML_RESULT_PAGE_SIZE", 50))
+
+
+def _elapsed_secs(job: bigquery.QueryJob) -> float:
+    """Seconds since the job was created, as reported by BigQuery."""
+    if not job.created:
+        return 0.0
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return (now - job.created).total_seconds()
+
+
+def _to_json_value(value: Any) -> Any:
+    """Keeps JSON scalars and renders everything else (dates, decimals) as text."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def job_status(job: bigquery.QueryJob) -> dict[str, Any]:
+    """Summarizes the state of a job as a status event."""
+    status = {
+        "job_id": job.job_id,
+        "state": job.state,
+        "elapsed_secs": round(_elapsed_secs(job), 1),
+    }
+    if job.error_result:
+        status["error"] = job.error_result.get("message", str(job.error_result))
+    return status
+
+
+async def submit_job(
+    client: bigquery.Client,
+    bqml_code: str,
+    timeout_secs: float = BQML_JOB_TIMEOUT_SECS,
+) -> bigquery.QueryJob:
+    """Submits the BQML code and returns without waiting for it to finish."""
+    job_config = bigquery.QueryJobConfig(job_timeout_ms=int(timeout_secs * 1000))
+    return await asyncio.to_thread(client.query, bqml_code, job_config=job_config)
+
+
+async def get_job(
+    client: bigquery.Client, job_id: str, location: Optional[str] = None
+) -> bigquery.QueryJob:
+    """Looks up a previously submitted job."""
+    return await asyncio.to_thread(client.get_job, job_id, location=location)
+
+
+async def wait_for_job(
+    job: bigquery.QueryJob,
+    wait_secs: float = BQML_JOB_WAIT_SECS,
+    poll_secs: float = BQML_JOB_POLL_SECS,
+    timeout_secs: float = BQML_JOB_TIMEOUT_SECS,
+    on_status=None,
+) -> dict[str, Any]:
+    """Polls the job for at most `wait_secs` without blocking the event loop.
+
+    Args:
+      job: The job to poll.
+      wait_secs: Budget for this call; the job keeps running afterwards.
+      poll_secs: Delay between two status checks.
+      timeout_secs: Total run time after which the job is cancelled.
+      on_status: Optional callable receiving every status event.
+
+    Returns:
+      dict: The last status event of the job.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait_secs
+    while True:
+        await asyncio.to_thread(job.reload)
+        status = job_status(job)
+        if job.state != "DONE" and status["elapsed_secs"] > timeout_secs:
+            await asyncio.to_thread(job.cancel)
+            status["state"] = "CANCELLED"
+            status["error"] = (
+                f"Timeout: job did not complete within {timeout_secs:.0f} seconds"
+            )
+        if on_status is not None:
+            on_status(status)
+        if status["state"] in ("DONE", "CANCELLED"):
+            return status
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return status
+        await asyncio.sleep(min(poll_secs, remaining))
+
+
+async def fetch_results_page(
+    client: bigquery.Client,
+    job: bigquery.QueryJob,
+    page_token: Optional[str] = None,
+    page_size: int = BQML_RESULT_PAGE_SIZE,
+) -> dict[str, Any]:
+    """Reads one page of the job's result rows.
+
+    Returns:
+      dict: The rows of the page, the total row count and the token of the
+        next page, which is None on the last page.
+    """
+    if job.destination is None:
+        # DDL statements such as CREATE MODEL do not produce rows.
+        return {"rows": [], "total_rows": 0, "next_page_token": None}
+
+    def _read_page():
+        row_iterator = client.list_rows(
+            job.destination, page_size=page_size, page_token=page_token or None
+        )
+        page = next(row_iterator.pages, [])
+        rows = [
+            {key: _to_json_value(value) for key, value in row.items()} for row in page
+        ]
+        return {
+            "rows": rows,
+            "total_rows": row_iterator.total_rows,
+            "next_page_token": row_iterator.next_page_token,
+        }
+
+    return await asyncio.to_thread(_read_page)
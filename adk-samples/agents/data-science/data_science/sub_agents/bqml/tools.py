@@ -12,11 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import time
 import os
+from typing import Optional
+
+from google.adk.tools import ToolContext
 from google.cloud import bigquery
 from vertexai import rag
 
+from . import job_runner
+from .cache import (
+    MODEL_STATEMENT_TYPES,
+    get_bq_client,
+    model_catalog,
+    rag_response_cache,
+)
+
+# The retrieval settings never change, so they are built once.
+RAG_RETRIEVAL_CONFIG = rag.RagRetrievalConfig(
+    top_k=3,  # Optional
+    filter=rag.Filter(vector_distance_threshold=0.5),  # Optional
+)
+
 
 def check_bq_models(dataset_id: str) -> str:
     """Lists models in a BigQuery dataset and returns them as a string.
@@ -31,67 +47,159 @@ def check_bq_models(dataset_id: str) -> str:
     """
 
     try:
-        client = bigquery.Client()
-
-        models = client.list_models(dataset_id)
-        model_list = []  # Initialize as a list
-
-        print(f"Models contained in '{dataset_id}':")
-        for model in models:
-            model_id = model.model_id
-            model_type = model.model_type
-            model_list.append({"name": model_id, "type": model_type})
-
+        model_list = model_catalog.list_models(get_bq_client(), dataset_id)
+        print(f"Models contained in '{dataset_id}': {len(model_list)}")
         return str(model_list)
 
     except Exception as e:
         return f"An error occurred: {str(e)}"
 
 
-def execute_bqml_code(bqml_code: str, project_id: str, dataset_id: str) -> str:
-    """
-    Executes BigQuery ML code.
+MAX_JOB_EVENTS = 50
+
+
+def _record_status(tool_context: ToolContext, status: dict) -> None:
+    """Appends a job status event to the session so progress is visible."""
+    print(
+        f"BQML Job Status: {status['state']}, Elapsed Time:"
+        f" {status['elapsed_secs']:.2f} seconds. Job ID: {status['job_id']}"
+    )
+    events = list(tool_context.state.get("bqml_job_events", []))
+    if events and events[-1]["job_id"] == status["job_id"] and (
+        events[-1]["state"] == status["state"]
+    ):
+        # Collapse repeated polls of an unchanged state into one event.
+        events[-1] = status
+    else:
+        events.append(status)
+    tool_context.state["bqml_job_events"] = events[-MAX_JOB_EVENTS:]
+
+
+def _job_handle(job_id: str, tool_context: ToolContext) -> Optional[dict]:
+    return tool_context.state.get("bqml_jobs", {}).get(job_id)
+
+
+async def _finish(
+    client: bigquery.Client, job, status: dict, tool_context: ToolContext
+) -> dict:
+    """Builds the tool response for a job that is no longer running."""
+    if status["state"] == "CANCELLED" or status.get("error"):
+        return {"status": "ERROR", **status}
+    if job.statement_type in MODEL_STATEMENT_TYPES:
+        model_catalog.invalidate()
+    result = {"status": "SUCCESS", **status}
+    result.update(await job_runner.fetch_results_page(client, job))
+    return result
+
+
+async def execute_bqml_code(
+    bqml_code: str, project_id: str, dataset_id: str, tool_context: ToolContext
+) -> dict:
+    """Submits BigQuery ML code as a job without blocking on it.
+
+    Waits briefly for the job. Short jobs return their first page of results
+    right away; long ones such as model training return a job handle to pass
+    to `check_bqml_job_status`.
+
+    Args:
+        bqml_code: The BQML statement to run.
+        project_id: The project to run the job in.
+        dataset_id: The dataset the BQML code works on.
+        tool_context: The tool context.
+
+    Returns:
+        dict: The job handle and status, plus the first page of result rows
+        if the job already finished.
     """
+    client = get_bq_client(project_id)
+    try:
+        job = await job_runner.submit_job(client, bqml_code)
+    except Exception as e:
+        return {"status": "ERROR", "error": f"An error occurred: {str(e)}"}
+
+    jobs = dict(tool_context.state.get("bqml_jobs", {}))
+    jobs[job.job_id] = {
+        "job_id": job.job_id,
+        "project_id": job.project,
+        "location": job.location,
+        "dataset_id": dataset_id,
+    }
+    tool_context.state["bqml_jobs"] = jobs
+
+    return await _poll(client, job, tool_context)
+
 
-    # timeout_seconds = 1500
+async def _poll(client: bigquery.Client, job, tool_context: ToolContext) -> dict:
+    try:
+        status = await job_runner.wait_for_job(
+            job, on_status=lambda status: _record_status(tool_context, status)
+        )
+        if status["state"] in ("DONE", "CANCELLED"):
+            return await _finish(client, job, status, tool_context)
+    except Exception as e:
+        return {"status": "ERROR", "job_id": job.job_id, "error": str(e)}
+    return {
+        "status": "RUNNING",
+        **status,
+        "message": (
+            "The job is still running. Call `check_bqml_job_status` with this"
+            " job_id to follow its progress."
+        ),
+    }
+
+
+async def check_bqml_job_status(job_id: str, tool_context: ToolContext) -> dict:
+    """Checks on a BigQuery ML job submitted by `execute_bqml_code`.
+
+    Waits briefly for the job to finish and cancels it once it exceeds the
+    configured timeout.
 
-    client = bigquery.Client(project=project_id)
+    Args:
+        job_id: The job ID returned by `execute_bqml_code`.
+        tool_context: The tool context.
 
+    Returns:
+        dict: The job status, plus the first page of result rows once the job
+        has finished.
+    """
+    handle = _job_handle(job_id, tool_context)
+    if handle is None:
+        return {"status": "ERROR", "error": f"Unknown BQML job: {job_id}"}
+    client = get_bq_client(handle["project_id"])
     try:
-        query_job = client.query(bqml_code)
-        start_time = time.time()
-
-        while not query_job.done():
-            elapsed_time = time.time() - start_time
-            # if elapsed_time > timeout_seconds:
-            #     return (
-            #         "Timeout: BigQuery job did not complete within"
-            #         f" {timeout_seconds} seconds. Job ID: {query_job.job_id}"
-            #     )
-
-            print(
-                f"Query Job Status: {query_job.state}, Elapsed Time:"
-                f" {elapsed_time:.2f} seconds. Job ID: {query_job.job_id}"
-            )
-            time.sleep(5)
-
-        if query_job.error_result:
-            return f"Error executing BigQuery ML code: {query_job.error_result}"
-
-        if query_job.exception():
-            return f"Exception during BigQuery ML execution: {query_job.exception()}"
-
-        results = query_job.result()
-        if results.total_rows > 0:
-            result_string = ""
-            for row in results:
-                result_string += str(dict(row.items())) + "\n"
-            return f"BigQuery ML code executed successfully. Results:\n{result_string}"
-        else:
-            return "BigQuery ML code executed successfully."
+        job = await job_runner.get_job(client, job_id, handle["location"])
+    except Exception as e:
+        return {"status": "ERROR", "job_id": job_id, "error": str(e)}
+    return await _poll(client, job, tool_context)
+
 
+async def fetch_bqml_job_results(
+    job_id: str, page_token: str, tool_context: ToolContext
+) -> dict:
+    """Fetches one page of the result rows of a finished BigQuery ML job.
+
+    Args:
+        job_id: The job ID returned by `execute_bqml_code`.
+        page_token: The `next_page_token` of the previous page, or an empty
+            string for the first page.
+        tool_context: The tool context.
+
+    Returns:
+        dict: The rows of the page, the total row count and the token of the
+        next page, which is None on the last page.
+    """
+    handle = _job_handle(job_id, tool_context)
+    if handle is None:
+        return {"status": "ERROR", "error": f"Unknown BQML job: {job_id}"}
+    client = get_bq_client(handle["project_id"])
+    try:
+        job = await job_runner.get_job(client, job_id, handle["location"])
+        if job.state != "DONE":
+            return {"status": "RUNNING", **job_runner.job_status(job)}
+        page = await job_runner.fetch_results_page(client, job, page_token)
     except Exception as e:
-        return f"An error occurred: {str(e)}"
+        return {"status": "ERROR", "job_id": job_id, "error": str(e)}
+    return {"status": "SUCCESS", "job_id": job_id, **page}
 
 
 def rag_response(query: str) -> str:
@@ -106,17 +214,16 @@ def rag_response(query: str) -> str:
     """
     corpus_name = os.getenv("BQML_RAG_CORPUS_NAME")
 
-    rag_retrieval_config = rag.RagRetrievalConfig(
-        top_k=3,  # Optional
-        filter=rag.Filter(vector_distance_threshold=0.5),  # Optional
-    )
-    response = rag.retrieval_query(
-        rag_resources=[
-            rag.RagResource(
-                rag_corpus=corpus_name,
-            )
-        ],
-        text=query,
-        rag_retrieval_config=rag_retrieval_config,
-    )
-    return str(response)
+    def _retrieve(text: str) -> str:
+        response = rag.retrieval_query(
+            rag_resources=[
+                rag.RagResource(
+                    rag_corpus=corpus_name,
+                )
+            ],
+            text=text,
+            rag_retrieval_config=RAG_RETRIEVAL_CONFIG,
+        )
+        return str(response)
+
+    return rag_response_cache.get_or_retrieve(corpus_name, query, _retrieve)
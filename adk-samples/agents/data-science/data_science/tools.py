@@ -18,12 +18,21 @@
 -- then, it use NL2Py to do further data analysis as needed
 """
 
+import base64
+import hashlib
+
+from google.adk.code_executors.code_execution_utils import File
+from google.adk.code_executors.code_executor_context import CodeExecutorContext
 from google.adk.tools import ToolContext
 from google.adk.tools.agent_tool import AgentTool
 
 from .sub_agents import ds_agent, db_agent
+from .sub_agents.bigquery.tools import QUERY_RESULT_ARTIFACT
+from .utils import cassette
+from .utils import columnar
 
 
+@cassette.timed_stage("db_agent")
 async def call_db_agent(
     question: str,
     tool_context: ToolContext,
@@ -43,6 +52,7 @@ async def call_db_agent(
     return db_agent_output
 
 
+@cassette.timed_stage("ds_agent")
 async def call_ds_agent(
     question: str,
     tool_context: ToolContext,
@@ -52,14 +62,35 @@ async def call_ds_agent(
     if question == "N/A":
         return tool_context.state["db_agent_output"]
 
-    input_data = tool_context.state["query_result"]
+    # The query result is handed to the code executor as a CSV file; the model
+    # itself only sees the schema and a few sample rows.
+    code_executor_context = CodeExecutorContext(tool_context.state)
+    query_result = tool_context.load_artifact(QUERY_RESULT_ARTIFACT)
+    if query_result is not None and query_result.inline_data:
+        table = columnar.parquet_bytes_to_table(query_result.inline_data.data)
+        csv_bytes = columnar.table_to_csv_bytes(table)
+        # A new name per result makes the executor load and explore it afresh.
+        file_stem = f"query_result_{hashlib.sha256(csv_bytes).hexdigest()[:8]}"
+        code_executor_context.clear_input_files()
+        code_executor_context.add_input_files(
+            [
+                File(
+                    name=f"{file_stem}.csv",
+                    content=base64.b64encode(csv_bytes).decode("ascii"),
+                    mime_type=columnar.CSV_MIME_TYPE,
+                )
+            ]
+        )
+        data_description = f"""
+  The data to analyze for the previous question is available as the file
+  `{file_stem}.csv` and is loaded into the pandas DataFrame `{file_stem}`.
+  {columnar.summarize_table(table)}"""
+    else:
+        data_description = "\n  No query result is available for this question."
 
     question_with_data = f"""
   Question to answer: {question}
-
-  Actual data to analyze prevoius quesiton is already in the following:
-  {input_data}
-
+  {data_description}
   """
 
     agent_tool = AgentTool(agent=ds_agent)
@@ -67,5 +98,7 @@ async def call_ds_agent(
     ds_agent_output = await agent_tool.run_async(
         args={"request": question_with_data}, tool_context=tool_context
     )
+    # The executor has loaded the file; keep its contents out of the session.
+    code_executor_context.clear_input_files()
     tool_context.state["ds_agent_output"] = ds_agent_output
     return ds_agent_output
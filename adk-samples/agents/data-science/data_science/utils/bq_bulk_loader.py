@@ -0,0 +1,254 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk loader for local CSV and Parquet files into BigQuery.
+
+Every file is streamed in record batches, so memory stays bounded by the batch
+size, and written to a temporary Parquet file with an explicit schema. The
+Parquet file is then loaded with one load job per file, and the files of a
+call run in parallel. Load jobs are free, unlike streaming inserts, and the
+explicit schema avoids BigQuery's type autodetection.
+"""
+
+import concurrent.futures
+import dataclasses
+import os
+import tempfile
+import time
+from typing import Iterator, Optional
+
+import pyarrow as pa
+import pyarrow.csv
+import pyarrow.parquet as pq
+from google.cloud import bigquery
+
+CSV_BLOCK_SIZE = 16 * 1024 * 1024
+PARQUET_BATCH_ROWS = 256 * 1024
+MAX_PARALLEL_LOADS = 4
+
+_BQ_TO_ARROW = {
+    "STRING": pa.string(),
+    "BYTES": pa.binary(),
+    "INTEGER": pa.int64(),
+    "INT64": pa.int64(),
+    "FLOAT": pa.float64(),
+    "FLOAT64": pa.float64(),
+    "NUMERIC": pa.decimal128(38, 9),
+    "BOOLEAN": pa.bool_(),
+    "BOOL": pa.bool_(),
+    "DATE": pa.date32(),
+    "DATETIME": pa.timestamp("us"),
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    "TIME": pa.time64("us"),
+}
+
+
+@dataclasses.dataclass
+class LoadResult:
+    """Outcome and throughput of one file load."""
+
+    source: str
+    table_id: str
+    rows: int
+    source_bytes: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def mib_per_sec(self) -> float:
+        if not self.seconds:
+            return 0.0
+        return self.source_bytes / (1024 * 1024) / self.seconds
+
+
+def arrow_schema_from_bq(schema: list[bigquery.SchemaField]) -> pa.Schema:
+    """Converts a flat BigQuery schema into the matching Arrow schema."""
+    fields = []
+    for field in schema:
+        arrow_type = _BQ_TO_ARROW.get(field.field_type.upper())
+        if arrow_type is None:
+            raise ValueError(
+                f"Unsupported type {field.field_type} for column {field.name}"
+            )
+        if field.mode == "REPEATED":
+            arrow_type = pa.list_(arrow_type)
+        fields.append(pa.field(field.name, arrow_type, field.mode != "REQUIRED"))
+    return pa.schema(fields)
+
+
+def bq_schema_from_arrow(schema: pa.Schema) -> list[bigquery.SchemaField]:
+    """Derives an explicit BigQuery schema from an inferred Arrow schema."""
+    fields = []
+    for field in schema:
+        arrow_type = field.type
+        if pa.types.is_integer(arrow_type):
+            bq_type = "INTEGER"
+        elif pa.types.is_floating(arrow_type):
+            bq_type = "FLOAT"
+        elif pa.types.is_boolean(arrow_type):
+            bq_type = "BOOLEAN"
+        elif pa.types.is_date(arrow_type):
+            bq_type = "DATE"
+        elif pa.types.is_timestamp(arrow_type):
+            bq_type = "TIMESTAMP" if arrow_type.tz else "DATETIME"
+        elif pa.types.is_decimal(arrow_type):
+            bq_type = "NUMERIC"
+        elif pa.types.is_binary(arrow_type):
+            bq_type = "BYTES"
+        else:
+            bq_type = "STRING"
+        fields.append(bigquery.SchemaField(field.name, bq_type))
+    return fields
+
+
+def iter_batches(
+    path: str, schema: Optional[pa.Schema] = None
+) -> Iterator[pa.RecordBatch]:
+    """Streams a CSV or Parquet file as record batches.
+
+    Args:
+      path: The file to read; the format is taken from the extension.
+      schema: Optional column types. Without it, CSV types are inferred from
+        the first block.
+
+    Yields:
+      pa.RecordBatch: The next chunk of rows, cast to `schema` if given.
+    """
+    if path.endswith(".parquet"):
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_ROWS):
+            yield batch.cast(schema) if schema is not None else batch
+        return
+
+    convert_options = pyarrow.csv.ConvertOptions(
+        column_types=schema, strings_can_be_null=True
+    )
+    reader = pyarrow.csv.open_csv(
+        path,
+        read_options=pyarrow.csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=convert_options,
+    )
+    for batch in reader:
+        if schema is not None:
+            batch = pa.RecordBatch.from_arrays(
+                [batch.column(name) for name in schema.names], schema=schema
+            )
+        yield batch
+
+
+def write_parquet(
+    path: str, out_path: str, schema: Optional[pa.Schema] = None
+) -> tuple[pa.Schema, int]:
+    """Rewrites a CSV or Parquet file as Parquet, one batch at a time.
+
+    Returns:
+      tuple: The Arrow schema of the written file and its row count.
+    """
+    writer = None
+    rows = 0
+    try:
+        for batch in iter_batches(path, schema):
+            if writer is None:
+                schema = batch.schema
+                writer = pq.ParquetWriter(out_path, schema, compression="zstd")
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"No rows found in {path}")
+    return schema, rows
+
+
+def load_file(
+    client: bigquery.Client,
+    source: str,
+    table_id: str,
+    schema: Optional[list[bigquery.SchemaField]] = None,
+    write_disposition: str = bigquery.WriteDisposition.WRITE_APPEND,
+) -> LoadResult:
+    """Loads one local file into a BigQuery table with a single load job.
+
+    Args:
+      client: A BigQuery client.
+      source: Path to a CSV (with a header row) or Parquet file.
+      table_id: The destination table, e.g. "project.dataset.table".
+      schema: Explicit table schema. Without it, the schema is derived from
+        the column types Arrow infers for the file.
+      write_disposition: What to do if the table already holds data.
+
+    Returns:
+      LoadResult: Row count and throughput of the load.
+    """
+    start = time.perf_counter()
+    arrow_schema = arrow_schema_from_bq(schema) if schema else None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parquet_path = os.path.join(tmp_dir, "load.parquet")
+        arrow_schema, rows = write_parquet(source, parquet_path, arrow_schema)
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            schema=schema or bq_schema_from_arrow(arrow_schema),
+            write_disposition=write_disposition,
+        )
+        with open(parquet_path, "rb") as parquet_file:
+            job = client.load_table_from_file(
+                parquet_file, table_id, job_config=job_config
+            )
+        job.result()  # Wait for the job to complete
+    result = LoadResult(
+        source=source,
+        table_id=table_id,
+        rows=job.output_rows if job.output_rows is not None else rows,
+        source_bytes=os.path.getsize(source),
+        seconds=time.perf_counter() - start,
+    )
+    print(
+        f"Loaded {result.rows} rows from {source} into {table_id} in"
+        f" {result.seconds:.1f}s ({result.rows_per_sec:,.0f} rows/s,"
+        f" {result.mib_per_sec:.1f} MiB/s)"
+    )
+    return result
+
+
+def load_files(
+    client: bigquery.Client,
+    loads: list[dict],
+    max_workers: int = MAX_PARALLEL_LOADS,
+) -> list[LoadResult]:
+    """Loads several files in parallel, one load job per file.
+
+    Args:
+      client: A BigQuery client.
+      loads: Keyword arguments of `load_file` (without `client`), one dict
+        per file.
+      max_workers: Maximum number of files converted and loaded at once.
+
+    Returns:
+      list[LoadResult]: The results in the order of `loads`.
+    """
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(load_file, client, **load) for load in loads]
+        results = [future.result() for future in futures]
+    seconds = time.perf_counter() - start
+    total_rows = sum(result.rows for result in results)
+    print(
+        f"Loaded {total_rows} rows from {len(results)} files in {seconds:.1f}s"
+        f" ({total_rows / seconds if seconds else 0:,.0f} rows/s)"
+    )
+    return results
@@ -0,0 +1,353 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Record and replay of LLM, SQL and code execution calls for offline evals.
+
+With `LLM_CASSETTE_MODE=record`, every agent model call, NL2SQL and ChaseSQL
+model call, SQL backend query and code execution is run for real and its
+response is stored in the cassette file at `LLM_CASSETTE_PATH`. The key is a
+fingerprint of the request. With `LLM_CASSETTE_MODE=replay`, the recorded
+responses are returned instead and nothing leaves the process; a request
+without a recording raises `CassetteMiss`. The default `off` leaves every call
+untouched.
+
+`stage_timer` collects per-stage latencies (NL2SQL, translate, validate,
+ds_agent) in every mode.
+"""
+
+import collections
+import contextlib
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pathlib
+import re
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.code_executors.base_code_executor import BaseCodeExecutor
+from google.adk.code_executors.code_execution_utils import (
+    CodeExecutionInput,
+    CodeExecutionResult,
+    File,
+)
+from google.adk.models import LlmRequest, LlmResponse
+from pydantic import PrivateAttr
+
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+DEFAULT_CASSETTE_PATH = str(
+    pathlib.Path(__file__).parents[2] / "eval" / "eval_data" / "cassette.json"
+)
+
+# Today's date, injected into the root agent's global instruction, must not
+# change the fingerprint of an otherwise identical model request. Other dates,
+# e.g. literals in SQL, are part of the request.
+_TODAYS_DATE_PATTERN = re.compile(r"(Todays date: )\d{4}-\d{2}-\d{2}")
+
+
+def get_mode() -> str:
+    return os.getenv("LLM_CASSETTE_MODE", MODE_OFF).lower()
+
+
+def get_path() -> str:
+    return os.getenv("LLM_CASSETTE_PATH", DEFAULT_CASSETTE_PATH)
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+class RecordedError(RuntimeError):
+    """Replays an exception that was raised while recording."""
+
+
+class Cassette:
+    """Fingerprinted request/response store backed by a JSON file.
+
+    Attributes:
+      path: The cassette file.
+      mode: `record` or `replay`.
+    """
+
+    def __init__(self, path: str, mode: str):
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    @staticmethod
+    def fingerprint(kind: str, payload: Any) -> str:
+        """Hashes the kind of call and its request payload."""
+        text = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(f"{kind}\n{text}".encode("utf-8")).hexdigest()
+
+    def call(self, kind: str, payload: Any, func: Callable[[], Any]) -> Any:
+        """Returns the recorded response for the request, or records `func()`.
+
+        Args:
+          kind: The type of call, e.g. "generate_content".
+          payload: JSON-serializable description of the request.
+          func: Performs the real call; its result must be JSON-serializable.
+
+        Returns:
+          The recorded or freshly recorded response.
+        """
+        key = self.fingerprint(kind, payload)
+        if self.mode == MODE_REPLAY:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise CassetteMiss(f"No recorded {kind} response for {key}")
+            if "error" in entry:
+                raise RecordedError(entry["error"])
+            return entry["response"]
+        try:
+            response = func()
+        except Exception as e:
+            self.put(key, kind, {"error": str(e)})
+            raise
+        self.put(key, kind, {"response": response})
+        return response
+
+    def get(self, key: str) -> Optional[dict]:
+        return self._entries.get(key)
+
+    def put(self, key: str, kind: str, entry: dict) -> None:
+        """Stores an entry and rewrites the cassette file."""
+        with self._lock:
+            self._entries[key] = {"kind": kind, **entry}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=1, sort_keys=True, default=str)
+            os.replace(tmp_path, self.path)
+
+
+_cassettes: dict[tuple[str, str], Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Returns the cassette for the current mode and path, or None if off."""
+    mode = get_mode()
+    if mode not in (MODE_RECORD, MODE_REPLAY):
+        return None
+    key = (mode, get_path())
+    with _cassettes_lock:
+        if key not in _cassettes:
+            _cassettes[key] = Cassette(key[1], mode)
+        return _cassettes[key]
+
+
+def call(kind: str, payload: Any, func: Callable[[], Any]) -> Any:
+    """Runs `func` through the active cassette, or directly if none is active."""
+    cassette = get_cassette()
+    if cassette is None:
+        return func()
+    return cassette.call(kind, payload, func)
+
+
+class StageTimer:
+    """Accumulates call counts and latencies per pipeline stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = collections.defaultdict(lambda: [0, 0.0, 0.0])
+
+    @contextlib.contextmanager
+    def time(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self._stats[stage]
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def report(self) -> dict[str, dict[str, float]]:
+        """Returns count, total, mean and max seconds per stage."""
+        with self._lock:
+            return {
+                stage: {
+                    "count": count,
+                    "total_secs": total,
+                    "mean_secs": total / count if count else 0.0,
+                    "max_secs": max_secs,
+                }
+                for stage, (count, total, max_secs) in self._stats.items()
+            }
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<12}{'count':>7}{'total s':>10}{'mean s':>10}{'max s':>10}"]
+        for stage, stats in sorted(self.report().items()):
+            lines.append(
+                f"{stage:<12}{stats['count']:>7}{stats['total_secs']:>10.3f}"
+                f"{stats['mean_secs']:>10.3f}{stats['max_secs']:>10.3f}"
+            )
+        return "\n".join(lines)
+
+
+stage_timer = StageTimer()
+
+
+def timed_stage(stage: str):
+    """Decorator recording the latency of a sync or async tool in `stage`."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with stage_timer.time(stage):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer.time(stage):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _strip_call_ids(value: Any) -> Any:
+    """Drops the random function call IDs that ADK assigns per run."""
+    if isinstance(value, dict):
+        return {k: _strip_call_ids(v) for k, v in value.items() if k != "id"}
+    if isinstance(value, list):
+        return [_strip_call_ids(v) for v in value]
+    return value
+
+
+def _llm_request_payload(callback_context: CallbackContext, llm_request: LlmRequest):
+    system_instruction = (
+        llm_request.config.system_instruction if llm_request.config else None
+    )
+    return {
+        "agent": callback_context.agent_name,
+        "model": llm_request.model,
+        "system_instruction": _TODAYS_DATE_PATTERN.sub(
+            r"\1<date>", str(system_instruction)
+        ),
+        "contents": _strip_call_ids(
+            [
+                content.model_dump(mode="json", exclude_none=True)
+                for content in llm_request.contents
+            ]
+        ),
+    }
+
+
+_pending_requests: dict[tuple[str, str], str] = {}
+
+
+def before_model_callback(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Agent callback that replays a recorded model response."""
+    cassette = get_cassette()
+    if cassette is None:
+        return None
+    key = cassette.fingerprint(
+        "agent_model", _llm_request_payload(callback_context, llm_request)
+    )
+    if cassette.mode == MODE_RECORD:
+        _pending_requests[
+            (callback_context.invocation_id, callback_context.agent_name)
+        ] = key
+        return None
+    entry = cassette.get(key)
+    if entry is None:
+        raise CassetteMiss(
+            f"No recorded model response for agent {callback_context.agent_name}"
+        )
+    return LlmResponse.model_validate(entry["response"])
+
+
+def after_model_callback(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """Agent callback that records the model response in record mode."""
+    cassette = get_cassette()
+    if cassette is None or cassette.mode != MODE_RECORD or llm_response.partial:
+        return None
+    key = _pending_requests.pop(
+        (callback_context.invocation_id, callback_context.agent_name), None
+    )
+    if key is not None:
+        cassette.put(
+            key,
+            "agent_model",
+            {"response": llm_response.model_dump(mode="json", exclude_none=True)},
+        )
+    return None
+
+
+class CassetteCodeExecutor(BaseCodeExecutor):
+    """Code executor that records or replays the results of a real executor.
+
+    The wrapped executor is only created on the first real execution, so
+    replaying never needs the remote code interpreter.
+    """
+
+    executor_factory: Callable[[], BaseCodeExecutor]
+    _executor: Optional[BaseCodeExecutor] = PrivateAttr(default=None)
+
+    def _get_executor(self) -> BaseCodeExecutor:
+        if self._executor is None:
+            self._executor = self.executor_factory()
+        return self._executor
+
+    def execute_code(
+        self, invocation_context, code_execution_input: CodeExecutionInput
+    ) -> CodeExecutionResult:
+        def _execute() -> dict:
+            result = self._get_executor().execute_code(
+                invocation_context, code_execution_input
+            )
+            return {
+                "stdout": result.stdout,
+                "stderr": result.stderr,
+                "output_files": [vars(f) for f in result.output_files],
+            }
+
+        payload = {
+            "code": code_execution_input.code,
+            "input_files": sorted(f.name for f in code_execution_input.input_files),
+        }
+        result = call("code_execution", payload, _execute)
+        return CodeExecutionResult(
+            stdout=result["stdout"],
+            stderr=result["stderr"],
+            output_files=[File(**f) for f in result["output_files"]],
+        )
@@ -0,0 +1,76 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar helpers for handing query results between agents.
+
+Query results are kept as Arrow tables and stored as Parquet, so column names
+are written once instead of on every row. The analytics agent only sees a
+short schema-plus-sample summary; the full data reaches its code executor as a
+CSV file.
+"""
+
+import io
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.csv
+import pyarrow.parquet as pq
+
+PARQUET_MIME_TYPE = "application/vnd.apache.parquet"
+CSV_MIME_TYPE = "text/csv"
+
+
+def rows_to_table(rows: list[dict[str, Any]]) -> pa.Table:
+    """Converts a list of row dicts into an Arrow table."""
+    return pa.Table.from_pylist(rows)
+
+
+def table_to_parquet_bytes(table: pa.Table) -> bytes:
+    """Serializes an Arrow table as compressed Parquet."""
+    sink = io.BytesIO()
+    pq.write_table(table, sink, compression="zstd")
+    return sink.getvalue()
+
+
+def parquet_bytes_to_table(data: bytes) -> pa.Table:
+    """Deserializes Parquet bytes into an Arrow table."""
+    return pq.read_table(io.BytesIO(data))
+
+
+def table_to_csv_bytes(table: pa.Table) -> bytes:
+    """Serializes an Arrow table as CSV with a header row."""
+    sink = io.BytesIO()
+    pyarrow.csv.write_csv(table, sink)
+    return sink.getvalue()
+
+
+def summarize_table(table: pa.Table, sample_rows: int = 5) -> str:
+    """Describes a table by its shape, column types and first few rows.
+
+    Args:
+      table: The table to describe.
+      sample_rows: Number of leading rows to include as a CSV sample.
+
+    Returns:
+      str: A compact, prompt-friendly description of the table.
+    """
+    columns = "\n".join(
+        f"  - {field.name}: {field.type}" for field in table.schema
+    )
+    sample = table_to_csv_bytes(table.slice(0, sample_rows)).decode("utf-8")
+    return (
+        f"{table.num_rows} rows x {table.num_columns} columns.\n"
+        f"Columns:\n{columns}\n"
+        f"First {min(sample_rows, table.num_rows)} rows (CSV):\n{sample}"
+    )
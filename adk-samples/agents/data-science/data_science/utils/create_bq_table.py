@@ -18,6 +18,8 @@ from google.cloud import bigquery
 from pathlib import Path
 from dotenv import load_dotenv
 
+from data_science.utils import bq_bulk_loader
+
 # Define the path to the .env file
 env_file_path = Path(__file__).parent.parent.parent / ".env"
 print(env_file_path)
@@ -26,7 +28,21 @@ print(env_file_path)
 load_dotenv(dotenv_path=env_file_path)
 
 
-def load_csv_to_bigquery(project_id, dataset_name, table_name, csv_filepath):
+# Explicit schema of the forecasting sticker sales tables. `date` is stored in
+# DD/MM/YYYY form and therefore kept as a STRING, as autodetection did.
+STICKER_SALES_SCHEMA = [
+    bigquery.SchemaField("id", "INTEGER"),
+    bigquery.SchemaField("date", "STRING"),
+    bigquery.SchemaField("country", "STRING"),
+    bigquery.SchemaField("store", "STRING"),
+    bigquery.SchemaField("product", "STRING"),
+    bigquery.SchemaField("num_sold", "INTEGER"),
+]
+
+
+def load_csv_to_bigquery(
+    project_id, dataset_name, table_name, csv_filepath, schema=None
+):
     """Loads a CSV file into a BigQuery table.
 
     Args:
@@ -34,28 +50,17 @@ def load_csv_to_bigquery(project_id, dataset_name, table_name, csv_filepath):
         dataset_name: The name of the BigQuery dataset.
         table_name: The name of the BigQuery table.
         csv_filepath: The path to the CSV file.
+        schema: Optional explicit table schema; inferred from the file if None.
     """
 
     client = bigquery.Client(project=project_id)
-
-    dataset_ref = client.dataset(dataset_name)
-    table_ref = dataset_ref.table(table_name)
-
-    job_config = bigquery.LoadJobConfig(
-        source_format=bigquery.SourceFormat.CSV,
-        skip_leading_rows=1,  # Skip the header row
-        autodetect=True,  # Automatically detect the schema
+    bq_bulk_loader.load_file(
+        client,
+        csv_filepath,
+        f"{project_id}.{dataset_name}.{table_name}",
+        schema=schema,
     )
 
-    with open(csv_filepath, "rb") as source_file:
-        job = client.load_table_from_file(
-            source_file, table_ref, job_config=job_config
-        )
-
-    job.result()  # Wait for the job to complete
-
-    print(f"Loaded {job.output_rows} rows into {dataset_name}.{table_name}")
-
 
 def create_dataset_if_not_exists(project_id, dataset_name):
     """Creates a BigQuery dataset if it does not already exist.
@@ -95,13 +100,22 @@ def main():
     print("Creating dataset.")
     create_dataset_if_not_exists(project_id, dataset_name)
 
-    # Load the train data
-    print("Loading train table.")
-    load_csv_to_bigquery(project_id, dataset_name, "train", train_csv_filepath)
-
-    # Load the test data
-    print("Loading test table.")
-    load_csv_to_bigquery(project_id, dataset_name, "test", test_csv_filepath)
+    # Load the train and test data, one parallel load job per table
+    print("Loading train and test tables.")
+    bq_bulk_loader.load_files(
+        bigquery.Client(project=project_id),
+        [
+            {
+                "source": csv_filepath,
+                "table_id": f"{project_id}.{dataset_name}.{table_name}",
+                "schema": STICKER_SALES_SCHEMA,
+            }
+            for table_name, csv_filepath in (
+                ("train", train_csv_filepath),
+                ("test", test_csv_filepath),
+            )
+        ],
+    )
 
 
 if __name__ == "__main__":
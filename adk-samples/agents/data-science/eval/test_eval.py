@@ -14,10 +14,16 @@
 
 from google.adk.evaluation.agent_evaluator import AgentEvaluator
 
+import json
 import os
 import pytest
 from dotenv import find_dotenv, load_dotenv
 
+SIMPLE_TEST_FILE = os.path.join(os.path.dirname(__file__), "eval_data/simple.test.json")
+SIMPLE_CASSETTE_FILE = os.path.join(
+    os.path.dirname(__file__), "eval_data/simple.cassette.json"
+)
+
 
 @pytest.fixture(scope="session", autouse=True)
 def load_env():
@@ -33,4 +39,56 @@ def test_eval_simple():
     )
 
 
+@pytest.mark.skipif(
+    os.getenv("LLM_CASSETTE_MODE", "").lower() != "record"
+    and not os.path.exists(SIMPLE_CASSETTE_FILE),
+    reason=(
+        "No recorded cassette. Record one with"
+        " `LLM_CASSETTE_MODE=record pytest eval -k replay`."
+    ),
+)
+def test_eval_simple_replay(monkeypatch):
+    """Replays the simple eval session offline from the recorded cassette.
+
+    With `LLM_CASSETTE_MODE=record`, runs live and records the cassette instead.
+    Prints the per-stage latencies at the end.
+    """
+    from google.adk.artifacts import InMemoryArtifactService
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+
+    from data_science.agent import root_agent
+    from data_science.utils.cassette import stage_timer
+
+    if os.getenv("LLM_CASSETTE_MODE", "").lower() != "record":
+        monkeypatch.setenv("LLM_CASSETTE_MODE", "replay")
+    monkeypatch.setenv("LLM_CASSETTE_PATH", SIMPLE_CASSETTE_FILE)
+    stage_timer.reset()
+
+    with open(SIMPLE_TEST_FILE, "r", encoding="utf-8") as f:
+        turns = json.load(f)
+
+    session_service = InMemorySessionService()
+    runner = Runner(
+        app_name="data_science",
+        agent=root_agent,
+        artifact_service=InMemoryArtifactService(),
+        session_service=session_service,
+    )
+    session = session_service.create_session(app_name="data_science", user_id="eval")
+    for turn in turns:
+        content = types.Content(role="user", parts=[types.Part(text=turn["query"])])
+        tool_names = []
+        response = ""
+        for event in runner.run(
+            user_id="eval", session_id=session.id, new_message=content
+        ):
+            tool_names += [call.name for call in event.get_function_calls()]
+            if event.is_final_response() and event.content and event.content.parts:
+                response = "".join(p.text for p in event.content.parts if p.text)
+        expected = [tool["tool_name"] for tool in turn["expected_tool_use"]]
+        assert tool_names == expected, turn["query"]
+        assert response, turn["query"]
 
+    print("\n" + stage_timer.format_report())
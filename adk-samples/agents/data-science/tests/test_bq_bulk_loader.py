@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the BigQuery bulk loader."""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+import pyarrow.parquet as pq
+from google.cloud import bigquery
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_science.utils import bq_bulk_loader
+
+TEST_CSV = os.path.join(
+    os.path.dirname(__file__), "..", "data_science", "utils", "data", "test.csv"
+)
+
+
+class _FakeJob:
+    def __init__(self, rows):
+        self.output_rows = rows
+
+    def result(self):
+        return self
+
+
+class _FakeClient:
+    """Records the Parquet payload and config of every load job."""
+
+    def __init__(self):
+        self.loads = {}
+        self._lock = threading.Lock()
+
+    def load_table_from_file(self, file_obj, table_id, job_config):
+        table = pq.read_table(io.BytesIO(file_obj.read()))
+        with self._lock:
+            self.loads[table_id] = (table, job_config)
+        return _FakeJob(table.num_rows)
+
+
+class BqBulkLoaderTest(unittest.TestCase):
+
+    def test_load_with_explicit_schema(self):
+        schema = [
+            bigquery.SchemaField("num_sold", "INTEGER"),
+            bigquery.SchemaField("id", "INTEGER"),
+            bigquery.SchemaField("country", "STRING"),
+        ]
+        client = _FakeClient()
+        result = bq_bulk_loader.load_file(client, TEST_CSV, "p.d.test", schema)
+        table, job_config = client.loads["p.d.test"]
+        self.assertEqual(result.rows, 440)
+        self.assertEqual(table.column_names, ["num_sold", "id", "country"])
+        self.assertEqual(job_config.source_format, bigquery.SourceFormat.PARQUET)
+        self.assertEqual([f.name for f in job_config.schema], table.column_names)
+
+    def test_inferred_schema_is_passed_explicitly(self):
+        client = _FakeClient()
+        bq_bulk_loader.load_file(client, TEST_CSV, "p.d.test")
+        _, job_config = client.loads["p.d.test"]
+        types = {f.name: f.field_type for f in job_config.schema}
+        self.assertEqual(types["id"], "INTEGER")
+        self.assertEqual(types["country"], "STRING")
+
+    def test_parquet_source_and_parallel_loads(self):
+        client = _FakeClient()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            parquet_path = os.path.join(tmp_dir, "test.parquet")
+            bq_bulk_loader.write_parquet(TEST_CSV, parquet_path)
+            results = bq_bulk_loader.load_files(
+                client,
+                [
+                    {"source": TEST_CSV, "table_id": "p.d.a"},
+                    {"source": parquet_path, "table_id": "p.d.b"},
+                ],
+            )
+        self.assertEqual([r.table_id for r in results], ["p.d.a", "p.d.b"])
+        self.assertEqual(
+            client.loads["p.d.a"][0].to_pylist(), client.loads["p.d.b"][0].to_pylist()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
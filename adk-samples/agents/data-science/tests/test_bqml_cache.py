@@ -0,0 +1,120 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the BQML model catalog and reference guide caches."""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_science.sub_agents.bqml.cache import ModelCatalog, RagResponseCache
+
+
+class _FakeModel:
+    def __init__(self, model_id):
+        self.model_id = model_id
+        self.model_type = "LINEAR_REG"
+
+
+class _FakeClient:
+    """Stands in for bigquery.Client in the model listings."""
+
+    def __init__(self):
+        self.calls = 0
+        self.models = [_FakeModel("m1")]
+
+    def list_models(self, dataset_id):
+        self.calls += 1
+        return list(self.models)
+
+
+class ModelCatalogTest(unittest.TestCase):
+
+    def test_models_are_cached_per_dataset(self):
+        client = _FakeClient()
+        catalog = ModelCatalog(ttl_secs=60)
+        first = catalog.list_models(client, "p.d1")
+        self.assertEqual(first, [{"name": "m1", "type": "LINEAR_REG"}])
+        catalog.list_models(client, "p.d1")
+        self.assertEqual(client.calls, 1)
+        catalog.list_models(client, "p.d2")
+        self.assertEqual(client.calls, 2)
+
+    def test_invalidate_refetches(self):
+        client = _FakeClient()
+        catalog = ModelCatalog(ttl_secs=60)
+        catalog.list_models(client, "p.d1")
+        client.models.append(_FakeModel("m2"))
+        catalog.invalidate()
+        self.assertEqual(len(catalog.list_models(client, "p.d1")), 2)
+        self.assertEqual(client.calls, 2)
+
+    def test_invalidation_during_a_fetch_is_not_overwritten(self):
+        catalog = ModelCatalog(ttl_secs=60)
+
+        class _CreatingClient(_FakeClient):
+            """A CREATE MODEL finishes while the stale list is fetched."""
+
+            def __init__(self, dataset_to_invalidate):
+                super().__init__()
+                self.dataset_to_invalidate = dataset_to_invalidate
+
+            def list_models(self, dataset_id):
+                stale = super().list_models(dataset_id)
+                if self.calls == 1:
+                    self.models.append(_FakeModel("m2"))
+                    catalog.invalidate(self.dataset_to_invalidate)
+                return stale
+
+        for dataset_to_invalidate in ("p.d1", None):
+            client = _CreatingClient(dataset_to_invalidate)
+            self.assertEqual(len(catalog.list_models(client, "p.d1")), 1)
+            self.assertEqual(len(catalog.list_models(client, "p.d1")), 2)
+            self.assertEqual(client.calls, 2)
+            catalog.invalidate()
+
+    def test_expired_entries_are_refetched(self):
+        client = _FakeClient()
+        catalog = ModelCatalog(ttl_secs=0)
+        catalog.list_models(client, "p.d1")
+        catalog.list_models(client, "p.d1")
+        self.assertEqual(client.calls, 2)
+
+
+class RagResponseCacheTest(unittest.TestCase):
+
+    def test_normalized_queries_share_a_retrieval(self):
+        queries = []
+        cache = RagResponseCache(ttl_secs=60, max_entries=10)
+        retrieve = lambda q: queries.append(q) or f"docs for {q}"
+        cache.get_or_retrieve("corpus", "CREATE MODEL options", retrieve)
+        response = cache.get_or_retrieve("corpus", " create  model OPTIONS ", retrieve)
+        self.assertEqual(response, "docs for CREATE MODEL options")
+        self.assertEqual(len(queries), 1)
+        cache.get_or_retrieve("other-corpus", "CREATE MODEL options", retrieve)
+        self.assertEqual(len(queries), 2)
+
+    def test_lru_eviction(self):
+        cache = RagResponseCache(ttl_secs=60, max_entries=2)
+        calls = []
+        retrieve = lambda q: calls.append(q) or q
+        for query in ("a", "b", "a", "c", "a", "b"):
+            cache.get_or_retrieve("corpus", query, retrieve)
+        self.assertEqual(calls, ["a", "b", "c", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
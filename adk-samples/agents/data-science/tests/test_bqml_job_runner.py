@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the non-blocking BQML job runner."""
+
+import asyncio
+import datetime
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_science.sub_agents.bqml import job_runner
+
+
+class _FakeJob:
+    """Stands in for bigquery.QueryJob; finishes after `polls_until_done`."""
+
+    def __init__(self, polls_until_done, age_secs=0.0, destination=None):
+        self.job_id = "job_1"
+        self.state = "PENDING"
+        self.error_result = None
+        self.destination = destination
+        self.created = datetime.datetime.now(
+            datetime.timezone.utc
+        ) - datetime.timedelta(seconds=age_secs)
+        self.reloads = 0
+        self.cancelled = False
+        self._polls_until_done = polls_until_done
+
+    def reload(self):
+        self.reloads += 1
+        if self.cancelled or self.reloads >= self._polls_until_done:
+            self.state = "DONE"
+        else:
+            self.state = "RUNNING"
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _FakeRow(dict):
+    pass
+
+
+class _FakeRowIterator:
+    def __init__(self, rows, page_size, page_token):
+        start = int(page_token or 0)
+        self._page = [_FakeRow(r) for r in rows[start : start + page_size]]
+        self.total_rows = len(rows)
+        end = start + page_size
+        self.next_page_token = str(end) if end < len(rows) else None
+        self.pages = iter([self._page])
+
+
+class _FakeClient:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def list_rows(self, table, page_size, page_token):
+        return _FakeRowIterator(self._rows, page_size, page_token)
+
+
+class BqmlJobRunnerTest(unittest.TestCase):
+
+    def test_wait_returns_running_after_budget(self):
+        job = _FakeJob(polls_until_done=100)
+        events = []
+        status = asyncio.run(
+            job_runner.wait_for_job(
+                job, wait_secs=0.05, poll_secs=0.01, on_status=events.append
+            )
+        )
+        self.assertEqual(status["state"], "RUNNING")
+        self.assertFalse(job.cancelled)
+        self.assertGreater(len(events), 1)
+
+    def test_wait_returns_done(self):
+        job = _FakeJob(polls_until_done=3)
+        status = asyncio.run(
+            job_runner.wait_for_job(job, wait_secs=5, poll_secs=0.01)
+        )
+        self.assertEqual(status["state"], "DONE")
+        self.assertEqual(job.reloads, 3)
+
+    def test_timeout_cancels_job(self):
+        job = _FakeJob(polls_until_done=100, age_secs=120)
+        status = asyncio.run(
+            job_runner.wait_for_job(job, wait_secs=5, timeout_secs=60)
+        )
+        self.assertTrue(job.cancelled)
+        self.assertEqual(status["state"], "CANCELLED")
+        self.assertIn("Timeout", status["error"])
+
+    def test_results_are_paged(self):
+        rows = [{"n": i, "at": datetime.date(2025, 1, 1)} for i in range(5)]
+        client = _FakeClient(rows)
+        job = _FakeJob(polls_until_done=1, destination="p.d.t")
+        first = asyncio.run(job_runner.fetch_results_page(client, job, page_size=2))
+        self.assertEqual([r["n"] for r in first["rows"]], [0, 1])
+        self.assertEqual(first["rows"][0]["at"], "2025-01-01")
+        self.assertEqual(first["total_rows"], 5)
+        last = asyncio.run(
+            job_runner.fetch_results_page(client, job, "4", page_size=2)
+        )
+        self.assertEqual([r["n"] for r in last["rows"]], [4])
+        self.assertIsNone(last["next_page_token"])
+
+    def test_ddl_job_has_no_rows(self):
+        job = _FakeJob(polls_until_done=1)
+        page = asyncio.run(job_runner.fetch_results_page(None, job))
+        self.assertEqual(page["rows"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the record/replay cassette."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import types as pytypes
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from data_science.utils import cassette
+
+
+class CassetteTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "cassette.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _use(self, mode):
+        return mock.patch.dict(
+            os.environ, {"LLM_CASSETTE_MODE": mode, "LLM_CASSETTE_PATH": self.path}
+        )
+
+    def test_off_mode_calls_through(self):
+        with mock.patch.dict(os.environ, {"LLM_CASSETTE_MODE": "off"}):
+            self.assertIsNone(cassette.get_cassette())
+            self.assertEqual(cassette.call("k", {"a": 1}, lambda: 42), 42)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_record_then_replay(self):
+        with self._use("record"):
+            cassette.call("sql_backend", {"sql": "SELECT 1"}, lambda: [{"x": 1}])
+        real_call = mock.Mock()
+        with self._use("replay"):
+            rows = cassette.call("sql_backend", {"sql": "SELECT 1"}, real_call)
+            with self.assertRaises(cassette.CassetteMiss):
+                cassette.call("sql_backend", {"sql": "SELECT 2"}, real_call)
+        self.assertEqual(rows, [{"x": 1}])
+        real_call.assert_not_called()
+
+    def test_recorded_errors_are_replayed(self):
+        def fail():
+            raise ValueError("Not found: Table p.d.missing")
+
+        with self._use("record"):
+            with self.assertRaises(ValueError):
+                cassette.call("sql_backend", {"sql": "bad"}, fail)
+        with self._use("replay"):
+            with self.assertRaisesRegex(cassette.RecordedError, "missing"):
+                cassette.call("sql_backend", {"sql": "bad"}, fail)
+
+    def test_todays_date_does_not_change_the_model_fingerprint(self):
+        def payload(today):
+            request = LlmRequest(
+                model="gemini",
+                config=types.GenerateContentConfig(
+                    system_instruction=f"Todays date: {today}\nSince 2024-01-01"
+                ),
+            )
+            context = pytypes.SimpleNamespace(agent_name="root")
+            return cassette._llm_request_payload(context, request)
+
+        self.assertEqual(
+            cassette.Cassette.fingerprint("agent_model", payload("2025-04-01")),
+            cassette.Cassette.fingerprint("agent_model", payload("2025-05-02")),
+        )
+        self.assertIn("Since 2024-01-01", payload("2025-04-01")["system_instruction"])
+
+    def test_sql_dates_change_the_fingerprint(self):
+        def payload(day):
+            return {"sql": f"SELECT * FROM t WHERE date = '{day}'"}
+
+        self.assertNotEqual(
+            cassette.Cassette.fingerprint("sql_backend", payload("2024-01-01")),
+            cassette.Cassette.fingerprint("sql_backend", payload("2024-02-01")),
+        )
+
+    def test_agent_model_callbacks(self):
+        def request(call_id):
+            part = types.Part(
+                function_response=types.FunctionResponse(
+                    id=call_id, name="call_db_agent", response={"result": "ok"}
+                )
+            )
+            return LlmRequest(
+                model="gemini", contents=[types.Content(role="user", parts=[part])]
+            )
+
+        response = LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="Canada")])
+        )
+        context = pytypes.SimpleNamespace(invocation_id="e-1", agent_name="root")
+        with self._use("record"):
+            self.assertIsNone(cassette.before_model_callback(context, request("a")))
+            self.assertIsNone(cassette.after_model_callback(context, response))
+        with self._use("replay"):
+            replayed = cassette.before_model_callback(context, request("b"))
+        self.assertEqual(replayed.content.parts[0].text, "Canada")
+
+
+class StageTimerTest(unittest.TestCase):
+
+    def test_sync_and_async_stages(self):
+        cassette.stage_timer.reset()
+
+        @cassette.timed_stage("validate")
+        def validate():
+            return "ok"
+
+        @cassette.timed_stage("ds_agent")
+        async def ds_agent():
+            return "done"
+
+        validate()
+        validate()
+        asyncio.run(ds_agent())
+        report = cassette.stage_timer.report()
+        self.assertEqual(report["validate"]["count"], 2)
+        self.assertEqual(report["ds_agent"]["count"], 1)
+        self.assertIn("validate", cassette.stage_timer.format_report())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the columnar query result handoff."""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_science.utils import columnar
+
+
+ROWS = [
+    {"country": "US", "year": 2024, "revenue": 10.5},
+    {"country": "DE", "year": 2024, "revenue": 7.25},
+    {"country": "FR", "year": 2023, "revenue": None},
+]
+
+
+class ColumnarTest(unittest.TestCase):
+
+    def test_parquet_round_trip(self):
+        table = columnar.rows_to_table(ROWS)
+        data = columnar.table_to_parquet_bytes(table)
+        self.assertEqual(columnar.parquet_bytes_to_table(data).to_pylist(), ROWS)
+
+    def test_csv_has_header_and_all_rows(self):
+        csv_text = columnar.table_to_csv_bytes(columnar.rows_to_table(ROWS)).decode()
+        lines = csv_text.strip().splitlines()
+        self.assertEqual(lines[0], '"country","year","revenue"')
+        self.assertEqual(len(lines), len(ROWS) + 1)
+
+    def test_summary_only_samples_rows(self):
+        rows = [{"id": i, "name": f"n{i}"} for i in range(100)]
+        summary = columnar.summarize_table(columnar.rows_to_table(rows), sample_rows=3)
+        self.assertIn("100 rows x 2 columns", summary)
+        self.assertIn("- id: int64", summary)
+        self.assertIn("n2", summary)
+        self.assertNotIn("n3", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the ChaseSQL context cache manager."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_science.sub_agents.bigquery.chase_sql import context_cache
+from data_science.sub_agents.bigquery.chase_sql.dc_prompt_template import (
+    DC_PROMPT_TEMPLATE,
+)
+from data_science.sub_agents.bigquery.chase_sql.qp_prompt_template import (
+    QP_PROMPT_TEMPLATE,
+)
+
+SCHEMA = "CREATE TABLE `p.d.t` (`a` INTEGER);"
+
+
+class _FakeCachedContent:
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.extended = 0
+
+
+class _FakeContextCacheManager(context_cache.ContextCacheManager):
+    """Keeps caches in memory instead of creating them on Vertex AI."""
+
+    def __init__(self, *args, fail=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail = fail
+        self.created = []
+
+    def _create(self, model_name, prefix):
+        if self.fail:
+            raise ValueError("Cached content is too small")
+        cached_content = _FakeCachedContent(prefix)
+        self.created.append(cached_content)
+        return cached_content
+
+    def _extend(self, cached_content):
+        cached_content.extended += 1
+
+
+class TestSplitPrompt(unittest.TestCase):
+
+    def test_prefix_and_question_give_the_full_prompt(self):
+        for template in (DC_PROMPT_TEMPLATE, QP_PROMPT_TEMPLATE):
+            prefix, question_template = context_cache.split_prompt(
+                template, SCHEMA, "my-project"
+            )
+            question_prompt = question_template.format(
+                QUESTION="How many rows?", BQ_PROJECT_ID="my-project"
+            )
+            self.assertEqual(
+                prefix + question_prompt,
+                template.format(
+                    SCHEMA=SCHEMA, QUESTION="How many rows?", BQ_PROJECT_ID="my-project"
+                ),
+            )
+            self.assertIn(SCHEMA, prefix)
+            self.assertNotIn("How many rows?", prefix)
+
+
+class TestContextCacheManager(unittest.TestCase):
+
+    def test_reuses_cache_for_same_prefix(self):
+        manager = _FakeContextCacheManager(ttl_secs=3600, refresh_secs=300)
+        first = manager.get("gemini", "dc", "prefix")
+        second = manager.get("gemini", "dc", "prefix")
+        self.assertIs(first, second)
+        self.assertEqual(len(manager.created), 1)
+        self.assertEqual(first.extended, 0)
+
+    def test_extends_cache_close_to_expiry(self):
+        manager = _FakeContextCacheManager(ttl_secs=3600, refresh_secs=300)
+        with mock.patch.object(context_cache.time, "monotonic", return_value=1000.0):
+            cached_content = manager.get("gemini", "dc", "prefix")
+        with mock.patch.object(context_cache.time, "monotonic", return_value=4400.0):
+            self.assertIs(manager.get("gemini", "dc", "prefix"), cached_content)
+        self.assertEqual(cached_content.extended, 1)
+        self.assertEqual(len(manager.created), 1)
+
+    def test_schemas_used_in_turn_keep_their_caches(self):
+        manager = _FakeContextCacheManager()
+        first = manager.get("gemini", "dc", "prefix with schema v1")
+        second = manager.get("gemini", "dc", "prefix with schema v2")
+        self.assertIsNot(first, second)
+        self.assertEqual(second.prefix, "prefix with schema v2")
+        self.assertIs(manager.get("gemini", "dc", "prefix with schema v1"), first)
+        self.assertIs(manager.get("gemini", "dc", "prefix with schema v2"), second)
+        self.assertEqual(len(manager.created), 2)
+
+    def test_least_recently_used_cache_is_evicted(self):
+        manager = _FakeContextCacheManager(max_entries=2)
+        first = manager.get("gemini", "dc", "v1")
+        manager.get("gemini", "dc", "v2")
+        manager.get("gemini", "dc", "v1")
+        manager.get("gemini", "dc", "v3")
+        self.assertIs(manager.get("gemini", "dc", "v1"), first)
+        manager.get("gemini", "dc", "v2")
+        self.assertEqual(
+            [c.prefix for c in manager.created], ["v1", "v2", "v3", "v2"]
+        )
+
+    def test_templates_have_separate_caches(self):
+        manager = _FakeContextCacheManager()
+        dc = manager.get("gemini", "dc", "prefix")
+        qp = manager.get("gemini", "qp", "prefix")
+        self.assertIsNot(dc, qp)
+
+    def test_failed_creation_is_not_retried_on_every_call(self):
+        manager = _FakeContextCacheManager(fail=True)
+        self.assertIsNone(manager.get("gemini", "dc", "prefix"))
+        manager.fail = False
+        self.assertIsNone(manager.get("gemini", "dc", "prefix"))
+        self.assertEqual(manager.created, [])
+
+    def test_disabled_while_cassette_is_active(self):
+        with mock.patch.dict(os.environ, {"LLM_CASSETTE_MODE": "replay"}):
+            self.assertIsNone(context_cache.get_context_cache_manager())
+
+
+if __name__ == "__main__":
+    unittest.main()
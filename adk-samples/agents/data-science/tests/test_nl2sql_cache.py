@@ -0,0 +1,91 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the NL2SQL question cache."""
+
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_science.sub_agents.bigquery.nl2sql_cache import (
+    Nl2SqlCache,
+    normalize_question,
+)
+
+SCHEMA = "CREATE OR REPLACE TABLE `p.d.train` (\n  `country` STRING\n);"
+SQL = "SELECT DISTINCT country FROM `p.d.train`"
+
+
+class TestNl2SqlCache(unittest.TestCase):
+    """Test cases for the NL2SQL question cache."""
+
+    def test_normalize_question(self):
+        self.assertEqual(
+            normalize_question("  What countries, exist?? Top 2.5% "),
+            "what countries exist top 2.5",
+        )
+
+    def test_exact_match_after_normalization(self):
+        cache = Nl2SqlCache()
+        cache.store("What countries exist?", SCHEMA, SQL)
+        self.assertEqual(cache.lookup("what countries  exist", SCHEMA), SQL)
+
+    def test_schema_and_namespace_are_part_of_the_key(self):
+        cache = Nl2SqlCache()
+        cache.store("What countries exist?", SCHEMA, SQL, namespace="baseline")
+        self.assertIsNone(cache.lookup("What countries exist?", SCHEMA + " "))
+        self.assertIsNone(
+            cache.lookup("What countries exist?", SCHEMA, namespace="chase-dc")
+        )
+
+    def test_similarity_lookup_requires_threshold(self):
+        cache = Nl2SqlCache(similarity_threshold=None)
+        cache.store("What countries exist in the train table?", SCHEMA, SQL)
+        self.assertIsNone(
+            cache.lookup("Which countries exist in the train table", SCHEMA)
+        )
+
+        cache = Nl2SqlCache(similarity_threshold=0.8)
+        cache.store("What countries exist in the train table?", SCHEMA, SQL)
+        self.assertEqual(
+            cache.lookup("Which countries exist in the train table", SCHEMA), SQL
+        )
+
+    def test_similarity_lookup_never_changes_numbers(self):
+        cache = Nl2SqlCache(similarity_threshold=0.5)
+        cache.store("Top 5 products by sales", SCHEMA, SQL + " LIMIT 5")
+        self.assertIsNone(cache.lookup("Top 10 products by sales", SCHEMA))
+
+    def test_invalid_sql_is_not_cached(self):
+        cache = Nl2SqlCache()
+        cache.store("What countries exist?", SCHEMA, "Timeout")
+        self.assertIsNone(cache.lookup("What countries exist?", SCHEMA))
+
+    def test_lru_eviction(self):
+        cache = Nl2SqlCache(max_entries=1)
+        cache.store("first question", SCHEMA, SQL)
+        cache.store("second question", SCHEMA, SQL)
+        self.assertIsNone(cache.lookup("first question", SCHEMA))
+        self.assertEqual(cache.lookup("second question", SCHEMA), SQL)
+
+    def test_expired_entries_are_not_served(self):
+        cache = Nl2SqlCache(ttl_secs=-1)
+        cache.store("What countries exist?", SCHEMA, SQL)
+        self.assertIsNone(cache.lookup("What countries exist?", SCHEMA))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the BigQuery query result cache."""
+
+import datetime
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_science.sub_agents.bigquery.query_cache import (
+    QueryResultCache,
+    normalize_sql,
+    referenced_tables,
+)
+
+
+class _FakeTable:
+    def __init__(self, modified):
+        self.modified = modified
+
+
+class _FakeClient:
+    """Stands in for bigquery.Client in the metadata lookups."""
+
+    def __init__(self):
+        self.modified = datetime.datetime(2025, 1, 1)
+        self.get_table_calls = 0
+
+    def get_table(self, table_name):
+        self.get_table_calls += 1
+        return _FakeTable(self.modified)
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test cases for the BigQuery query result cache."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.client = _FakeClient()
+        self.cache = QueryResultCache(
+            cache_dir=self.cache_dir, fingerprint_ttl_secs=0
+        )
+
+    def test_normalize_sql_ignores_case_whitespace_and_comments(self):
+        self.assertEqual(
+            normalize_sql("select  a FROM `p.d.t` -- note\n limit 10"),
+            normalize_sql("SELECT a\nFROM `p.d.t`\nLIMIT 10"),
+        )
+
+    def test_referenced_tables_skips_ctes_and_qualifies_names(self):
+        sql = (
+            "WITH x AS (SELECT * FROM train) "
+            "SELECT * FROM x JOIN `p.d.test` USING (id)"
+        )
+        self.assertEqual(
+            referenced_tables(sql, default_project="p", default_dataset="d"),
+            ["p.d.test", "p.d.train"],
+        )
+
+    def test_round_trip(self):
+        rows = [
+            {"country": "Canada", "num_sold": 694},
+            {"country": "Kenya", "num_sold": None},
+        ]
+        key = self.cache.cache_key("SELECT * FROM `p.d.t`", self.client)
+        self.assertIsNone(self.cache.get(key))
+        self.assertTrue(self.cache.put(key, rows))
+        self.assertEqual(self.cache.get(key), rows)
+
+    def test_table_modification_changes_key(self):
+        sql = "SELECT * FROM `p.d.t`"
+        key = self.cache.cache_key(sql, self.client)
+        self.client.modified = datetime.datetime(2025, 1, 2)
+        self.assertNotEqual(key, self.cache.cache_key(sql, self.client))
+
+    def test_fingerprint_is_reused_within_ttl(self):
+        cache = QueryResultCache(
+            cache_dir=self.cache_dir, fingerprint_ttl_secs=60
+        )
+        cache.cache_key("SELECT * FROM `p.d.t`", self.client)
+        cache.cache_key("SELECT * FROM `p.d.t`", self.client)
+        self.assertEqual(self.client.get_table_calls, 1)
+
+    def test_eviction_keeps_cache_within_budget(self):
+        cache = QueryResultCache(cache_dir=self.cache_dir, max_bytes=1)
+        cache.put("a", [{"x": 1}])
+        cache.put("b", [{"x": 2}])
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+class _FailingCache:
+    """Query cache whose writes fail, as on a full or read-only disk."""
+
+    def cache_key(self, sql, client, default_project=None, default_dataset=None):
+        return "key"
+
+    def get(self, key):
+        return None
+
+    def put(self, key, rows):
+        raise OSError("No space left on device")
+
+
+class _FakeBackend:
+    name = "fake"
+    supports_result_cache = True
+
+    def execute(self, sql, max_rows):
+        return [{"x": 1}]
+
+
+class TestRunBigQueryValidationCacheWrite(unittest.TestCase):
+    """A failing cache write does not turn a valid query into an error."""
+
+    def test_cache_write_failure_keeps_result(self):
+        from data_science.sub_agents.bigquery import tools
+
+        tool_context = mock.MagicMock()
+        tool_context.state = {}
+        with mock.patch.object(
+            tools, "get_sql_backend", return_value=_FakeBackend()
+        ), mock.patch.object(
+            tools, "get_query_cache", return_value=_FailingCache()
+        ), mock.patch.object(
+            tools, "get_bq_client"
+        ):
+            result = tools.run_bigquery_validation(
+                "SELECT x FROM t", tool_context
+            )
+
+        self.assertEqual(result["query_result"], [{"x": 1}])
+        self.assertIsNone(result["error_message"])
+        self.assertEqual(result["cache_status"], "miss")
+
+
+if __name__ == "__main__":
+    unittest.main()
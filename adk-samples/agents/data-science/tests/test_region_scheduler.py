@@ -0,0 +1,132 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the Gemini region scheduler and failover."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from google.api_core import exceptions as api_exceptions
+
+from data_science.sub_agents.bigquery.chase_sql import llm_utils
+from data_science.sub_agents.bigquery.chase_sql.region_scheduler import (
+    RegionScheduler,
+)
+
+REGIONS = ["us-central1", "us-east4", "europe-west4"]
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeRegionalModel:
+    def __init__(self, region, quota_exhausted):
+        self.region = region
+        self.quota_exhausted = quota_exhausted
+
+    def generate_content(self, prompt, **kwargs):
+        if self.region in self.quota_exhausted:
+            raise api_exceptions.ResourceExhausted("429 Quota exceeded")
+        return _FakeResponse(f"{self.region}: {prompt}")
+
+
+class TestRegionScheduler(unittest.TestCase):
+
+    def test_spreads_concurrent_calls_across_regions(self):
+        scheduler = RegionScheduler(REGIONS)
+        regions = [scheduler.acquire() for _ in REGIONS]
+        self.assertCountEqual(regions, REGIONS)
+
+    def test_prefers_the_fastest_region(self):
+        scheduler = RegionScheduler(REGIONS, alpha=0.5)
+        for region, latency in zip(REGIONS, (2.0, 0.5, 4.0)):
+            scheduler.release(
+                scheduler.acquire(exclude=set(REGIONS) - {region}), latency
+            )
+        self.assertEqual(scheduler.acquire(), "us-east4")
+
+    def test_quota_error_puts_region_in_cooldown(self):
+        scheduler = RegionScheduler(REGIONS, cooldown_secs=60)
+        for region in REGIONS:
+            scheduler.release(
+                scheduler.acquire(exclude=set(REGIONS) - {region}), 1.0
+            )
+        region = scheduler.acquire()
+        scheduler.release(region, 0.1, api_exceptions.ResourceExhausted("429"))
+        picks = set()
+        for _ in range(10):
+            picked = scheduler.acquire()
+            picks.add(picked)
+            scheduler.release(picked, 1.0)
+        self.assertNotIn(region, picks)
+        self.assertGreater(scheduler.snapshot()[region]["error_ewma"], 0)
+
+    def test_all_regions_cooling_down_still_returns_a_region(self):
+        scheduler = RegionScheduler(REGIONS[:1], cooldown_secs=60)
+        region = scheduler.acquire()
+        scheduler.release(region, 0.1, api_exceptions.ResourceExhausted("429"))
+        self.assertEqual(scheduler.acquire(), region)
+
+
+class TestGeminiModelFailover(unittest.TestCase):
+
+    def _model(self, scheduler, quota_exhausted):
+        with mock.patch.object(
+            llm_utils.region_scheduler,
+            "get_region_scheduler",
+            return_value=scheduler,
+        ):
+            model = llm_utils.GeminiModel(
+                model_name="gemini-2.0-flash-001", distribute_requests=True
+            )
+        model._regional_model = lambda region: _FakeRegionalModel(
+            region, quota_exhausted
+        )
+        return model
+
+    def test_fails_over_to_another_region_on_quota_error(self):
+        scheduler = RegionScheduler(REGIONS)
+        # Make the exhausted region look like the best one.
+        for region, latency in zip(REGIONS, (0.01, 1.0, 1.0)):
+            scheduler.release(
+                scheduler.acquire(exclude=set(REGIONS) - {region}), latency
+            )
+        model = self._model(scheduler, quota_exhausted={"us-central1"})
+        with mock.patch.object(llm_utils.time, "sleep") as sleep:
+            response = model.call("hello")
+        sleep.assert_not_called()
+        self.assertNotEqual(response.split(":")[0], "us-central1")
+        self.assertEqual(scheduler.snapshot()["us-central1"]["errors"], 1)
+
+    def test_other_errors_are_not_failed_over(self):
+        scheduler = RegionScheduler(REGIONS)
+        model = self._model(scheduler, quota_exhausted=set())
+        model._regional_model = lambda region: mock.Mock(
+            generate_content=mock.Mock(side_effect=ValueError("bad request"))
+        )
+        with self.assertRaises(ValueError):
+            model._generate_content("hello")
+        self.assertEqual(
+            sum(stats["errors"] for stats in scheduler.snapshot().values()), 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
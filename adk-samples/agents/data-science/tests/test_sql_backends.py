@@ -0,0 +1,90 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the local DuckDB SQL backend."""
+
+import importlib.util
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_science.sub_agents.bigquery import backends
+from data_science.sub_agents.bigquery.chase_sql.sql_postprocessor.sql_translator import (
+    DuckDbSqlTranslator,
+    SqlTranslator,
+)
+
+
+class DuckDbSqlTranslatorTest(unittest.TestCase):
+
+    def test_table_references_are_unqualified(self):
+        sql = DuckDbSqlTranslator.transpile(
+            "SELECT country, COUNT(*) AS n FROM `p.d.test` GROUP BY country"
+        )
+        self.assertNotIn("p.d", sql)
+        self.assertIn('FROM "test"', sql)
+
+    def test_base_translator_is_unchanged(self):
+        self.assertEqual(
+            SqlTranslator.transpile("SELECT a FROM t LIMIT 5"),
+            "SELECT a FROM t LIMIT 5",
+        )
+
+
+class SqlBackendTest(unittest.TestCase):
+
+    def test_incomplete_backend_cannot_be_constructed(self):
+        class NoExecuteBackend(backends.SqlBackend):
+            def get_schema_ddl(self):
+                return ""
+
+        with self.assertRaises(TypeError):
+            NoExecuteBackend()
+
+
+@unittest.skipUnless(importlib.util.find_spec("duckdb"), "duckdb is not installed")
+class DuckDbBackendTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.backend = backends.DuckDbBackend(
+            [backends.DEFAULT_DUCKDB_DATA_FILES], project_id="p", dataset_id="d"
+        )
+
+    def test_schema_ddl_uses_bigquery_names(self):
+        ddl = self.backend.get_schema_ddl()
+        self.assertIn("CREATE OR REPLACE TABLE `p.d.test`", ddl)
+        self.assertIn("`country` STRING", ddl)
+        self.assertIn("INSERT INTO `p.d.test` VALUES", ddl)
+        schema = SqlTranslator.rewrite_schema_for_sqlglot(ddl)
+        self.assertIn("num_sold", schema["p"]["d"]["test"])
+
+    def test_executes_bigquery_sql(self):
+        rows = self.backend.execute(
+            "SELECT country, SUM(num_sold) AS total FROM `p.d.test`"
+            " GROUP BY country ORDER BY country LIMIT 2",
+            max_rows=80,
+        )
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(set(rows[0]), {"country", "total"})
+
+    def test_max_rows(self):
+        rows = self.backend.execute("SELECT * FROM `p.d.test`", max_rows=3)
+        self.assertEqual(len(rows), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
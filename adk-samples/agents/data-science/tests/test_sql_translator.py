@@ -0,0 +1,91 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the ChaseSQL SQL translator."""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_science.sub_agents.bigquery.chase_sql.sql_postprocessor.sql_translator import (
+    SqlTranslator,
+)
+
+DDL_SCHEMA = """CREATE OR REPLACE TABLE `p.d.train` (
+  `id` INTEGER,
+  `country` STRING,
+  `num_sold` FLOAT
+);
+
+-- Example values for table `p.d.train`:
+INSERT INTO `p.d.train` VALUES
+(1,'Canada',694);
+
+"""
+
+
+class TestSqlTranslator(unittest.TestCase):
+    """Test cases for the ChaseSQL SQL translator."""
+
+    def setUp(self):
+        SqlTranslator._schema_cache.clear()
+        self.translator = SqlTranslator(
+            model=mock.Mock(),
+            process_input_errors=True,
+            process_tool_output_errors=True,
+        )
+
+    def test_ddl_schema_is_parsed_once(self):
+        with mock.patch.object(
+            SqlTranslator,
+            "extract_schema_from_ddls",
+            wraps=SqlTranslator.extract_schema_from_ddls,
+        ) as extract:
+            for _ in range(3):
+                self.translator.translate(
+                    "SELECT country FROM train",
+                    db="d",
+                    catalog="p",
+                    ddl_schema=DDL_SCHEMA,
+                )
+        self.assertEqual(extract.call_count, 1)
+
+    def test_cached_schema_still_detects_errors(self):
+        _, mapping_schema = SqlTranslator.get_sqlglot_schema(DDL_SCHEMA)
+        errors, _ = SqlTranslator._check_for_errors(
+            "SELECT missing_column FROM train",
+            sql_dialect="bigquery",
+            db="d",
+            catalog="p",
+            schema_dict=mapping_schema,
+        )
+        self.assertIn("missing_column", errors)
+
+    def test_valid_query_is_qualified(self):
+        errors, sql = SqlTranslator._check_for_errors(
+            "SELECT country FROM train",
+            sql_dialect="bigquery",
+            db="d",
+            catalog="p",
+            schema_dict=SqlTranslator.get_sqlglot_schema(DDL_SCHEMA)[1],
+        )
+        self.assertIsNone(errors)
+        self.assertIn("`p`.`d`.`train`", sql)
+
+
+if __name__ == "__main__":
+    unittest.main()
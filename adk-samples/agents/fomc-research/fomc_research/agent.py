@@ -20,7 +20,10 @@ import warnings
 from google.adk.agents import Agent
 
 from . import MODEL, root_agent_prompt
-from .shared_libraries.callbacks import rate_limit_callback
+from .shared_libraries.callbacks import (
+    rate_limit_callback,
+    rate_limited_model,
+)
 from .sub_agents.analysis_agent import AnalysisAgent
 from .sub_agents.research_agent import ResearchAgent
 from .sub_agents.retrieve_meeting_data_agent import RetrieveMeetingDataAgent
@@ -33,7 +36,7 @@ logger.debug("Using MODEL: %s", MODEL)
 
 
 root_agent = Agent(
-    model=MODEL,
+    model=rate_limited_model(MODEL),
     name="root_agent",
     description=(
         "Use tools and other agents provided to generate an analysis report"
@@ -15,18 +15,39 @@
 """Callback functions for FOMC Research Agent."""
 
 import logging
-import time
+import os
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmRequest
 
+from . import rate_limiter
+
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
 # Adjust these values to limit the rate at which the agent
 # queries the LLM API.
 RATE_LIMIT_SECS = 60
+# Requests per window allowed to one session.
 RPM_QUOTA = 1000
+# Requests per window shared by all sessions, e.g. the project's API quota.
+SHARED_RPM_QUOTA = int(os.getenv("GOOGLE_GENAI_FOMC_AGENT_RPM_QUOTA", 1000))
+# Set to share the quota between the worker processes of a host.
+RATE_LIMIT_LOCK_FILE = os.getenv("GOOGLE_GENAI_FOMC_AGENT_RATE_LIMIT_FILE")
+
+
+def rate_limited_model(model: str) -> rate_limiter.RateLimitedGemini:
+    """Returns the model, waiting for the rate limits before each request.
+
+    All agents using the same model draw from one shared bucket.
+    """
+    return rate_limiter.RateLimitedGemini(
+        model=model,
+        scope=os.getenv("GOOGLE_CLOUD_PROJECT", ""),
+        quota=SHARED_RPM_QUOTA,
+        window_secs=RATE_LIMIT_SECS,
+        lock_file=RATE_LIMIT_LOCK_FILE,
+    )
 
 
 def rate_limit_callback(
@@ -35,40 +56,15 @@ def rate_limit_callback(
     # pylint: disable=unused-argument
     """Callback function that implements a query rate limit.
 
+    Takes a token from the session's bucket. The model returned by
+    `rate_limited_model` waits for it, and for the shared quota, without
+    blocking the event loop.
+
     Args:
       callback_context: A CallbackContext object representing the active
               callback context.
       llm_request: A LlmRequest object representing the active LLM request.
     """
-    now = time.time()
-    if "timer_start" not in callback_context.state:
-        callback_context.state["timer_start"] = now
-        callback_context.state["request_count"] = 1
-        logger.debug(
-            "rate_limit_callback [timestamp: %i, req_count: 1, "
-            "elapsed_secs: 0]",
-            now,
-        )
-        return
-
-    request_count = callback_context.state["request_count"] + 1
-    elapsed_secs = now - callback_context.state["timer_start"]
-    logger.debug(
-        "rate_limit_callback [timestamp: %i, request_count: %i,"
-        " elapsed_secs: %i]",
-        now,
-        request_count,
-        elapsed_secs,
+    rate_limiter.reserve_session_token(
+        callback_context.state, RPM_QUOTA, RATE_LIMIT_SECS
     )
-
-    if request_count > RPM_QUOTA:
-        delay = RATE_LIMIT_SECS - elapsed_secs + 1
-        if delay > 0:
-            logger.debug("Sleeping for %i seconds", delay)
-            time.sleep(delay)
-        callback_context.state["timer_start"] = now
-        callback_context.state["request_count"] = 1
-    else:
-        callback_context.state["request_count"] = request_count
-
-    return
@@ -0,0 +1,305 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""On-disk HTTP cache for the documents fetched from the Fed website.
+
+Every document is stored gzip-compressed under
+`GOOGLE_GENAI_FOMC_AGENT_DOCUMENT_CACHE_DIR` with its ETag and Last-Modified
+headers. Callers choose how old a cached copy may be: published statements
+and transcripts never change, so they are served from disk indefinitely,
+while pages such as the meeting calendar are revalidated with a conditional
+request that normally returns an empty 304 response. Text extracted from a
+document is cached by the SHA-256 of its content, so a document is parsed at
+most once. Concurrent requests for the same URL share one download.
+"""
+
+import concurrent.futures
+import dataclasses
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_CACHE_DIR = os.path.expanduser(
+    os.getenv(
+        "GOOGLE_GENAI_FOMC_AGENT_DOCUMENT_CACHE_DIR",
+        "~/.cache/fomc_research/documents",
+    )
+)
+HTTP_POOL_SIZE = 8
+HTTP_TIMEOUT_SECS = 10
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Returns the shared HTTP session, which keeps connections alive."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": "Mozilla/5.0"})
+            _http_session = session
+        return _http_session
+
+
+@dataclasses.dataclass
+class Document:
+    """A fetched document and its validators."""
+
+    url: str
+    content: bytes
+    content_hash: str
+    content_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+    from_cache: bool = False
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class DocumentCache:
+    """HTTP GET with an on-disk cache, revalidation and request coalescing.
+
+    Documents are still served when the cache directory cannot be created
+    or written to; they are just not kept on disk.
+
+    Attributes:
+      cache_dir: Directory of the cache files; None keeps nothing on disk.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = DOCUMENT_CACHE_DIR,
+        session_factory: Callable[[], requests.Session] = get_http_session,
+    ):
+        self.cache_dir = cache_dir or None
+        self._session_factory = session_factory
+        self._in_flight: dict[tuple[str, str], concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        if self.cache_dir:
+            try:
+                os.makedirs(
+                    os.path.join(self.cache_dir, "text"), exist_ok=True
+                )
+            except OSError as e:
+                logger.warning(
+                    "Cannot create document cache %s, not caching: %s",
+                    self.cache_dir,
+                    e,
+                )
+                self.cache_dir = None
+
+    def _coalesce(self, key: tuple[str, str], func: Callable[[], object]):
+        """Runs `func` once for all concurrent callers with the same key."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._in_flight[key] = future
+        if not owner:
+            return future.result()
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _base_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    def _load(self, url: str) -> Optional[Document]:
+        if not self.cache_dir:
+            return None
+        base_path = self._base_path(url)
+        try:
+            with open(f"{base_path}.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with gzip.open(f"{base_path}.body.gz", "rb") as f:
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return Document(content=content, from_cache=True, **meta)
+
+    def _store(self, document: Document, body: bool = True) -> None:
+        if not self.cache_dir:
+            return
+        base_path = self._base_path(document.url)
+        meta = dataclasses.asdict(document)
+        del meta["content"], meta["from_cache"]
+        # The body is written first, so metadata never points at a missing
+        # or older body.
+        try:
+            if body:
+                _write_atomic(
+                    f"{base_path}.body.gz", gzip.compress(document.content)
+                )
+            _write_atomic(
+                f"{base_path}.json", json.dumps(meta).encode("utf-8")
+            )
+        except OSError as e:
+            logger.warning("Could not cache %s: %s", document.url, e)
+
+    def _fetch(self, url: str, max_age_secs: Optional[float]) -> Document:
+        cached = self._load(url)
+        now = time.time()
+        if cached is not None and (
+            max_age_secs is None or now - cached.fetched_at < max_age_secs
+        ):
+            logger.debug("Serving %s from the document cache", url)
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        try:
+            response = self._session_factory().get(
+                url, headers=headers, timeout=HTTP_TIMEOUT_SECS
+            )
+            if response.status_code == 304 and cached is not None:
+                logger.debug("%s not modified", url)
+                cached.fetched_at = now
+                self._store(cached, body=False)
+                return cached
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if cached is None:
+                raise
+            logger.warning(
+                "Revalidating %s failed, using cached copy: %s", url, e
+            )
+            return cached
+
+        logger.info("Downloaded %s", url)
+        document = Document(
+            url=url,
+            content=response.content,
+            content_hash=hashlib.sha256(response.content).hexdigest(),
+            content_type=response.headers.get("Content-Type"),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=now,
+        )
+        self._store(document)
+        return document
+
+    def fetch(self, url: str, max_age_secs: Optional[float] = None) -> Document:
+        """Returns the document at `url`, from disk when possible.
+
+        Args:
+          url: The URL to fetch.
+          max_age_secs: Age after which a cached copy is revalidated; None
+            serves a cached copy forever and 0 always revalidates.
+
+        Returns:
+          The document.
+
+        Raises:
+          requests.exceptions.RequestException: If the download failed and
+            there is no cached copy.
+        """
+        return self._coalesce(
+            ("fetch", url), lambda: self._fetch(url, max_age_secs)
+        )
+
+    def _text_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, "text", f"{content_hash}.txt.gz")
+
+    def fetch_text(
+        self,
+        url: str,
+        extract: Callable[[bytes], Optional[str]],
+        max_age_secs: Optional[float] = None,
+    ) -> Optional[str]:
+        """Returns the text of the document at `url`, extracting it once.
+
+        Args:
+          url: The URL to fetch.
+          extract: Turns the document bytes into text, or returns None.
+          max_age_secs: See `fetch`.
+
+        Returns:
+          The extracted text, or None if the download or extraction failed.
+        """
+        try:
+            document = self.fetch(url, max_age_secs)
+        except requests.exceptions.RequestException as e:
+            logger.error("Error downloading file from URL: %s", e)
+            return None
+
+        def _extract() -> Optional[str]:
+            if self.cache_dir:
+                text_path = self._text_path(document.content_hash)
+                try:
+                    with gzip.open(text_path, "rt", encoding="utf-8") as f:
+                        return f.read()
+                except OSError:
+                    pass
+            text = extract(document.content)
+            if text is not None and self.cache_dir:
+                try:
+                    _write_atomic(
+                        text_path, gzip.compress(text.encode("utf-8"))
+                    )
+                except OSError as e:
+                    logger.warning("Could not cache text of %s: %s", url, e)
+            return text
+
+        return self._coalesce(("text", document.content_hash), _extract)
+
+
+_document_cache = None
+_document_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> DocumentCache:
+    """Returns the shared document cache."""
+    global _document_cache
+    with _document_cache_lock:
+        if _document_cache is None:
+            _document_cache = DocumentCache(DOCUMENT_CACHE_DIR)
+        return _document_cache
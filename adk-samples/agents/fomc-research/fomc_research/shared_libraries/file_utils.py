@@ -14,94 +14,120 @@
 
 """File-related utility functions for fed_research_agent."""
 
-import base64
-import binascii
+import concurrent.futures
+import concurrent.futures.process
 import io
 import logging
-import mimetypes
+import os
+import threading
 from collections.abc import Sequence
+from typing import Optional
 
-import diff_match_patch as dmp
 import pdfplumber
-import requests
 from absl import app
 from google.adk.tools import ToolContext
-from google.genai.types import Blob, Part
+from google.genai.types import Part
+
+from . import document_cache, redline
 
 logger = logging.getLogger(__name__)
 
+# PDFs with fewer pages are extracted in-process; spreading a short statement
+# across processes costs more than it saves.
+PDF_PARALLEL_MIN_PAGES = 8
+PDF_MAX_WORKERS = min(4, os.cpu_count() or 1)
 
-def download_file_from_url(
-    url: str, output_filename: str, tool_context: ToolContext
-) -> str:
-    """Downloads a file from a URL and stores it in an artifact.
+_pdf_executor = None
+_pdf_executor_lock = threading.Lock()
 
-    Args:
-      url: The URL to retrieve the file from.
-      output_filename: The name of the artifact to store the file in.
-      tool_context: The tool context.
 
-    Returns:
-      The name of the artifact.
-    """
-    logger.info("Downloading %s to %s", url, output_filename)
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+def _get_pdf_executor() -> concurrent.futures.ProcessPoolExecutor:
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is None:
+            _pdf_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=PDF_MAX_WORKERS
+            )
+        return _pdf_executor
 
-        file_bytes = base64.b64encode(response.content)
-        mime_type = response.headers.get(
-            "Content-Type", mimetypes.guess_type(url)
+
+def _extract_pages_text(pdf_bytes: bytes, start: int, end: int) -> str:
+    """Extracts the text of pages [start, end) of a PDF."""
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        return "".join(
+            page.extract_text() or "" for page in pdf.pages[start:end]
         )
-        artifact = Part(inline_data=Blob(data=file_bytes, mime_type=mime_type))
-        tool_context.save_artifact(filename=output_filename, artifact=artifact)
-        logger.info("Downloaded %s to artifact %s", url, output_filename)
-        return output_filename
 
-    except requests.exceptions.RequestException as e:
-        logger.error("Error downloading file from URL: %s", e)
-        return None
 
+def _reset_pdf_executor(executor: concurrent.futures.Executor) -> None:
+    """Drops a broken pool, so the next PDF starts a new one."""
+    global _pdf_executor
+    with _pdf_executor_lock:
+        if _pdf_executor is executor:
+            _pdf_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
 
-def extract_text_from_pdf_artifact(
-    pdf_path: str, tool_context: ToolContext
-) -> str:
-    """Extracts text from a PDF file stored in an artifact"""
-    pdf_artifact = tool_context.load_artifact(pdf_path)
+
+def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> Optional[str]:
+    """Extracts the text of a PDF, splitting long PDFs across processes.
+
+    If the worker processes fail, the text is extracted in this process.
+
+    Returns:
+      The text of all pages, or None if the PDF cannot be read.
+    """
+    try:
+        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+            num_pages = len(pdf.pages)
+            if num_pages < PDF_PARALLEL_MIN_PAGES or PDF_MAX_WORKERS < 2:
+                return "".join(page.extract_text() or "" for page in pdf.pages)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.error("Error reading PDF: %s", e)
+        return None
+
+    chunk = -(-num_pages // PDF_MAX_WORKERS)
+    executor = _get_pdf_executor()
     try:
-        with io.BytesIO(
-            base64.b64decode(pdf_artifact.inline_data.data)
-        ) as pdf_file_obj:
-            pdf_text = ""
-            with pdfplumber.open(pdf_file_obj) as pdf:
-                for page in pdf.pages:
-                    pdf_text += page.extract_text()
-            return pdf_text
-    except binascii.Error as e:
-        logger.error("Error decoding PDF: %s", e)
+        futures = [
+            executor.submit(
+                _extract_pages_text, pdf_bytes, start, start + chunk
+            )
+            for start in range(0, num_pages, chunk)
+        ]
+        return "".join(future.result() for future in futures)
+    except concurrent.futures.process.BrokenProcessPool as e:
+        logger.warning("PDF worker pool failed, extracting in process: %s", e)
+        _reset_pdf_executor(executor)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("PDF workers failed, extracting in process: %s", e)
+    try:
+        return _extract_pages_text(pdf_bytes, 0, num_pages)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.error("Error reading PDF: %s", e)
         return None
 
 
+def fetch_pdf_text(url: str) -> Optional[str]:
+    """Returns the text of the PDF at `url`, downloading and parsing once.
+
+    Published Fed documents never change, so a cached copy is always used.
+    """
+    return document_cache.get_document_cache().fetch_text(
+        url, extract_text_from_pdf_bytes
+    )
+
+
+def fetch_pdf_texts(urls: Sequence[str]) -> list[Optional[str]]:
+    """Fetches the text of several PDFs concurrently, in the order of `urls`."""
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(len(urls), document_cache.HTTP_POOL_SIZE) or 1
+    ) as pool:
+        return list(pool.map(fetch_pdf_text, urls))
+
+
 def create_html_redline(text1: str, text2: str) -> str:
     """Creates an HTML redline doc of differences between text1 and text2."""
-    d = dmp.diff_match_patch()
-    diffs = d.diff_main(text2, text1)
-    d.diff_cleanupSemantic(diffs)
-
-    html_output = ""
-    for op, text in diffs:
-        if op == -1:  # Deletion
-            html_output += (
-                f'<del style="background-color: #ffcccc;">{text}</del>'
-            )
-        elif op == 1:  # Insertion
-            html_output += (
-                f'<ins style="background-color: #ccffcc;">{text}</ins>'
-            )
-        else:  # Unchanged
-            html_output += text
-
-    return html_output
+    return redline.compare_documents(text1, text2).html()
 
 
 def save_html_to_artifact(
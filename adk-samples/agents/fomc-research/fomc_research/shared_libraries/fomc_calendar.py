@@ -0,0 +1,410 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Meeting index parsed from the FOMC calendar page.
+
+The calendar page at `CALENDAR_URL` is parsed locally with `html.parser` into
+one `Meeting` per FOMC meeting: its (last) date, statement, press conference
+and minutes links. The index is saved next to the document cache and only
+re-parsed when the calendar page itself changes. Newly parsed meetings are
+merged into the saved index, so meetings that drop off the calendar page stay
+available.
+"""
+
+import dataclasses
+import datetime
+import html.parser
+import json
+import logging
+import os
+import re
+import threading
+import urllib.parse
+from typing import Optional
+
+from . import document_cache
+
+logger = logging.getLogger(__name__)
+
+FED_HOSTNAME = "https://www.federalreserve.gov"
+CALENDAR_URL = f"{FED_HOSTNAME}/monetarypolicy/fomccalendars.htm"
+# How often the calendar page is revalidated.
+CALENDAR_MAX_AGE_SECS = 60 * 60
+INDEX_FILENAME = "fomc_meeting_index.json"
+
+_YEAR_HEADING = re.compile(r"(\d{4})\s+FOMC Meetings")
+_DAY = re.compile(r"\d{1,2}")
+_HREF_DATE = re.compile(r"(\d{4})(\d{2})(\d{2})")
+_STATEMENT_PDF = re.compile(r"monetary\d{8}a\d*\.pdf$")
+_STATEMENT_HTML = re.compile(r"pressreleases/monetary\d{8}a\.htm$")
+_PRESS_CONFERENCE = re.compile(r"fomcpresconf\d{8}\.htm$")
+_MINUTES_HTML = re.compile(r"fomcminutes\d{8}\.htm$")
+_MINUTES_PDF = re.compile(r"fomcminutes\d{8}\.pdf$")
+_TRANSCRIPT_PDF = re.compile(r"presconf\d{8}\.pdf$", re.IGNORECASE)
+
+_MONTHS = {
+    name.lower(): i
+    for i, name in enumerate(
+        [
+            "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+            "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+        ],
+        start=1,
+    )
+}
+
+
+@dataclasses.dataclass
+class Meeting:
+    """Links of one FOMC meeting, as absolute URLs."""
+
+    date: datetime.date
+    statement_url: Optional[str] = None
+    statement_pdf_url: Optional[str] = None
+    press_conference_url: Optional[str] = None
+    minutes_url: Optional[str] = None
+    minutes_pdf_url: Optional[str] = None
+
+    def to_json(self) -> dict:
+        return {**dataclasses.asdict(self), "date": self.date.isoformat()}
+
+    @classmethod
+    def from_json(cls, value: dict) -> "Meeting":
+        return cls(
+            **{**value, "date": datetime.date.fromisoformat(value["date"])}
+        )
+
+
+def _meeting_date(
+    year: Optional[int], month_text: str, day_text: str, hrefs: list[str]
+) -> Optional[datetime.date]:
+    """Returns the last day of a meeting from its calendar cells.
+
+    Months are written like "January" or "Apr/May", days like "28-29", "30-1"
+    or "16 (unscheduled)". Falls back to the date in the meeting's links.
+    """
+    months = [
+        _MONTHS.get(m.strip()[:3].lower()) for m in month_text.split("/")
+    ]
+    days = [int(d) for d in _DAY.findall(day_text)]
+    if year and days and months and all(months):
+        # A range that wraps ("30-1") ends in the second month.
+        wraps = len(days) > 1 and days[-1] < days[0]
+        month = months[-1] if wraps or len(months) == 1 else months[0]
+        try:
+            return datetime.date(year, month, days[-1])
+        except ValueError:
+            pass
+    for href in hrefs:
+        match = _HREF_DATE.search(href)
+        if match:
+            try:
+                return datetime.date(*(int(x) for x in match.groups()))
+            except ValueError:
+                continue
+    return None
+
+
+class _CalendarParser(html.parser.HTMLParser):
+    """Collects the meeting rows of the FOMC calendar page."""
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.meetings: list[Meeting] = []
+        self._year = None
+        self._heading_text = None
+        # Open <div> depth inside the current meeting row, or 0 outside.
+        self._meeting_depth = 0
+        self._cell = None
+        self._cell_depth = 0
+        self._cells = {}
+        self._hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if tag in ("h3", "h4", "h5"):
+            self._heading_text = ""
+        if tag == "a" and self._meeting_depth and attrs.get("href"):
+            self._hrefs.append(
+                urllib.parse.urljoin(self.base_url, attrs["href"].strip())
+            )
+        if tag != "div":
+            return
+        if self._meeting_depth:
+            self._meeting_depth += 1
+            if self._cell:
+                self._cell_depth += 1
+            elif "fomc-meeting__month" in classes:
+                self._cell, self._cell_depth = "month", 1
+            elif "fomc-meeting__date" in classes:
+                self._cell, self._cell_depth = "date", 1
+        elif "fomc-meeting" in classes:
+            self._meeting_depth = 1
+            self._cells = {"month": "", "date": ""}
+            self._hrefs = []
+
+    def handle_data(self, data):
+        if self._heading_text is not None:
+            self._heading_text += data
+        if self._cell:
+            self._cells[self._cell] += data
+
+    def handle_endtag(self, tag):
+        if tag in ("h3", "h4", "h5") and self._heading_text is not None:
+            match = _YEAR_HEADING.search(self._heading_text)
+            if match:
+                self._year = int(match.group(1))
+            self._heading_text = None
+        if tag != "div" or not self._meeting_depth:
+            return
+        if self._cell:
+            self._cell_depth -= 1
+            if not self._cell_depth:
+                self._cell = None
+        self._meeting_depth -= 1
+        if not self._meeting_depth:
+            self._finish_meeting()
+
+    def _finish_meeting(self):
+        date = _meeting_date(
+            self._year, self._cells["month"], self._cells["date"], self._hrefs
+        )
+        if date is None:
+            logger.debug("Skipping calendar row without date: %s", self._cells)
+            return
+
+        def _first(pattern: re.Pattern) -> Optional[str]:
+            return next((h for h in self._hrefs if pattern.search(h)), None)
+
+        self.meetings.append(
+            Meeting(
+                date=date,
+                statement_url=_first(_STATEMENT_HTML),
+                statement_pdf_url=_first(_STATEMENT_PDF),
+                press_conference_url=_first(_PRESS_CONFERENCE),
+                minutes_url=_first(_MINUTES_HTML),
+                minutes_pdf_url=_first(_MINUTES_PDF),
+            )
+        )
+
+
+class _LinkParser(html.parser.HTMLParser):
+    """Collects (href, link text) pairs of a page."""
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links: list[tuple[str, str]] = []
+        self._href = None
+        self._text = ""
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            self._href = (
+                urllib.parse.urljoin(self.base_url, href.strip())
+                if href
+                else None
+            )
+            self._text = ""
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text += data
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            self.links.append((self._href, " ".join(self._text.split())))
+            self._href = None
+
+
+def parse_calendar(
+    page_html: str, base_url: str = CALENDAR_URL
+) -> list[Meeting]:
+    """Parses the meetings of an FOMC calendar page."""
+    parser = _CalendarParser(base_url)
+    parser.feed(page_html)
+    parser.close()
+    return parser.meetings
+
+
+def parse_transcript_url(
+    page_html: str, base_url: str = FED_HOSTNAME
+) -> Optional[str]:
+    """Finds the press conference transcript PDF on a press conference page."""
+    parser = _LinkParser(base_url)
+    parser.feed(page_html)
+    parser.close()
+    for href, text in parser.links:
+        if "transcript" in text.lower() and href.lower().endswith(".pdf"):
+            return href
+    return next(
+        (href for href, _ in parser.links if _TRANSCRIPT_PDF.search(href)),
+        None,
+    )
+
+
+class MeetingIndex:
+    """Meetings by date, kept in sync with the FOMC calendar page.
+
+    Attributes:
+      path: JSON file the index is saved to; None keeps it in memory only.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        cache: Optional[document_cache.DocumentCache] = None,
+    ):
+        self.path = path
+        self._cache = cache
+        self._meetings: dict[datetime.date, Meeting] = {}
+        self._source_hash = None
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                self._source_hash = saved["source_hash"]
+                for value in saved["meetings"]:
+                    meeting = Meeting.from_json(value)
+                    self._meetings[meeting.date] = meeting
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning("Ignoring unreadable meeting index: %s", e)
+
+    def _document_cache(self) -> document_cache.DocumentCache:
+        return self._cache or document_cache.get_document_cache()
+
+    def merge(self, meetings: list[Meeting], source_hash: str) -> int:
+        """Adds or updates meetings; returns how many changed."""
+        changed = 0
+        with self._lock:
+            for meeting in meetings:
+                known = self._meetings.get(meeting.date)
+                if known is not None:
+                    # Keep links a newer page version no longer shows.
+                    meeting = Meeting(
+                        **{
+                            field.name: getattr(meeting, field.name)
+                            or getattr(known, field.name)
+                            for field in dataclasses.fields(Meeting)
+                        }
+                    )
+                if meeting != known:
+                    self._meetings[meeting.date] = meeting
+                    changed += 1
+            self._source_hash = source_hash
+            if self.path:
+                data = {
+                    "source_hash": source_hash,
+                    "meetings": [
+                        m.to_json() for _, m in sorted(self._meetings.items())
+                    ],
+                }
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                try:
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        json.dump(data, f, indent=1)
+                    os.replace(tmp_path, self.path)
+                except OSError as e:
+                    # The in-memory index stays current; the next merge
+                    # retries the save.
+                    logger.warning(
+                        "Could not save meeting index %s: %s", self.path, e
+                    )
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+        return changed
+
+    def refresh(self, max_age_secs: float = CALENDAR_MAX_AGE_SECS) -> None:
+        """Re-parses the calendar page if it changed since the last parse."""
+        document = self._document_cache().fetch(CALENDAR_URL, max_age_secs)
+        if document.content_hash == self._source_hash:
+            return
+        try:
+            page_html = document.content.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # Keep the meetings parsed from earlier page versions.
+            logger.warning("Could not decode %s: %s", CALENDAR_URL, e)
+            return
+        meetings = parse_calendar(page_html)
+        changed = self.merge(meetings, document.content_hash)
+        logger.info(
+            "Parsed %d meetings from the FOMC calendar, %d changed",
+            len(meetings),
+            changed,
+        )
+
+    def meetings(self) -> list[Meeting]:
+        with self._lock:
+            return [m for _, m in sorted(self._meetings.items())]
+
+    def nearest(self, date: datetime.date) -> Optional[Meeting]:
+        """Returns the meeting with a statement closest to `date`."""
+        candidates = [m for m in self.meetings() if m.statement_pdf_url]
+        if not candidates:
+            return None
+        return min(
+            candidates, key=lambda m: (abs((m.date - date).days), m.date)
+        )
+
+    def previous(self, meeting: Meeting) -> Optional[Meeting]:
+        """Returns the last meeting with a statement before `meeting`."""
+        earlier = [
+            m
+            for m in self.meetings()
+            if m.date < meeting.date and m.statement_pdf_url
+        ]
+        return earlier[-1] if earlier else None
+
+    def transcript_url(self, meeting: Meeting) -> Optional[str]:
+        """Finds the transcript PDF on the meeting's press conference page.
+
+        Transcripts are posted a few days after a meeting, so a cached page
+        without one is revalidated.
+        """
+        if not meeting.press_conference_url:
+            return None
+        cache = self._document_cache()
+        for max_age_secs in (None, 0):
+            document = cache.fetch(meeting.press_conference_url, max_age_secs)
+            try:
+                page_html = document.content.decode("utf-8")
+            except UnicodeDecodeError as e:
+                logger.warning("Could not decode %s: %s", document.url, e)
+                return None
+            url = parse_transcript_url(page_html)
+            if url:
+                return url
+        return None
+
+
+_meeting_index = None
+_meeting_index_lock = threading.Lock()
+
+
+def get_meeting_index() -> MeetingIndex:
+    """Returns the shared meeting index, saved in the document cache dir."""
+    global _meeting_index
+    with _meeting_index_lock:
+        if _meeting_index is None:
+            cache_dir = document_cache.DOCUMENT_CACHE_DIR
+            _meeting_index = MeetingIndex(
+                os.path.join(cache_dir, INDEX_FILENAME) if cache_dir else None
+            )
+        return _meeting_index
@@ -0,0 +1,194 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local SQLite cache of the Fed Futures price timeseries.
+
+Historical settlement prices never change, so every price fetched from
+BigQuery is kept in a local SQLite file keyed by (timeseries_code, date).
+Dates that BigQuery has no price for (weekends, holidays) are remembered too,
+so a repeat analysis of the same meeting needs no BigQuery query. Missing
+prices for recent dates are looked up again, since they may still be
+published.
+
+To fill the cache with one query, run from the `fomc-research` directory:
+
+  python -m fomc_research.shared_libraries.price_utils backfill \
+      [start_date [end_date]]
+"""
+
+import contextlib
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PRICE_CACHE_PATH = os.path.expanduser(
+    os.getenv(
+        "GOOGLE_GENAI_FOMC_AGENT_PRICE_CACHE_PATH",
+        "~/.cache/fomc_research/prices.sqlite3",
+    )
+)
+# A missing price is only trusted once the date is this many days old.
+MISSING_PRICE_RECHECK_DAYS = 7
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+  timeseries_code TEXT NOT NULL,
+  date TEXT NOT NULL,
+  value REAL NOT NULL,
+  PRIMARY KEY (timeseries_code, date)
+);
+CREATE TABLE IF NOT EXISTS missing_prices (
+  timeseries_code TEXT NOT NULL,
+  date TEXT NOT NULL,
+  checked_on TEXT NOT NULL,
+  PRIMARY KEY (timeseries_code, date)
+);
+"""
+
+
+class PriceCache:
+    """Prices per (timeseries_code, date), stored in a SQLite file."""
+
+    def __init__(self, path: str = PRICE_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_prices(
+        self, timeseries_codes: Iterable[str], dates: Iterable[datetime.date]
+    ) -> tuple[
+        dict[str, dict[datetime.date, float]], list[tuple[str, datetime.date]]
+    ]:
+        """Looks up the cached prices.
+
+        Args:
+          timeseries_codes: Timeseries codes to look up.
+          dates: Dates to look up.
+
+        Returns:
+          A tuple of the cached prices, as a dictionary of timeseries codes to
+          dictionaries of dates to prices, and the (code, date) pairs that
+          still have to be fetched.
+        """
+        timeseries_codes = list(dict.fromkeys(timeseries_codes))
+        dates = list(dict.fromkeys(dates))
+        if not timeseries_codes or not dates:
+            return {}, []
+        code_marks = ",".join("?" * len(timeseries_codes))
+        date_marks = ",".join("?" * len(dates))
+        params = timeseries_codes + [d.isoformat() for d in dates]
+        with self._connect() as conn:
+            price_rows = conn.execute(
+                "SELECT timeseries_code, date, value FROM prices"
+                f" WHERE timeseries_code IN ({code_marks})"
+                f" AND date IN ({date_marks})",
+                params,
+            ).fetchall()
+            missing_rows = conn.execute(
+                "SELECT timeseries_code, date, checked_on FROM missing_prices"
+                f" WHERE timeseries_code IN ({code_marks})"
+                f" AND date IN ({date_marks})",
+                params,
+            ).fetchall()
+
+        prices = {}
+        for code, date, value in price_rows:
+            date = datetime.date.fromisoformat(date)
+            prices.setdefault(code, {})[date] = value
+        known_missing = set()
+        for code, date, checked_on in missing_rows:
+            date = datetime.date.fromisoformat(date)
+            checked_on = datetime.date.fromisoformat(checked_on)
+            if (checked_on - date).days >= MISSING_PRICE_RECHECK_DAYS:
+                known_missing.add((code, date))
+        to_fetch = [
+            (code, date)
+            for code in timeseries_codes
+            for date in dates
+            if date not in prices.get(code, {})
+            and (code, date) not in known_missing
+        ]
+        return prices, to_fetch
+
+    def put_prices(
+        self, rows: Iterable[tuple[str, datetime.date, float]]
+    ) -> int:
+        """Stores (timeseries_code, date, value) rows; returns the row count."""
+        rows = [(code, date.isoformat(), value) for code, date, value in rows]
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO prices VALUES (?, ?, ?)", rows
+            )
+            conn.executemany(
+                "DELETE FROM missing_prices"
+                " WHERE timeseries_code = ? AND date = ?",
+                [(code, date) for code, date, _ in rows],
+            )
+        return len(rows)
+
+    def put_missing(self, pairs: Iterable[tuple[str, datetime.date]]) -> None:
+        """Remembers (timeseries_code, date) pairs that have no price."""
+        today = datetime.date.today().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO missing_prices VALUES (?, ?, ?)",
+                [(code, date.isoformat(), today) for code, date in pairs],
+            )
+
+
+_price_cache = None
+_price_cache_failed = False
+_price_cache_lock = threading.Lock()
+
+
+def get_price_cache() -> Optional[PriceCache]:
+    """Returns the shared price cache.
+
+    Returns:
+      The cache, or None if the cache path is empty or the cache file cannot
+      be created; prices are then fetched from BigQuery.
+    """
+    global _price_cache, _price_cache_failed
+    if not PRICE_CACHE_PATH:
+        return None
+    with _price_cache_lock:
+        if _price_cache is None and not _price_cache_failed:
+            try:
+                _price_cache = PriceCache(PRICE_CACHE_PATH)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(
+                    "Cannot open price cache %s, not caching: %s",
+                    PRICE_CACHE_PATH,
+                    e,
+                )
+                _price_cache_failed = True
+        return _price_cache
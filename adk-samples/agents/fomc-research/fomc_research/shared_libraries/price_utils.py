@@ -19,11 +19,13 @@ import logging
 import math
 import os
 from collections.abc import Sequence
+from typing import Optional
 
 from absl import app
 from google.cloud import bigquery
 
-bqclient = bigquery.Client()
+from . import price_cache
+
 logger = logging.getLogger(__name__)
 
 MOVE_SIZE_BP = 25
@@ -35,6 +37,17 @@ if not TIMESERIES_CODES:
     TIMESERIES_CODES = "SFRH5,SFRZ5"
 
 
+_bqclient = None
+
+
+def get_bq_client() -> bigquery.Client:
+    """Returns the BigQuery client, creating it on first use."""
+    global _bqclient
+    if _bqclient is None:
+        _bqclient = bigquery.Client()
+    return _bqclient
+
+
 def fetch_prices_from_bq(
     timeseries_codes: list[str], dates: list[datetime.date]
 ) -> dict[dict[datetime.date, float]]:
@@ -68,7 +81,7 @@ WHERE timeseries_code IN UNNEST(@timeseries_codes)
     )
 
     prices = {}
-    query_job = bqclient.query(query, job_config=job_config)
+    query_job = get_bq_client().query(query, job_config=job_config)
     results = query_job.result()
     for row in results:
         logger.debug(
@@ -85,6 +98,91 @@ WHERE timeseries_code IN UNNEST(@timeseries_codes)
     return prices
 
 
+def fetch_timeseries_from_bq(
+    timeseries_codes: Optional[list[str]] = None,
+    start_date: Optional[datetime.date] = None,
+    end_date: Optional[datetime.date] = None,
+) -> list[tuple[str, datetime.date, float]]:
+    """Fetches whole timeseries from BigQuery in one query.
+
+    Args:
+      timeseries_codes: Timeseries codes to fetch; all codes if None.
+      start_date: First date to fetch; no lower bound if None.
+      end_date: Last date to fetch; no upper bound if None.
+
+    Returns:
+      List of (timeseries_code, date, value) rows.
+    """
+    conditions = []
+    query_parameters = []
+    if timeseries_codes:
+        conditions.append("timeseries_code IN UNNEST(@timeseries_codes)")
+        query_parameters.append(
+            bigquery.ArrayQueryParameter(
+                "timeseries_codes", "STRING", timeseries_codes
+            )
+        )
+    if start_date:
+        conditions.append("date >= @start_date")
+        query_parameters.append(
+            bigquery.ScalarQueryParameter("start_date", "DATE", start_date)
+        )
+    if end_date:
+        conditions.append("date <= @end_date")
+        query_parameters.append(
+            bigquery.ScalarQueryParameter("end_date", "DATE", end_date)
+        )
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    query = f"""
+SELECT DISTINCT timeseries_code, date, value
+FROM {DATASET_NAME}.timeseries_data
+{where}
+"""
+    job_config = bigquery.QueryJobConfig(query_parameters=query_parameters)
+    results = get_bq_client().query(query, job_config=job_config).result()
+    return [(row.timeseries_code, row.date, row.value) for row in results]
+
+
+def fetch_prices(
+    timeseries_codes: list[str], dates: list[datetime.date]
+) -> dict[str, dict[datetime.date, float]]:
+    """Fetches prices, querying BigQuery only for prices not cached locally.
+
+    Args:
+      timeseries_codes: List of timeseries codes to fetch.
+      dates: List of dates to fetch.
+
+    Returns:
+      Dictionary of timeseries codes to dictionaries of dates to prices.
+    """
+    cache = price_cache.get_price_cache()
+    if cache is None:
+        return fetch_prices_from_bq(timeseries_codes, dates)
+
+    prices, to_fetch = cache.get_prices(timeseries_codes, dates)
+    if not to_fetch:
+        logger.debug("fetch_prices: all prices cached")
+        return prices
+
+    fetch_codes = sorted({code for code, _ in to_fetch})
+    fetch_dates = sorted({date for _, date in to_fetch})
+    fetched = fetch_prices_from_bq(fetch_codes, fetch_dates)
+    cache.put_prices(
+        (code, date, value)
+        for code, values in fetched.items()
+        for date, value in values.items()
+    )
+    cache.put_missing(
+        (code, date)
+        for code, date in to_fetch
+        if date not in fetched.get(code, {})
+    )
+    for code, values in fetched.items():
+        prices.setdefault(code, {}).update(values)
+    return prices
+
+
 def number_of_moves(
     front_ff_future_px: float, back_ff_future_px: float
 ) -> float:
@@ -140,7 +238,7 @@ def compute_probabilities(meeting_date_str: str) -> dict:
     meeting_date_day_before = meeting_date - datetime.timedelta(days=1)
     timeseries_codes = [x.strip() for x in TIMESERIES_CODES.split(",")]
 
-    prices = fetch_prices_from_bq(
+    prices = fetch_prices(
         timeseries_codes, [meeting_date, meeting_date_day_before]
     )
 
@@ -188,7 +286,32 @@ def compute_probabilities(meeting_date_str: str) -> dict:
     return {"status": "OK", "output": output}
 
 
+def backfill_price_cache(
+    start_date: Optional[datetime.date] = None,
+    end_date: Optional[datetime.date] = None,
+) -> int:
+    """Copies the configured timeseries from BigQuery into the price cache.
+
+    Returns:
+      Number of cached prices.
+    """
+    cache = price_cache.get_price_cache()
+    if cache is None:
+        raise ValueError("GOOGLE_GENAI_FOMC_AGENT_PRICE_CACHE_PATH is empty.")
+    timeseries_codes = [x.strip() for x in TIMESERIES_CODES.split(",")]
+    rows = fetch_timeseries_from_bq(timeseries_codes, start_date, end_date)
+    return cache.put_prices(rows)
+
+
 def main(argv: Sequence[str]) -> None:
+    if len(argv) > 1 and argv[1] == "backfill":
+        if len(argv) > 4:
+            raise app.UsageError("Usage: backfill [start_date [end_date]]")
+        dates = [datetime.date.fromisoformat(x) for x in argv[2:]]
+        count = backfill_price_cache(*dates)
+        print(f"Cached {count} prices in {price_cache.PRICE_CACHE_PATH}")
+        return
+
     if len(argv) > 2:
         raise app.UsageError("Too many command-line arguments.")
 
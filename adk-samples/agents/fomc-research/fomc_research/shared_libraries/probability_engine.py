@@ -0,0 +1,276 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Vectorized rate move probabilities across many meetings and contracts.
+
+`compute_probability_table` fetches the prices of every meeting date, the day
+before each meeting and every futures contract in one batch, then computes the
+implied number of moves and the odds for every (meeting, contract pair,
+before/after) combination with NumPy array operations. The results are the
+same as `price_utils.number_of_moves` and
+`price_utils.fed_meeting_probabilities` for each row.
+
+To compare both implementations on a decade of synthetic meetings, run from
+the `fomc-research` directory:
+
+  python -m fomc_research.shared_libraries.probability_engine
+"""
+
+import dataclasses
+import datetime
+import itertools
+import time
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+from absl import app
+
+from . import price_utils
+
+PRE_MEETING = "pre"
+POST_MEETING = "post"
+
+
+def _to_python(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+@dataclasses.dataclass
+class ProbabilityTable:
+    """Column-oriented table with one row per meeting, pair and timing.
+
+    Every attribute is an array of the same length. Rows without prices have
+    NaN moves and odds and say which price is missing in `error`.
+    """
+
+    meeting_date: np.ndarray
+    timing: np.ndarray
+    near_code: np.ndarray
+    far_code: np.ndarray
+    near_price: np.ndarray
+    far_price: np.ndarray
+    num_moves: np.ndarray
+    move_text: np.ndarray
+    max_expected_move_bp: np.ndarray
+    move_odds: np.ndarray
+    no_move_odds: np.ndarray
+    error: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.meeting_date)
+
+    def probabilities(self, i: int) -> Optional[dict]:
+        """Returns row `i` in the format of `fed_meeting_probabilities`."""
+        if self.error[i]:
+            return None
+        move_text = str(self.move_text[i])
+        move_bp = int(self.max_expected_move_bp[i])
+        return {
+            f"odds of {move_bp}bp {move_text}": float(self.move_odds[i]),
+            f"odds of no {move_text}": float(self.no_move_odds[i]),
+        }
+
+    def to_rows(self) -> list[dict]:
+        """Returns the table as a list of row dictionaries."""
+        columns = [field.name for field in dataclasses.fields(self)]
+        return [
+            {name: _to_python(getattr(self, name)[i]) for name in columns}
+            for i in range(len(self))
+        ]
+
+
+def number_of_moves(
+    front_ff_future_px: np.ndarray, back_ff_future_px: np.ndarray
+) -> np.ndarray:
+    """Vectorized `price_utils.number_of_moves`."""
+    move_size_pct = price_utils.MOVE_SIZE_BP / 100
+    front_implied_rate = 100 - front_ff_future_px
+    back_implied_rate = 100 - back_ff_future_px
+    rate_delta = back_implied_rate - front_implied_rate
+    return rate_delta / move_size_pct
+
+
+def _round_odds(values: np.ndarray) -> np.ndarray:
+    """Rounds to two decimals exactly like the built-in `round`."""
+    rounded = np.round(values, 2)
+    # np.round scales by 100 first, which can tip values that are almost
+    # exactly halfway; those few are rounded with the built-in instead.
+    scaled = values * 100
+    halfway = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    rounded[halfway] = [round(float(v), 2) for v in values[halfway]]
+    return rounded
+
+
+def compute_probability_table(
+    meeting_dates: Sequence[datetime.date],
+    code_pairs: Optional[Sequence[tuple[str, str]]] = None,
+    prices: Optional[dict[str, dict[datetime.date, float]]] = None,
+) -> ProbabilityTable:
+    """Computes rate move probabilities for many meetings at once.
+
+    Args:
+      meeting_dates: Dates of the Fed meetings.
+      code_pairs: (near, far) timeseries code pairs. Defaults to every pair of
+        the configured timeseries codes, in the configured order.
+      prices: Prices to use instead of fetching them, as returned by
+        `price_utils.fetch_prices`.
+
+    Returns:
+      The probabilities before and after each meeting for each code pair, in
+      the order meeting, pair, then before/after.
+    """
+    if code_pairs is None:
+        codes = [x.strip() for x in price_utils.TIMESERIES_CODES.split(",")]
+        code_pairs = list(itertools.combinations(codes, 2))
+    meeting_dates = list(meeting_dates)
+    codes = sorted({code for pair in code_pairs for code in pair})
+    # Price dates: the day before and the day of each meeting, interleaved.
+    price_dates = [
+        date
+        for meeting_date in meeting_dates
+        for date in (meeting_date - datetime.timedelta(days=1), meeting_date)
+    ]
+    dates = sorted(set(price_dates))
+
+    if prices is None:
+        prices = price_utils.fetch_prices(codes, dates)
+
+    # Price matrix with one row per code and one column per date.
+    code_index = {code: i for i, code in enumerate(codes)}
+    date_index = {date: i for i, date in enumerate(dates)}
+    price_matrix = np.full((len(codes), len(dates)), np.nan)
+    for code, values in prices.items():
+        if code not in code_index:
+            continue
+        for date, value in values.items():
+            if date in date_index:
+                price_matrix[code_index[code], date_index[date]] = value
+
+    num_pairs = len(code_pairs)
+    near_idx = np.array([code_index[near] for near, _ in code_pairs], dtype=int)
+    far_idx = np.array([code_index[far] for _, far in code_pairs], dtype=int)
+    price_date_idx = np.array([date_index[d] for d in price_dates], dtype=int)
+    # Rows: meetings x pairs x (pre, post).
+    shape = (len(meeting_dates), num_pairs, 2)
+    row_date_idx = np.broadcast_to(price_date_idx.reshape(-1, 1, 2), shape)
+    row_near_idx = np.broadcast_to(near_idx.reshape(1, -1, 1), shape)
+    row_far_idx = np.broadcast_to(far_idx.reshape(1, -1, 1), shape)
+    row_date_idx = row_date_idx.ravel()
+    row_near_idx = row_near_idx.ravel()
+    row_far_idx = row_far_idx.ravel()
+
+    near_price = price_matrix[row_near_idx, row_date_idx]
+    far_price = price_matrix[row_far_idx, row_date_idx]
+
+    nmoves = number_of_moves(near_price, far_price)
+    abs_moves = np.abs(nmoves)
+    move_text = np.where(nmoves > 0, "hike", "cut").astype(object)
+    move_text = np.where(nmoves > 1, move_text + "s", move_text)
+    max_expected_move_bp = np.ceil(abs_moves) * price_utils.MOVE_SIZE_BP
+    move_odds = _round_odds(np.modf(abs_moves)[0])
+    no_move_odds = _round_odds(1 - move_odds)
+
+    codes_array = np.array(codes, dtype=object)
+    errors = np.full(len(nmoves), "", dtype=object)
+    for i in np.flatnonzero(np.isnan(nmoves)):
+        missing_idx = (
+            row_near_idx[i] if np.isnan(near_price[i]) else row_far_idx[i]
+        )
+        errors[i] = (
+            f"No data for {codes[missing_idx]} on {dates[row_date_idx[i]]}"
+        )
+
+    return ProbabilityTable(
+        meeting_date=np.repeat(
+            np.array(meeting_dates, dtype=object), num_pairs * 2
+        ),
+        timing=np.tile(
+            np.array([PRE_MEETING, POST_MEETING], dtype=object),
+            len(meeting_dates) * num_pairs,
+        ),
+        near_code=codes_array[row_near_idx],
+        far_code=codes_array[row_far_idx],
+        near_price=near_price,
+        far_price=far_price,
+        num_moves=nmoves,
+        move_text=move_text,
+        max_expected_move_bp=max_expected_move_bp,
+        move_odds=move_odds,
+        no_move_odds=no_move_odds,
+        error=errors,
+    )
+
+
+def _synthetic_prices(
+    meeting_dates: list[datetime.date], codes: list[str], seed: int = 0
+) -> dict[str, dict[datetime.date, float]]:
+    rng = np.random.default_rng(seed)
+    dates = sorted(
+        {d for m in meeting_dates for d in (m, m - datetime.timedelta(days=1))}
+    )
+    return {
+        code: dict(zip(dates, np.round(rng.uniform(94, 97, len(dates)), 3)))
+        for code in codes
+    }
+
+
+def main(argv: Sequence[str]) -> None:
+    if len(argv) > 1:
+        raise app.UsageError("Too many command-line arguments.")
+
+    # Eight meetings a year for ten years, priced on eight quarterly contracts.
+    meeting_dates = [
+        datetime.date(year, month, 15)
+        for year in range(2015, 2025)
+        for month in (1, 3, 5, 6, 7, 9, 11, 12)
+    ]
+    codes = [f"SFR{m}{y}" for y in range(5, 7) for m in "HMUZ"]
+    code_pairs = list(itertools.combinations(codes, 2))
+    prices = _synthetic_prices(meeting_dates, codes)
+
+    start = time.perf_counter()
+    table = compute_probability_table(meeting_dates, code_pairs, prices)
+    vectorized_secs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scalar = []
+    for meeting_date in meeting_dates:
+        pre_date = meeting_date - datetime.timedelta(days=1)
+        for near, far in code_pairs:
+            for price_date in (pre_date, meeting_date):
+                nmoves = price_utils.number_of_moves(
+                    prices[near][price_date], prices[far][price_date]
+                )
+                scalar.append(
+                    (nmoves, price_utils.fed_meeting_probabilities(nmoves))
+                )
+    scalar_secs = time.perf_counter() - start
+
+    mismatches = sum(
+        nmoves != table.num_moves[i] or probs != table.probabilities(i)
+        for i, (nmoves, probs) in enumerate(scalar)
+    )
+    print(
+        f"{len(meeting_dates)} meetings x {len(code_pairs)} contract pairs:"
+        f" {len(table)} rows, {mismatches} mismatches"
+    )
+    print(f"scalar:     {scalar_secs * 1000:.1f} ms")
+    print(f"vectorized: {vectorized_secs * 1000:.1f} ms")
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    app.run(main)
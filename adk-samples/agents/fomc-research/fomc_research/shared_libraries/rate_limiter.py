@@ -0,0 +1,324 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Token bucket rate limits of the model requests.
+
+A request passes two buckets. The session bucket, kept in the session state
+by `reserve_session_token`, limits how fast one session may call the model,
+so a burst in one session does not use up the quota of the others. The
+shared bucket models the API quota of a project and model and is drawn from
+by every session. A request reserves a token up front and learns how long it
+has to wait for it; the bucket may go negative, so concurrent requests are
+served first come, first served and none of them is starved.
+
+The waiting is done by `RateLimitedGemini`, whose `generate_content_async`
+the ADK awaits, with `asyncio.sleep`: a throttled session does not stall the
+event loop for the others. Model callbacks are not awaited by every ADK
+version, so the session callback only computes its wait and leaves it to the
+model.
+
+By default the shared bucket lives in process memory. To share one quota
+between several worker processes on a host, pass a lock file: the bucket
+state is then kept in that file and updated under an exclusive `flock`.
+"""
+
+import asyncio
+import contextvars
+import dataclasses
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import AsyncGenerator, MutableMapping
+from typing import Any, Optional
+
+from google.adk.models import Gemini, LlmRequest, LlmResponse
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+SESSION_TOKENS_KEY = "rate_limit_tokens"
+SESSION_UPDATED_AT_KEY = "rate_limit_updated_at"
+
+# Wait owed by the session of the current request, set by the model callback
+# and served by the model, which runs next in the same task.
+_session_wait_secs: contextvars.ContextVar[float] = contextvars.ContextVar(
+    "session_wait_secs", default=0.0
+)
+
+
+def _refill(
+    tokens: float,
+    updated_at: Optional[float],
+    now: float,
+    rate: float,
+    capacity: float,
+) -> tuple[float, float]:
+    """Takes one token; returns the tokens left and the wait in seconds."""
+    if updated_at is not None:
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+    tokens -= 1
+    return tokens, (-tokens / rate if tokens < 0 else 0.0)
+
+
+class MemoryBackend:
+    """Bucket state in process memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def reserve(self, key: str, rate: float, capacity: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated_at = self._buckets.get(key, (capacity, None))
+            tokens, wait_secs = _refill(tokens, updated_at, now, rate, capacity)
+            self._buckets[key] = (tokens, now)
+        return wait_secs
+
+
+class FileBackend:
+    """Bucket state in a JSON file shared by the processes of a host.
+
+    Attributes:
+      path: Path of the lock file; it is created if needed.
+    """
+
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("File locking is not supported on this platform")
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def reserve(self, key: str, rate: float, capacity: float) -> float:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "r+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                raw = f.read()
+                try:
+                    buckets = json.loads(raw) if raw else {}
+                except ValueError:
+                    logger.warning("Resetting corrupt rate limit file")
+                    buckets = {}
+                now = time.time()
+                tokens, updated_at = buckets.get(key, (capacity, None))
+                tokens, wait_secs = _refill(
+                    tokens, updated_at, now, rate, capacity
+                )
+                buckets[key] = (tokens, now)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(buckets).encode("utf-8"))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return wait_secs
+
+
+@dataclasses.dataclass
+class RateLimiterMetrics:
+    """Request and queue wait counters of a limiter."""
+
+    requests: int = 0
+    throttled: int = 0
+    total_wait_secs: float = 0.0
+    max_wait_secs: float = 0.0
+
+    def record(self, wait_secs: float) -> None:
+        self.requests += 1
+        if wait_secs > 0:
+            self.throttled += 1
+            self.total_wait_secs += wait_secs
+            self.max_wait_secs = max(self.max_wait_secs, wait_secs)
+
+    def to_dict(self) -> dict[str, float]:
+        metrics = dataclasses.asdict(self)
+        metrics["avg_wait_secs"] = (
+            self.total_wait_secs / self.throttled if self.throttled else 0.0
+        )
+        return metrics
+
+
+class RateLimiter:
+    """Allows `quota` requests per `window_secs`, with bursts up to `quota`.
+
+    Attributes:
+      key: Scope of the quota, e.g. "<project>/<model>".
+      metrics: Counters of requests, throttled requests and wait times.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        quota: int,
+        window_secs: float,
+        backend=None,
+    ):
+        self.key = key
+        self.capacity = float(quota)
+        self.rate = quota / window_secs
+        self.metrics = RateLimiterMetrics()
+        self._backend = backend or MemoryBackend()
+        self._metrics_lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        wait_secs = self._backend.reserve(self.key, self.rate, self.capacity)
+        with self._metrics_lock:
+            self.metrics.record(wait_secs)
+        if wait_secs > 0:
+            logger.debug(
+                "Rate limit reached for %s, waiting %.1f seconds",
+                self.key,
+                wait_secs,
+            )
+        return wait_secs
+
+    async def acquire(self) -> float:
+        """Waits for a token without blocking the event loop.
+
+        The reservation runs in a worker thread when the bucket is in a lock
+        file, since taking the lock may wait for other processes.
+
+        Returns:
+          The number of seconds waited.
+        """
+        if isinstance(self._backend, MemoryBackend):
+            wait_secs = self._reserve()
+        else:
+            wait_secs = await asyncio.to_thread(self._reserve)
+        if wait_secs > 0:
+            await asyncio.sleep(wait_secs)
+        return wait_secs
+
+
+_rate_limiters: dict[str, RateLimiter] = {}
+_backends: dict[Optional[str], object] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    key: str,
+    quota: int,
+    window_secs: float,
+    lock_file: Optional[str] = None,
+) -> RateLimiter:
+    """Returns the shared limiter for `key`, creating it on first use.
+
+    Args:
+      key: Scope of the quota, e.g. "<project>/<model>".
+      quota: Requests allowed per window.
+      window_secs: Length of the window in seconds.
+      lock_file: File to share the quota across processes; None or an empty
+        string keeps it in process memory.
+    """
+    lock_file = lock_file or None
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(key)
+        if limiter is None:
+            backend = _backends.get(lock_file)
+            if backend is None:
+                backend = (
+                    FileBackend(lock_file) if lock_file else MemoryBackend()
+                )
+                _backends[lock_file] = backend
+            limiter = RateLimiter(key, quota, window_secs, backend)
+            _rate_limiters[key] = limiter
+        return limiter
+
+
+def reserve_session_token(
+    state: MutableMapping[str, Any], quota: int, window_secs: float
+) -> float:
+    """Takes a token from the bucket of a session.
+
+    The wait is not served here; `RateLimitedGemini` waits for it before
+    sending the next request of the current task.
+
+    Args:
+      state: Session state holding the bucket.
+      quota: Requests allowed per window to the session.
+      window_secs: Length of the window in seconds.
+
+    Returns:
+      The number of seconds the session's request has to wait.
+    """
+    now = time.time()
+    tokens, wait_secs = _refill(
+        state.get(SESSION_TOKENS_KEY, float(quota)),
+        state.get(SESSION_UPDATED_AT_KEY),
+        now,
+        quota / window_secs,
+        float(quota),
+    )
+    state[SESSION_TOKENS_KEY] = tokens
+    state[SESSION_UPDATED_AT_KEY] = now
+    _session_wait_secs.set(wait_secs)
+    if wait_secs > 0:
+        logger.debug(
+            "Session rate limit reached, waiting %.1f seconds", wait_secs
+        )
+    return wait_secs
+
+
+class RateLimitedGemini(Gemini):
+    """Gemini model that waits for the rate limits before each request.
+
+    Attributes:
+      scope: Prefix of the shared bucket's key, e.g. the project.
+      quota: Requests allowed per window by the shared bucket.
+      window_secs: Length of the window in seconds.
+      lock_file: File to share the bucket across processes.
+    """
+
+    scope: str = ""
+    quota: int = 1000
+    window_secs: float = 60
+    lock_file: Optional[str] = None
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """The shared limiter of the scope and model."""
+        return get_rate_limiter(
+            f"{self.scope}/{self.model}",
+            self.quota,
+            self.window_secs,
+            self.lock_file,
+        )
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        session_wait_secs = _session_wait_secs.get()
+        if session_wait_secs > 0:
+            _session_wait_secs.set(0.0)
+            await asyncio.sleep(session_wait_secs)
+        await self.rate_limiter.acquire()
+        async for response in super().generate_content_async(
+            llm_request, stream
+        ):
+            yield response
+
+
+def get_metrics() -> dict[str, dict[str, float]]:
+    """Returns the metrics of every limiter, by key."""
+    with _rate_limiters_lock:
+        limiters = list(_rate_limiters.values())
+    return {limiter.key: limiter.metrics.to_dict() for limiter in limiters}
@@ -0,0 +1,297 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Paragraph and sentence aware redlines of Fed documents.
+
+Two documents are first aligned paragraph by paragraph, then sentence by
+sentence within the paragraphs that differ, using whitespace-insensitive
+keys. Only the sentence runs that were actually rewritten go through the
+character-level `diff_match_patch` diff, each bounded by `DIFF_TIMEOUT_SECS`,
+so long documents such as minutes and transcripts are compared in bounded
+time. Many rewritten runs can be diffed in parallel processes.
+
+To compare two text files, run from the `fomc-research` directory:
+
+  python -m fomc_research.shared_libraries.redline CURRENT PREVIOUS
+"""
+
+import concurrent.futures
+import dataclasses
+import difflib
+import html
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from typing import Optional, Union
+
+import diff_match_patch as dmp
+from absl import app
+
+DELETE = -1
+EQUAL = 0
+INSERT = 1
+
+# Time limit of the character-level diff of one rewritten run.
+DIFF_TIMEOUT_SECS = 1.0
+# Rewritten runs are diffed in parallel processes when there are this many.
+PARALLEL_MIN_RUNS = 16
+DIFF_MAX_WORKERS = min(4, os.cpu_count() or 1)
+# Number of changes listed in the summary, and their maximum length.
+MAX_SUMMARY_CHANGES = 50
+MAX_SUMMARY_TEXT_CHARS = 500
+
+_BLANK_LINE = re.compile(r"\n[ \t]*\n\s*")
+_SENTENCE = re.compile(r".*?(?:[.!?][\"')\]]*(?:\s+|$)|$)", re.DOTALL)
+_PARAGRAPH_END = re.compile(r"[.!?:][\"')\]]*$")
+# In text without blank lines, a line ending a sentence that is shorter than
+# this fraction of the longest line is taken to end a paragraph.
+_SHORT_LINE_RATIO = 0.85
+
+_DEL_TAG = '<del style="background-color: #ffcccc;">'
+_INS_TAG = '<ins style="background-color: #ccffcc;">'
+
+_diff_executor = None
+_diff_executor_lock = threading.Lock()
+
+
+def _get_diff_executor() -> concurrent.futures.ProcessPoolExecutor:
+    global _diff_executor
+    with _diff_executor_lock:
+        if _diff_executor is None:
+            _diff_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=DIFF_MAX_WORKERS
+            )
+        return _diff_executor
+
+
+def _key(text: str) -> str:
+    return " ".join(text.split())
+
+
+def split_paragraphs(text: str) -> list[str]:
+    """Splits text into paragraphs that concatenate back to `text`.
+
+    Paragraphs are separated by blank lines. Text extracted from a PDF often
+    has none, so there a short line ending a sentence ends a paragraph.
+    """
+    if _BLANK_LINE.search(text):
+        paragraphs, start = [], 0
+        for match in _BLANK_LINE.finditer(text):
+            paragraphs.append(text[start : match.end()])
+            start = match.end()
+        if start < len(text):
+            paragraphs.append(text[start:])
+        return paragraphs
+
+    lines = text.splitlines(keepends=True)
+    width = max((len(line.rstrip()) for line in lines), default=0)
+    paragraphs, current = [], []
+    for line in lines:
+        current.append(line)
+        stripped = line.rstrip()
+        if _PARAGRAPH_END.search(stripped) and (
+            len(stripped) < width * _SHORT_LINE_RATIO
+        ):
+            paragraphs.append("".join(current))
+            current = []
+    if current:
+        paragraphs.append("".join(current))
+    return paragraphs
+
+
+def split_sentences(paragraph: str) -> list[str]:
+    """Splits a paragraph into sentences that concatenate back to it."""
+    return [s for s in _SENTENCE.findall(paragraph) if s]
+
+
+def _diff_text(previous: str, current: str) -> list[tuple[int, str]]:
+    d = dmp.diff_match_patch()
+    d.Diff_Timeout = DIFF_TIMEOUT_SECS
+    diffs = d.diff_main(previous, current)
+    d.diff_cleanupSemantic(diffs)
+    return diffs
+
+
+@dataclasses.dataclass
+class ChangeSummary:
+    """Machine-readable summary of the differences between two documents."""
+
+    paragraphs_unchanged: int = 0
+    paragraphs_changed: int = 0
+    sentences_added: int = 0
+    sentences_removed: int = 0
+    sentences_changed: int = 0
+    chars_inserted: int = 0
+    chars_deleted: int = 0
+    changes: list[dict[str, str]] = dataclasses.field(default_factory=list)
+    diff_secs: float = 0.0
+
+    def add_change(
+        self, kind: str, previous: Optional[str], current: Optional[str]
+    ) -> None:
+        if len(self.changes) >= MAX_SUMMARY_CHANGES:
+            return
+        change = {"type": kind}
+        for name, text in (("previous", previous), ("current", current)):
+            if text is not None:
+                text = _key(text)
+                if len(text) > MAX_SUMMARY_TEXT_CHARS:
+                    text = text[:MAX_SUMMARY_TEXT_CHARS] + "..."
+                change[name] = text
+        self.changes.append(change)
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+@dataclasses.dataclass
+class Redline:
+    """Differences between two documents as (op, text) segments.
+
+    `op` is DELETE for text only in the previous document, INSERT for text
+    only in the current one and EQUAL otherwise.
+    """
+
+    segments: list[tuple[int, str]]
+    summary: ChangeSummary
+
+    def iter_html(self) -> Iterator[str]:
+        """Yields the HTML redline in chunks, with the text escaped."""
+        for op, text in self.segments:
+            text = html.escape(text, quote=False)
+            if op == DELETE:
+                yield f"{_DEL_TAG}{text}</del>"
+            elif op == INSERT:
+                yield f"{_INS_TAG}{text}</ins>"
+            else:
+                yield text
+
+    def html(self) -> str:
+        """Returns the HTML redline."""
+        return "".join(self.iter_html())
+
+
+def _align(
+    previous: Sequence[str], current: Sequence[str]
+) -> list[tuple[str, int, int, int, int]]:
+    matcher = difflib.SequenceMatcher(
+        None, [_key(x) for x in previous], [_key(x) for x in current], False
+    )
+    return matcher.get_opcodes()
+
+
+def compare_documents(
+    current: str, previous: str, max_workers: Optional[int] = None
+) -> Redline:
+    """Computes the redline of `current` against `previous`.
+
+    Args:
+      current: Text of the current document.
+      previous: Text of the previous document.
+      max_workers: Processes for diffing rewritten sentence runs; defaults to
+        `DIFF_MAX_WORKERS`. Fewer than two disables parallel diffing.
+
+    Returns:
+      The redline and its change summary.
+    """
+    start_time = time.perf_counter()
+    summary = ChangeSummary()
+    prev_paragraphs = split_paragraphs(previous)
+    curr_paragraphs = split_paragraphs(current)
+
+    # Segments, with a placeholder index into `runs` for rewritten runs.
+    pieces: list[Union[tuple[int, str], int]] = []
+    runs: list[tuple[str, str]] = []
+    for tag, i1, i2, j1, j2 in _align(prev_paragraphs, curr_paragraphs):
+        if tag == "equal":
+            summary.paragraphs_unchanged += i2 - i1
+            pieces.append((EQUAL, "".join(curr_paragraphs[j1:j2])))
+            continue
+        summary.paragraphs_changed += max(i2 - i1, j2 - j1)
+        prev_sentences = [
+            s for p in prev_paragraphs[i1:i2] for s in split_sentences(p)
+        ]
+        curr_sentences = [
+            s for p in curr_paragraphs[j1:j2] for s in split_sentences(p)
+        ]
+        for stag, k1, k2, l1, l2 in _align(prev_sentences, curr_sentences):
+            removed = "".join(prev_sentences[k1:k2])
+            added = "".join(curr_sentences[l1:l2])
+            if stag == "equal":
+                pieces.append((EQUAL, added))
+            elif stag == "delete":
+                summary.sentences_removed += k2 - k1
+                summary.add_change("removed", removed, None)
+                pieces.append((DELETE, removed))
+            elif stag == "insert":
+                summary.sentences_added += l2 - l1
+                summary.add_change("added", None, added)
+                pieces.append((INSERT, added))
+            else:
+                summary.sentences_changed += max(k2 - k1, l2 - l1)
+                summary.add_change("changed", removed, added)
+                pieces.append(len(runs))
+                runs.append((removed, added))
+
+    if max_workers is None:
+        max_workers = DIFF_MAX_WORKERS
+    if max_workers > 1 and len(runs) >= PARALLEL_MIN_RUNS:
+        executor = _get_diff_executor()
+        run_diffs = list(
+            executor.map(
+                _diff_text,
+                [removed for removed, _ in runs],
+                [added for _, added in runs],
+            )
+        )
+    else:
+        run_diffs = [_diff_text(removed, added) for removed, added in runs]
+
+    # Adjacent segments with the same op are merged; their texts are
+    # collected in lists and joined once.
+    merged: list[tuple[int, list[str]]] = []
+    for piece in pieces:
+        for op, text in run_diffs[piece] if isinstance(piece, int) else [piece]:
+            if not text:
+                continue
+            if op == DELETE:
+                summary.chars_deleted += len(text)
+            elif op == INSERT:
+                summary.chars_inserted += len(text)
+            if merged and merged[-1][0] == op:
+                merged[-1][1].append(text)
+            else:
+                merged.append((op, [text]))
+    segments = [(op, "".join(texts)) for op, texts in merged]
+    summary.diff_secs = round(time.perf_counter() - start_time, 3)
+    return Redline(segments, summary)
+
+
+def main(argv: Sequence[str]) -> None:
+    if len(argv) != 3:
+        raise app.UsageError("Usage: redline CURRENT_FILE PREVIOUS_FILE")
+    with open(argv[1], "r", encoding="utf-8") as f:
+        current = f.read()
+    with open(argv[2], "r", encoding="utf-8") as f:
+        previous = f.read()
+    redline = compare_documents(current, previous)
+    summary = redline.summary.to_dict()
+    del summary["changes"]
+    print(summary)
+
+
+if __name__ == "__main__":
+    app.run(main)
@@ -17,11 +17,14 @@
 from google.adk.agents import Agent
 
 from ..agent import MODEL
-from ..shared_libraries.callbacks import rate_limit_callback
+from ..shared_libraries.callbacks import (
+    rate_limit_callback,
+    rate_limited_model,
+)
 from . import analysis_agent_prompt
 
 AnalysisAgent = Agent(
-    model=MODEL,
+    model=rate_limited_model(MODEL),
     name="analysis_agent",
     description=(
         "Analyze inputs and determine implications for future FOMC actions."
@@ -35,6 +35,10 @@ analysis, shown below.
 {artifact.statement_redline}
 </STATEMENT_REDLINE>
 
+<STATEMENT_CHANGES>
+{statement_changes}
+</STATEMENT_CHANGES>
+
 <MEETING_SUMMARY>
 {meeting_summary}
 </MEETING_SUMMARY>
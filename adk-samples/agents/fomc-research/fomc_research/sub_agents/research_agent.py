@@ -17,7 +17,10 @@
 from google.adk.agents import Agent
 
 from ..agent import MODEL
-from ..shared_libraries.callbacks import rate_limit_callback
+from ..shared_libraries.callbacks import (
+    rate_limit_callback,
+    rate_limited_model,
+)
 from ..tools.compare_statements import compare_statements_tool
 from ..tools.compute_rate_move_probability import compute_rate_move_probability_tool
 from ..tools.fetch_transcript import fetch_transcript_tool
@@ -26,7 +29,7 @@ from . import research_agent_prompt
 from .summarize_meeting_agent import SummarizeMeetingAgent
 
 ResearchAgent = Agent(
-    model=MODEL,
+    model=rate_limited_model(MODEL),
     name="research_agent",
     description=(
         "Research the latest FOMC meeting to provide information for analysis."
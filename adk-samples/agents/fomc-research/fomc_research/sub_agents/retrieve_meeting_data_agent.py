@@ -18,17 +18,22 @@ from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 
 from ..agent import MODEL
-from ..shared_libraries.callbacks import rate_limit_callback
+from ..shared_libraries.callbacks import (
+    rate_limit_callback,
+    rate_limited_model,
+)
 from ..tools.fetch_page import fetch_page_tool
+from ..tools.lookup_meeting import lookup_meeting_tool
 from . import retrieve_meeting_data_agent_prompt
 from .extract_page_data_agent import ExtractPageDataAgent
 
 RetrieveMeetingDataAgent = Agent(
-    model=MODEL,
+    model=rate_limited_model(MODEL),
     name="retrieve_meeting_data_agent",
     description=("Retrieve data about a Fed meeting from the Fed website"),
     instruction=retrieve_meeting_data_agent_prompt.PROMPT,
     tools=[
+        lookup_meeting_tool,
         fetch_page_tool,
         AgentTool(ExtractPageDataAgent),
     ],
@@ -20,10 +20,15 @@ Your job is to retrieve data about a Fed meeting from the Fed website.
 Follow these steps in order (be sure to tell the user what you're doing at each
 step, but without giving technical details):
 
-1) Call the fetch_page tool to retrieve this web page:
+1) Call the lookup_meeting tool with the meeting date the user requested
+   ({user_requested_meeting_date}). If it returns status "OK" and a
+   transcript_url, skip to step 6. If it returns status "OK" without a
+   transcript_url, skip to step 4. Otherwise continue with step 2.
+
+2) Call the fetch_page tool to retrieve this web page:
    url = "https://www.federalreserve.gov/monetarypolicy/fomccalendars.htm"
 
-2) Call the extract_page_data_agent Tool with this argument:
+3) Call the extract_page_data_agent Tool with this argument:
 "<DATA_TO_EXTRACT>
 * requested_meeting_date: the date of the Fed meeting closest to the meeting
   date the user requested ({user_requested_meeting_date}), in ISO format
@@ -42,7 +47,7 @@ step, but without giving technical details):
   from the previous fed meeting.
 </DATA_TO_EXTRACT>"
 
-3) Call the fetch_page tool to retrieve the meeting web page. If the value
+4) Call the fetch_page tool to retrieve the meeting web page. If the value
 of requested_meeting_url you find in the last step starts with
 "https://www.federalreserve.gov", just pass the value of "requested_meeting_url"
 to the fetch_page tool. If not, use the template below: take out
@@ -51,12 +56,12 @@ to the fetch_page tool. If not, use the template below: take out
 
   url template = "https://www.federalreserve.gov/<requested_meeting_url>"
 
-4) Call the extract_page_data_agent Tool again. This time pass it this argument:
+5) Call the extract_page_data_agent Tool again. This time pass it this argument:
 "<DATA_TO_EXTRACT>
 * transcript_url: the URL for the PDF of the transcript of the press
    conference, labeled 'Press Conference Transcript' on the web page
 </DATA_TO_EXTRACT>"
 
-5) Transfer to research_agent.
+6) Transfer to research_agent.
 
 """
@@ -17,13 +17,16 @@
 from google.adk.agents import Agent
 
 from ..agent import MODEL
-from ..shared_libraries.callbacks import rate_limit_callback
+from ..shared_libraries.callbacks import (
+    rate_limit_callback,
+    rate_limited_model,
+)
 from ..tools.store_state import store_state_tool
 from . import summarize_meeting_agent_prompt
 
 SummarizeMeetingAgent = Agent(
     name="summarize_meeting_agent",
-    model=MODEL,
+    model=rate_limited_model(MODEL),
     description=(
         "Summarize the content and sentiment of the latest FOMC meeting."
     ),
@@ -19,7 +19,7 @@ import logging
 from google.adk.tools import ToolContext
 from google.genai.types import Part
 
-from ..shared_libraries import file_utils
+from ..shared_libraries import file_utils, redline
 
 logger = logging.getLogger(__name__)
 
@@ -46,33 +46,17 @@ def compare_statements_tool(tool_context: ToolContext) -> dict[str, str]:
     if not prev_statement_url.startswith("https"):
         prev_statement_url = fed_hostname + prev_statement_url
 
-    # Download PDFs from URLs to artifacts
-    reqd_pdf_path = file_utils.download_file_from_url(
-        reqd_statement_url, "curr.pdf", tool_context
-    )
-    prev_pdf_path = file_utils.download_file_from_url(
-        prev_statement_url, "prev.pdf", tool_context
-    )
-
-    if reqd_pdf_path is None or reqd_pdf_path is None:
-        logger.error("Failed to download files, aborting")
-        return {
-            "status": "error",
-            "error_message": "Failed to download statement files",
-        }
-
-    reqd_pdf_text = file_utils.extract_text_from_pdf_artifact(
-        reqd_pdf_path, tool_context
-    )
-    prev_pdf_text = file_utils.extract_text_from_pdf_artifact(
-        prev_pdf_path, tool_context
+    # Download and extract both statements concurrently. Statements that
+    # were processed before are served from the text cache.
+    reqd_pdf_text, prev_pdf_text = file_utils.fetch_pdf_texts(
+        [reqd_statement_url, prev_statement_url]
     )
 
     if reqd_pdf_text is None or prev_pdf_text is None:
-        logger.error("Failed to extract text from PDFs, aborting")
+        logger.error("Failed to download or extract statements, aborting")
         return {
             "status": "error",
-            "error_message": "Failed to extract text from PDFs",
+            "error_message": "Failed to download or extract statement files",
         }
 
     tool_context.save_artifact(
@@ -84,9 +68,12 @@ def compare_statements_tool(tool_context: ToolContext) -> dict[str, str]:
         artifact=Part(text=prev_pdf_text),
     )
 
-    redline_html = file_utils.create_html_redline(reqd_pdf_text, prev_pdf_text)
+    statement_redline = redline.compare_documents(reqd_pdf_text, prev_pdf_text)
     file_utils.save_html_to_artifact(
-        redline_html, "statement_redline", tool_context
+        statement_redline.html(), "statement_redline", tool_context
+    )
+    tool_context.state.update(
+        {"statement_changes": statement_redline.summary.to_dict()}
     )
 
     return {"status": "ok"}
@@ -15,10 +15,12 @@
 """'fetch_page' tool for FOMC Research sample agent"""
 
 import logging
-import urllib.request
 
+import requests
 from google.adk.tools import ToolContext
 
+from ..shared_libraries import document_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,16 +34,16 @@ def fetch_page_tool(url: str, tool_context: ToolContext) -> dict[str, str]:
     Returns:
       A dict with "status" and (optional) "error_message" keys.
     """
-    opener = urllib.request.build_opener()
-    opener.addheaders = [("User-Agent", "Mozilla/5.0")]
-    urllib.request.install_opener(opener)
     logger.debug("Fetching page: %s", url)
     try:
-        page = urllib.request.urlopen(url)
-        page_text = page.read().decode("utf-8")
-    except urllib.error.HTTPError as err:
-        errmsg = "Failed to fetch page %s: %s", url, err
+        # Pages can change, so a cached copy is revalidated on every call.
+        document = document_cache.get_document_cache().fetch(
+            url, max_age_secs=0
+        )
+    except requests.exceptions.RequestException as err:
+        errmsg = f"Failed to fetch page {url}: {err}"
         logger.error(errmsg)
         return {"status": "ERROR", "message": errmsg}
+    page_text = document.content.decode("utf-8")
     tool_context.state.update({"page_contents": page_text})
     return {"status": "OK"}
@@ -37,17 +37,14 @@ def fetch_transcript_tool(tool_context: ToolContext) -> dict:
     transcript_url = tool_context.state["transcript_url"]
     if not transcript_url.startswith("https"):
         transcript_url = fed_hostname + transcript_url
-    pdf_path = file_utils.download_file_from_url(
-        transcript_url, "transcript.pdf", tool_context
-    )
-    if pdf_path is None:
-        logger.error("Failed to download PDF from URLs, aborting")
+    text = file_utils.fetch_pdf_text(transcript_url)
+    if text is None:
+        logger.error("Failed to download or extract transcript, aborting")
         return {
             "status": "error",
-            "error_message": "Failed to download PDFs from GCS",
+            "error_message": "Failed to download transcript",
         }
 
-    text = file_utils.extract_text_from_pdf_artifact(pdf_path, tool_context)
     filename = "transcript_fulltext"
     version = tool_context.save_artifact(
         filename=filename, artifact=Part(text=text)
@@ -0,0 +1,93 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""'lookup_meeting' tool for FOMC Research sample agent"""
+
+import datetime
+import logging
+
+import requests
+from google.adk.tools import ToolContext
+
+from ..shared_libraries import fomc_calendar
+
+logger = logging.getLogger(__name__)
+
+
+def lookup_meeting_tool(
+    meeting_date: str, tool_context: ToolContext
+) -> dict[str, str]:
+    """Finds a Fed meeting and the one before it in the FOMC calendar.
+
+    Stores requested_meeting_date, previous_meeting_date,
+    requested_meeting_url, previous_meeting_url,
+    requested_meeting_statement_pdf_url, previous_meeting_statement_pdf_url
+    and, if the press conference transcript is posted, transcript_url in the
+    ToolContext.
+
+    Args:
+      meeting_date: The meeting date requested by the user, in ISO format
+        (YYYY-MM-DD).
+      tool_context: ToolContext object.
+
+    Returns:
+      A dict with "status" and (optional) "message" keys, plus the values
+      that were stored.
+    """
+    try:
+        requested_date = datetime.date.fromisoformat(meeting_date)
+    except ValueError:
+        return {
+            "status": "ERROR",
+            "message": f"Invalid meeting date: {meeting_date}",
+        }
+
+    index = fomc_calendar.get_meeting_index()
+    try:
+        index.refresh()
+    except requests.exceptions.RequestException as err:
+        errmsg = f"Failed to fetch the FOMC calendar: {err}"
+        logger.error(errmsg)
+        return {"status": "ERROR", "message": errmsg}
+
+    requested = index.nearest(requested_date)
+    previous = index.previous(requested) if requested else None
+    if requested is None or previous is None:
+        errmsg = f"No meeting with a statement found near {meeting_date}"
+        logger.error(errmsg)
+        return {"status": "ERROR", "message": errmsg}
+
+    state = {
+        "requested_meeting_date": requested.date.isoformat(),
+        "previous_meeting_date": previous.date.isoformat(),
+        "requested_meeting_url": (
+            requested.press_conference_url or requested.statement_url
+        ),
+        "previous_meeting_url": (
+            previous.press_conference_url or previous.statement_url
+        ),
+        "requested_meeting_statement_pdf_url": requested.statement_pdf_url,
+        "previous_meeting_statement_pdf_url": previous.statement_pdf_url,
+    }
+    try:
+        transcript_url = index.transcript_url(requested)
+    except requests.exceptions.RequestException as err:
+        logger.warning("Failed to fetch the press conference page: %s", err)
+        transcript_url = None
+    if transcript_url:
+        state["transcript_url"] = transcript_url
+
+    logger.info("lookup_meeting_tool(): %s", state)
+    tool_context.state.update(state)
+    return {"status": "OK", **state}
@@ -0,0 +1,144 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the FOMC calendar parser and meeting index.
+
+The pages under tests/data are trimmed copies of the Fed's pages; if the
+Fed changes its layout, refresh them and update the parser together.
+"""
+
+import datetime
+import hashlib
+import os
+
+import pytest
+from fomc_research.shared_libraries import document_cache, fomc_calendar
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+FED = fomc_calendar.FED_HOSTNAME
+
+
+def _read(name: str) -> bytes:
+    with open(os.path.join(DATA_DIR, name), "rb") as f:
+        return f.read()
+
+
+class FakeCache:
+    """Serves fixed page contents by URL."""
+
+    def __init__(self, pages: dict[str, bytes]):
+        self.pages = pages
+        self.fetches = []
+
+    def fetch(self, url, max_age_secs=None):
+        self.fetches.append((url, max_age_secs))
+        content = self.pages[url]
+        return document_cache.Document(
+            url=url,
+            content=content,
+            content_hash=hashlib.sha256(content).hexdigest(),
+        )
+
+
+@pytest.fixture
+def meetings():
+    page_html = _read("fomccalendars.htm").decode("utf-8")
+    return {m.date: m for m in fomc_calendar.parse_calendar(page_html)}
+
+
+def test_parse_calendar_finds_every_meeting(meetings):
+    assert sorted(meetings) == [
+        datetime.date(2020, 3, 15),
+        datetime.date(2024, 1, 31),
+        datetime.date(2024, 5, 1),
+        datetime.date(2024, 12, 18),
+    ]
+
+
+def test_parse_calendar_links(meetings):
+    meeting = meetings[datetime.date(2024, 1, 31)]
+    assert meeting == fomc_calendar.Meeting(
+        date=datetime.date(2024, 1, 31),
+        statement_url=f"{FED}/newsevents/pressreleases/monetary20240131a.htm",
+        statement_pdf_url=f"{FED}/monetarypolicy/files/monetary20240131a1.pdf",
+        press_conference_url=f"{FED}/monetarypolicy/fomcpresconf20240131.htm",
+        minutes_url=f"{FED}/monetarypolicy/fomcminutes20240131.htm",
+        minutes_pdf_url=f"{FED}/monetarypolicy/files/fomcminutes20240131.pdf",
+    )
+
+
+def test_parse_calendar_meeting_without_minutes(meetings):
+    meeting = meetings[datetime.date(2024, 12, 18)]
+    assert meeting.statement_pdf_url.endswith("monetary20241218a1.pdf")
+    assert meeting.minutes_url is None
+    assert meeting.minutes_pdf_url is None
+
+
+def test_parse_transcript_url():
+    page_html = _read("fomcpresconf20240131.htm").decode("utf-8")
+    assert (
+        fomc_calendar.parse_transcript_url(page_html)
+        == f"{FED}/mediacenter/files/FOMCpresconf20240131.pdf"
+    )
+
+
+def test_parse_transcript_url_falls_back_to_file_name():
+    page_html = '<a href="/mediacenter/files/FOMCpresconf20240131.pdf">PDF</a>'
+    assert (
+        fomc_calendar.parse_transcript_url(page_html)
+        == f"{FED}/mediacenter/files/FOMCpresconf20240131.pdf"
+    )
+
+
+def test_refresh_and_lookup():
+    cache = FakeCache(
+        {
+            fomc_calendar.CALENDAR_URL: _read("fomccalendars.htm"),
+            f"{FED}/monetarypolicy/fomcpresconf20240131.htm": _read(
+                "fomcpresconf20240131.htm"
+            ),
+        }
+    )
+    index = fomc_calendar.MeetingIndex(cache=cache)
+    index.refresh()
+
+    requested = index.nearest(datetime.date(2024, 2, 1))
+    assert requested.date == datetime.date(2024, 1, 31)
+    assert index.previous(requested).date == datetime.date(2020, 3, 15)
+    assert index.transcript_url(requested).endswith("FOMCpresconf20240131.pdf")
+
+
+def test_merge_keeps_index_when_save_fails(tmp_path):
+    # A directory in place of the index file makes os.replace fail.
+    path = tmp_path / "index.json"
+    path.mkdir()
+    index = fomc_calendar.MeetingIndex(path=str(path))
+    meeting = fomc_calendar.Meeting(date=datetime.date(2024, 1, 31))
+
+    assert index.merge([meeting], "hash") == 1
+    assert index.meetings() == [meeting]
+    assert os.listdir(tmp_path) == ["index.json"]
+
+
+def test_refresh_keeps_index_on_undecodable_page():
+    cache = FakeCache(
+        {fomc_calendar.CALENDAR_URL: _read("fomccalendars.htm")}
+    )
+    index = fomc_calendar.MeetingIndex(cache=cache)
+    index.refresh()
+    cache.pages[fomc_calendar.CALENDAR_URL] = b"\xff\xfe not utf-8"
+
+    index.refresh()
+
+    assert len(index.meetings()) == 4